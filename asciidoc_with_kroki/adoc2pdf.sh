@@ -10,6 +10,8 @@ set -eu
 export THEME="asciidoctor-pdf-theme.yml"
 export ADOC="sample.adoc"
 export OPDF="sample.pdf"
+# docker-compose の kroki-cache（キャッシュなしの場合は http://localhost:8000）
+export KROKI_URL="${KROKI_URL:-http://localhost:8001}"
 
             #-a source-highlighter=rouge \
     #asciidoc_simple-asciidoctor \
@@ -33,7 +35,7 @@ docker run \
             -a scripts=cjk \
             -r asciidoctor-mathematical \
             -r asciidoctor-kroki \
-                -a kroki-server-url=http://localhost:8000 \
+                -a kroki-server-url=${KROKI_URL} \
                 -a kroki-default-format=png \
             /documents/${ADOC}
 
@@ -53,6 +55,6 @@ docker run \
             -a scripts=cjk \
             -r asciidoctor-mathematical \
             -r asciidoctor-kroki \
-                -a kroki-server-url=http://localhost:8000 \
+                -a kroki-server-url=${KROKI_URL} \
                 -a kroki-default-format=png \
             /documents/${ADOC}
@@ -0,0 +1,139 @@
+"""
+常駐変換ワーカーのクライアント
+
+adoc_worker.rb を起動したままにして、文書ごとに asciidoctor / asciidoctor-pdf を起動する
+コスト（Rubyの起動とgem・拡張の読み込み）を1回だけにする。ジョブは標準入出力で
+1行1件のJSONとしてやり取りする。
+"""
+
+import json
+import os
+import queue
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "adoc_worker.rb")
+
+# メモリ使用量が増え続けないよう、この件数のジョブを処理したらワーカーを起動し直す
+MAX_JOBS_PER_WORKER = 200
+
+
+class WorkerError(RuntimeError):
+    """ワーカーが応答しない・異常終了した場合の例外"""
+
+
+class AdocWorker:
+    """常駐変換ワーカー1プロセス"""
+
+    def __init__(self, ruby: str = "ruby", script: str = WORKER_SCRIPT,
+                 max_jobs: int = MAX_JOBS_PER_WORKER):
+        """
+        初期化（プロセスは最初のジョブで起動する）
+
+        Args:
+            ruby: rubyコマンド
+            script: ワーカースクリプト
+            max_jobs: 起動し直すまでのジョブ数
+        """
+        self.command = [ruby, script]
+        self.max_jobs = max_jobs
+        self.proc: Optional[subprocess.Popen] = None
+        self.jobs = 0
+
+    def _start(self) -> None:
+        # 警告等の標準エラー出力はそのまま親プロセスに流す
+        self.proc = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        self.jobs = 0
+        ready = self._read()
+        if not ready.get("ready"):
+            raise WorkerError(f"worker failed to start: {ready}")
+
+    def _read(self) -> Dict[str, Any]:
+        # 拡張・gemが標準出力に書いた行（JSONのオブジェクトでない行）は応答として扱わず、
+        # 標準エラー出力に流して次の行を読む
+        while True:
+            line = self.proc.stdout.readline()
+            if not line:
+                code = self.proc.wait()
+                self.proc = None
+                raise WorkerError(f"worker exited (code {code})")
+            try:
+                message = json.loads(line)
+            except ValueError:
+                message = None
+            if isinstance(message, dict):
+                return message
+            sys.stderr.write(line)
+
+    def convert(self, source: str, outputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        1つの文書を複数の形式に変換
+
+        Args:
+            source: .adoc ファイル
+            outputs: 形式ごとの {"format", "to_file", "attributes"}
+
+        Returns:
+            形式ごとの {"format", "ok", "seconds", "messages", "error"}
+        """
+        if self.proc is None or self.proc.poll() is not None or self.jobs >= self.max_jobs:
+            self.close()
+            self._start()
+
+        self.proc.stdin.write(json.dumps({"source": source, "outputs": outputs}, ensure_ascii=False) + "\n")
+        self.proc.stdin.flush()
+        self.jobs += 1
+
+        response = self._read()
+        if "error" in response:
+            raise WorkerError(response["error"])
+        return response["results"]
+
+    def close(self) -> None:
+        """ワーカーを終了"""
+        if self.proc is None:
+            return
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=10)
+        except (OSError, subprocess.TimeoutExpired):
+            self.proc.kill()
+        self.proc = None
+
+
+class WorkerPool:
+    """複数のワーカーを並列に使うためのプール（ワーカー1つにつき同時に1ジョブ）"""
+
+    def __init__(self, size: int, **kwargs: Any):
+        """
+        初期化
+
+        Args:
+            size: ワーカー数
+            kwargs: AdocWorker の引数
+        """
+        self.workers = [AdocWorker(**kwargs) for _ in range(max(1, size))]
+        self.idle: "queue.Queue[AdocWorker]" = queue.Queue()
+        for worker in self.workers:
+            self.idle.put(worker)
+
+    def convert(self, source: str, outputs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """空いているワーカーで変換（AdocWorker.convert と同じ）"""
+        worker = self.idle.get()
+        try:
+            return worker.convert(source, outputs)
+        except WorkerError:
+            # 異常終了したワーカーは次のジョブで起動し直される
+            worker.close()
+            raise
+        finally:
+            self.idle.put(worker)
+
+    def close(self) -> None:
+        """すべてのワーカーを終了"""
+        for worker in self.workers:
+            worker.close()
@@ -0,0 +1,81 @@
+#!/usr/bin/env ruby
+# frozen_string_literal: true
+
+# 常駐変換ワーカー
+#
+# asciidoctor / asciidoctor-pdf と拡張（asciidoctor-kroki, asciidoctor-mathematical, stem_cache.rb）を1回だけ読み込み、
+# 標準入力から1行1件のJSONでジョブを受け取って変換し、結果を1行のJSONで標準出力に返す。
+# scripts/adoc_worker.py（build_docs.py --worker）から起動する。
+#
+# ジョブ:
+#   {"source": "/documents/a.adoc",
+#    "outputs": [{"format": "html", "to_file": "/documents/a.html", "attributes": {...}},
+#                {"format": "pdf",  "to_file": "/documents/a.pdf",  "attributes": {...}}]}
+# 結果:
+#   {"results": [{"format": "html", "ok": true, "seconds": 0.12, "messages": [...], "error": null}, ...]}
+
+require 'json'
+require 'asciidoctor'
+require 'asciidoctor/pdf'
+
+# 拡張はrequire時にグローバルに登録されるため、登録されたグループを取り出して形式ごとに使い分ける
+# （HTMLの数式はMathJaxで表示するのでasciidoctor-mathematicalはPDFだけに適用する）
+def load_extension(name)
+  before = Asciidoctor::Extensions.groups.keys
+  require name
+  Asciidoctor::Extensions.groups.reject { |key, _| before.include? key }
+end
+
+KROKI = load_extension 'asciidoctor-kroki'
+MATHEMATICAL = load_extension 'asciidoctor-mathematical'
+require_relative 'stem_cache'
+Asciidoctor::Extensions.unregister_all
+
+EXTENSIONS = { 'html' => KROKI, 'pdf' => KROKI.merge(MATHEMATICAL) }.freeze
+BACKENDS = { 'html' => 'html5', 'pdf' => 'pdf' }.freeze
+
+def monotonic
+  Process.clock_gettime Process::CLOCK_MONOTONIC
+end
+
+def convert(source, output)
+  format = output['format']
+  logger = Asciidoctor::MemoryLogger.new
+  Asciidoctor::LoggerManager.logger = logger
+  started = monotonic
+  error = nil
+  begin
+    # asciidoctor コマンドと同じくunsafeで変換する
+    Asciidoctor.convert_file source,
+      backend: BACKENDS.fetch(format),
+      safe: :unsafe,
+      standalone: true,
+      mkdirs: true,
+      to_file: output['to_file'],
+      attributes: output['attributes'] || {},
+      extension_registry: Asciidoctor::Extensions::Registry.new(EXTENSIONS.fetch(format))
+  rescue StandardError, ScriptError => e
+    error = "#{e.class}: #{e.message}"
+  end
+  {
+    'format' => format,
+    'ok' => error.nil?,
+    'seconds' => monotonic - started,
+    'messages' => logger.messages.map { |m| "#{m[:severity]}: #{m[:message].respond_to?(:text) ? m[:message].text : m[:message]}" },
+    'error' => error,
+  }
+end
+
+$stdout.sync = true
+$stdout.puts JSON.generate('ready' => true)
+
+$stdin.each_line do |line|
+  next if line.strip.empty?
+  begin
+    job = JSON.parse line
+    results = job['outputs'].map { |output| convert job['source'], output }
+    $stdout.puts JSON.generate('results' => results)
+  rescue JSON::ParserError => e
+    $stdout.puts JSON.generate('error' => "invalid job: #{e.message}")
+  end
+end
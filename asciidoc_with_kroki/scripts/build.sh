@@ -1,38 +1,22 @@
 #!/usr/bin/env sh
 set -eu
-set -x  # デバッグ: 実行コマンドを表示
 
-count=0
-for f in /documents/*.adoc; do
-  [ -f "$f" ] || continue
-  count=$((count+1))
-  base="${f%.adoc}"
+# 図はキャッシュプロキシ経由で描画する（HTML・PDFの2回目以降や再ビルドで再描画しない）
+export KROKI_URL="${KROKI_URL:-http://kroki-cache:8000}"
 
-  # HTML（Kroki + MathJax は docinfo.html で）
-  asciidoctor -r asciidoctor-kroki \
-    -a stem=latexmath \
-    -a docinfo=shared \
-    -a docinfodir=/documents \
-    -a scripts=cjk \
-    -a kroki-server-url=http://kroki:8000 \
-    -a kroki-fetch \
-    -a kroki-http-method=post \
-    -a allow-uri-read \
-    -o "${base}.html" "$f"
+# /documents 直下の .adoc を HTML + PDF に変換する
+# 依存ファイル（include・画像・テーマ・図のソース等）が更新された文書だけを並列に再ビルドし、
+# 文書ごとの変換時間を表示する。すべて作り直す場合は --force、並列数は --jobs N
+# 変換は常駐ワーカー（adoc_worker.rb）で行う。文書ごとにコマンドを起動する場合は ADOC_WORKER=0
+worker=""
+[ "${ADOC_WORKER:-1}" = "0" ] || worker="--worker"
 
-  # PDF（数式は asciidoctor-mathematical、図は Kroki）
-  asciidoctor-pdf -r asciidoctor-kroki -r asciidoctor-mathematical \
-    --theme "asciidoctor-pdf-theme.yml" \
-    -a stem=latexmath -a mathematical-format=svg \
-    -a pdf-fontsdir=/documents/fonts \
-    -a scripts=cjk \
-    -a kroki-server-url=http://kroki:8000 \
-    -a kroki-fetch \
-    -a kroki-http-method=post \
-    -a allow-uri-read \
-    -o "${base}.pdf" "$f"
-done
-
-# 一件も処理していない場合は明示的にエラーにする
-[ "$count" -gt 0 ] || { echo "No .adoc files under /documents"; exit 1; }
+# ADOC_WATCH=1 の場合はビルド後も docs を監視し、変更に依存する文書だけを再ビルドし続ける
+driver="build_docs.py"
+[ "${ADOC_WATCH:-0}" = "1" ] && driver="watch_docs.py"
 
+exec python3 "$(dirname "$0")/$driver" $worker \
+  --docs-dir /documents \
+  --theme asciidoctor-pdf-theme.yml \
+  --fonts-dir /documents/fonts \
+  "$@"
@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+"""
+AsciiDoc ビルドドライバ
+
+docs 配下の .adoc を HTML と PDF に変換する（scripts/build.sh から呼び出す）。
+
+- include / image / 図のソース（plantuml::file[] 等）/ テーマ / docinfo / フォントの依存関係を解析
+- 出力より新しい依存ファイルがある場合や変換コマンドが変わった場合だけ再ビルド
+- 独立した文書・形式は --jobs の数まで並列に変換
+- 文書・形式ごとの変換時間を表示
+- --worker 指定時は常駐ワーカー（adoc_worker.rb）で変換し、文書ごとのRuby・gemの起動を省く
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from adoc_worker import WorkerError, WorkerPool
+
+FORMATS = ("html", "pdf")
+STATE_FILE = ".build_state.json"
+# latexmath の描画結果のキャッシュ（asciidoctor-mathematical の後に読み込む）
+STEM_CACHE_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "stem_cache.rb")
+
+ATTRIBUTE_RE = re.compile(r"^:(?P<name>[\w-]+)!?:\s*(?P<value>.*?)\s*$")
+INCLUDE_RE = re.compile(r"^include::(?P<target>[^\[]+)\[")
+IMAGE_RE = re.compile(r"image::?(?P<target>[^\s\[:][^\s\[]*)\[")
+# plantuml::diagram.puml[] のような外部ソースを読むブロックマクロ
+BLOCK_MACRO_RE = re.compile(r"^(?P<name>[a-z][\w-]*)::(?P<target>[^\[\s]+)\[")
+ATTRIBUTE_REF_RE = re.compile(r"\{([\w-]+)\}")
+NON_SOURCE_MACROS = {"include", "image", "video", "audio", "toc"}
+
+FONT_EXTENSIONS = (".ttf", ".otf", ".ttc")
+
+
+#     ____________________
+#____/ [*] 依存関係        \____________________
+#
+@dataclass
+class DocumentDeps:
+    """文書1つ分の依存ファイル"""
+    source: str
+    common: Set[str] = field(default_factory=set)  # 全形式に共通（本体・include・画像・図のソース）
+    html: Set[str] = field(default_factory=set)    # HTMLのみ（docinfo）
+    pdf: Set[str] = field(default_factory=set)     # PDFのみ（テーマ・フォント）
+
+    def for_format(self, fmt: str) -> Set[str]:
+        """指定した形式の依存ファイル一式"""
+        return self.common | (self.html if fmt == "html" else self.pdf)
+
+
+def _is_local(target: str) -> bool:
+    return "://" not in target and not target.startswith("data:")
+
+
+def _substitute(target: str, attrs: Dict[str, str]) -> Optional[str]:
+    """
+    パス中の属性参照（{imagesdir} 等）を展開（未定義の属性がある場合はNone）
+    """
+    missing = []
+
+    def replace(match: "re.Match[str]") -> str:
+        if match[1] not in attrs:
+            missing.append(match[1])
+        return attrs.get(match[1], "")
+
+    result = ATTRIBUTE_REF_RE.sub(replace, target)
+    return None if missing else result
+
+
+def scan_adoc(path: str, attrs: Dict[str, str], deps: Set[str], seen: Set[str]) -> None:
+    """
+    .adoc ファイルを読み、include先を再帰的にたどって依存ファイルを集める
+
+    Args:
+        path: 読み込むファイル
+        attrs: 文書属性（ヘッダで定義されたものを追加していく）
+        deps: 依存ファイルの集合（結果を追加する）
+        seen: 読み込み済みのファイル（循環include対策）
+    """
+    path = os.path.abspath(path)
+    if path in seen:
+        return
+    seen.add(path)
+    deps.add(path)
+
+    base_dir = os.path.dirname(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return
+
+    for line in lines:
+        if line.startswith("//"):
+            continue
+
+        match = ATTRIBUTE_RE.match(line)
+        if match:
+            attrs[match["name"]] = match["value"]
+            continue
+
+        match = INCLUDE_RE.match(line)
+        if match:
+            target = _substitute(match["target"], attrs)
+            if target and _is_local(target):
+                scan_adoc(os.path.join(base_dir, target), attrs, deps, seen)
+            continue
+
+        match = BLOCK_MACRO_RE.match(line)
+        if match and match["name"] not in NON_SOURCE_MACROS:
+            target = _substitute(match["target"], attrs)
+            if target and _is_local(target):
+                deps.add(os.path.abspath(os.path.join(base_dir, target)))
+            continue
+
+        for match in IMAGE_RE.finditer(line):
+            target = _substitute(match["target"], attrs)
+            if target and _is_local(target):
+                images_dir = os.path.join(base_dir, attrs.get("imagesdir", ""))
+                deps.add(os.path.abspath(os.path.join(images_dir, target)))
+
+
+def theme_deps(theme: str) -> Set[str]:
+    """
+    PDFテーマと、テーマから参照される画像
+    """
+    deps = {os.path.abspath(theme)}
+    try:
+        with open(theme, encoding="utf-8") as f:
+            text = f.read()
+    except OSError:
+        return deps
+    theme_dir = os.path.dirname(os.path.abspath(theme))
+    for match in IMAGE_RE.finditer(text):
+        if _is_local(match["target"]):
+            deps.add(os.path.join(theme_dir, match["target"]))
+    return deps
+
+
+def font_deps(fonts_dir: Optional[str]) -> Set[str]:
+    """
+    フォントディレクトリ内のフォントファイル
+    """
+    if not fonts_dir or not os.path.isdir(fonts_dir):
+        return set()
+    return {
+        os.path.abspath(os.path.join(root, name))
+        for root, _, files in os.walk(fonts_dir)
+        for name in files if name.lower().endswith(FONT_EXTENSIONS)
+    }
+
+
+def document_deps(source: str, theme: Optional[str], fonts_dir: Optional[str],
+                  docinfo_dir: str) -> DocumentDeps:
+    """
+    文書1つ分の依存ファイルを解析
+
+    Args:
+        source: .adoc ファイル
+        theme: PDFテーマのファイル
+        fonts_dir: PDFのフォントディレクトリ
+        docinfo_dir: docinfo（shared）のディレクトリ
+
+    Returns:
+        依存ファイル
+    """
+    deps = DocumentDeps(os.path.abspath(source))
+    scan_adoc(source, {}, deps.common, set())
+    deps.html = {
+        os.path.abspath(os.path.join(docinfo_dir, name))
+        for name in ("docinfo.html", "docinfo-header.html", "docinfo-footer.html")
+    }
+    if theme:
+        deps.pdf |= theme_deps(theme)
+    deps.pdf |= font_deps(fonts_dir)
+    return deps
+
+
+#     ____________________
+#____/ [*] ビルド          \____________________
+#
+@dataclass
+class BuildResult:
+    """文書・形式1つ分のビルド結果"""
+    source: str
+    fmt: str
+    status: str          # built / up-to-date / failed
+    seconds: float = 0.0
+    reason: str = ""
+    stderr: str = ""
+
+
+class DocBuilder:
+    """依存関係に基づいてHTML・PDFを並列にビルドするクラス"""
+
+    def __init__(self, docs_dir: str, theme: Optional[str] = None, fonts_dir: Optional[str] = None,
+                 kroki_url: str = "http://kroki-cache:8000", jobs: int = 1, force: bool = False,
+                 formats: tuple = FORMATS, worker: bool = False):
+        """
+        初期化
+
+        Args:
+            docs_dir: .adoc を置いたディレクトリ（出力も同じ場所）
+            theme: PDFテーマのファイル（docs_dirからの相対パス可）
+            fonts_dir: PDFのフォントディレクトリ
+            kroki_url: Kroki（キャッシュプロキシ）のURL
+            jobs: 並列数
+            force: 依存関係によらずすべてビルドする
+            formats: 出力形式
+            worker: 常駐ワーカーで変換する（jobsの数だけ起動し、close()まで使い回す）
+        """
+        self.docs_dir = os.path.abspath(docs_dir)
+        self.theme = os.path.join(self.docs_dir, theme) if theme else None
+        self.fonts_dir = fonts_dir
+        self.kroki_url = kroki_url
+        self.jobs = max(1, jobs)
+        self.force = force
+        self.formats = formats
+        self.state_path = os.path.join(self.docs_dir, STATE_FILE)
+        self.state = self._load_state()
+        self.pool = WorkerPool(self.jobs) if worker else None
+
+    def close(self) -> None:
+        """常駐ワーカーを終了"""
+        if self.pool is not None:
+            self.pool.close()
+
+    def _load_state(self) -> Dict[str, List[str]]:
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self) -> None:
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def documents(self) -> List[str]:
+        """ビルド対象の .adoc（docs_dir直下）"""
+        return sorted(
+            os.path.join(self.docs_dir, name) for name in os.listdir(self.docs_dir)
+            if name.endswith(".adoc") and not name.startswith(("_", "."))
+        )
+
+    @staticmethod
+    def output_path(source: str, fmt: str) -> str:
+        """出力ファイルのパス"""
+        return f"{os.path.splitext(source)[0]}.{fmt}"
+
+    def attributes(self, fmt: str) -> Dict[str, str]:
+        """
+        変換時の文書属性（値が空文字の属性は値なしで設定する）
+
+        Args:
+            fmt: html / pdf
+
+        Returns:
+            属性名 -> 値
+        """
+        attrs = {"stem": "latexmath", "scripts": "cjk"}
+        if fmt == "html":
+            # HTML（Kroki + MathJax は docinfo.html で）
+            attrs.update({"docinfo": "shared", "docinfodir": self.docs_dir})
+        else:
+            # PDF（数式は asciidoctor-mathematical、図は Kroki）
+            attrs["mathematical-format"] = "svg"
+            if self.theme:
+                attrs["pdf-theme"] = self.theme
+            if self.fonts_dir:
+                attrs["pdf-fontsdir"] = self.fonts_dir
+        attrs.update({
+            "kroki-server-url": self.kroki_url,
+            "kroki-fetch": "",
+            "kroki-http-method": "post",
+            "allow-uri-read": "",
+        })
+        return attrs
+
+    def command(self, source: str, fmt: str) -> List[str]:
+        """
+        変換コマンド（常駐ワーカーで変換する場合も、出力が同じかどうかの判定に使う）
+
+        Args:
+            source: .adoc ファイル
+            fmt: html / pdf
+
+        Returns:
+            コマンドライン
+        """
+        if fmt == "html":
+            command = ["asciidoctor", "-r", "asciidoctor-kroki"]
+        else:
+            command = ["asciidoctor-pdf", "-r", "asciidoctor-kroki", "-r", "asciidoctor-mathematical",
+                       "-r", STEM_CACHE_SCRIPT]
+        for name, value in self.attributes(fmt).items():
+            command += ["-a", f"{name}={value}" if value else name]
+        return command + ["-o", self.output_path(source, fmt), source]
+
+    def deps(self, source: str) -> DocumentDeps:
+        """文書の依存ファイル"""
+        return document_deps(source, self.theme, self.fonts_dir, self.docs_dir)
+
+    def stale_reason(self, source: str, fmt: str, deps: DocumentDeps) -> Optional[str]:
+        """
+        再ビルドが必要な理由（不要な場合はNone）
+        """
+        if self.force:
+            return "forced"
+        output = self.output_path(source, fmt)
+        if not os.path.exists(output):
+            return "no output"
+        if self.state.get(output) != self.command(source, fmt):
+            return "command changed"
+
+        output_mtime = os.path.getmtime(output)
+        for path in sorted(deps.for_format(fmt)):
+            try:
+                if os.path.getmtime(path) > output_mtime:
+                    return f"{os.path.relpath(path, self.docs_dir)} changed"
+            except OSError:
+                continue
+        return None
+
+    def convert(self, source: str, fmt: str, reason: str) -> BuildResult:
+        """
+        1つの文書を1つの形式に変換
+
+        Returns:
+            ビルド結果
+        """
+        command = self.command(source, fmt)
+        start = time.perf_counter()
+        proc = subprocess.run(command, cwd=self.docs_dir, capture_output=True, text=True)
+        seconds = time.perf_counter() - start
+
+        if proc.returncode != 0:
+            return BuildResult(source, fmt, "failed", seconds, reason, proc.stderr)
+        self.state[self.output_path(source, fmt)] = command
+        return BuildResult(source, fmt, "built", seconds, reason, proc.stderr)
+
+    def convert_with_worker(self, source: str, tasks: List[Tuple[str, str]]) -> List[BuildResult]:
+        """
+        1つの文書を常駐ワーカーで複数の形式に変換（1ジョブで送る）
+
+        Args:
+            source: .adoc ファイル
+            tasks: (形式, 再ビルドの理由) のリスト
+
+        Returns:
+            形式ごとのビルド結果
+        """
+        reasons = dict(tasks)
+        outputs = [
+            {"format": fmt, "to_file": self.output_path(source, fmt), "attributes": self.attributes(fmt)}
+            for fmt, _ in tasks
+        ]
+        try:
+            responses = self.pool.convert(source, outputs)
+        except WorkerError as e:
+            return [BuildResult(source, fmt, "failed", 0.0, reason, str(e)) for fmt, reason in tasks]
+
+        results = []
+        for response in responses:
+            fmt = response["format"]
+            messages = "\n".join(response["messages"] + ([response["error"]] if response["error"] else []))
+            if response["ok"]:
+                self.state[self.output_path(source, fmt)] = self.command(source, fmt)
+                status = "built"
+            else:
+                status = "failed"
+            results.append(BuildResult(source, fmt, status, response["seconds"], reasons[fmt], messages))
+        return results
+
+    def build(self, sources: Optional[List[str]] = None,
+              formats: Optional[Tuple[str, ...]] = None) -> List[BuildResult]:
+        """
+        古くなった出力だけを並列にビルド
+
+        Args:
+            sources: ビルド対象（Noneの場合は documents()）
+            formats: 出力形式（Noneの場合は初期化時の形式）
+
+        Returns:
+            文書・形式ごとのビルド結果
+        """
+        sources = self.documents() if sources is None else sources
+        formats = self.formats if formats is None else formats
+        results = []
+        pending = []
+        for source in sources:
+            deps = self.deps(source)
+            for fmt in formats:
+                reason = self.stale_reason(source, fmt, deps)
+                if reason is None:
+                    results.append(BuildResult(source, fmt, "up-to-date"))
+                else:
+                    pending.append((source, fmt, reason))
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            if self.pool is None:
+                results += list(executor.map(lambda task: self.convert(*task), pending))
+            else:
+                # 同じ文書のHTML・PDFは1つのジョブとしてワーカーに送る
+                by_source: Dict[str, List[Tuple[str, str]]] = {}
+                for source, fmt, reason in pending:
+                    by_source.setdefault(source, []).append((fmt, reason))
+                for group in executor.map(lambda item: self.convert_with_worker(*item), by_source.items()):
+                    results += group
+
+        if pending:
+            self._save_state()
+        return sorted(results, key=lambda r: (r.source, FORMATS.index(r.fmt)))
+
+
+def format_report(results: List[BuildResult], docs_dir: str) -> str:
+    """
+    文書・形式ごとのビルド結果と変換時間の表
+    """
+    lines = [f"{'document':<32} {'format':<6} {'status':<11} {'time':>8}  reason"]
+    for r in results:
+        seconds = f"{r.seconds:.2f}s" if r.status != "up-to-date" else "-"
+        lines.append(f"{os.path.relpath(r.source, docs_dir):<32} {r.fmt:<6} {r.status:<11} {seconds:>8}  {r.reason}")
+    built = [r for r in results if r.status == "built"]
+    failed = [r for r in results if r.status == "failed"]
+    lines.append(f"built: {len(built)}, up-to-date: {len(results) - len(built) - len(failed)}, "
+                 f"failed: {len(failed)}, conversion time: {sum(r.seconds for r in results):.2f}s")
+    return "\n".join(lines)
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """コマンドライン引数の定義（watch等の他のツールと共有する）"""
+    parser = argparse.ArgumentParser(description="AsciiDoc ビルドドライバ")
+    parser.add_argument("--docs-dir", default="/documents")
+    parser.add_argument("--theme", default="asciidoctor-pdf-theme.yml", help="PDFテーマ（docs-dirからの相対パス）")
+    parser.add_argument("--fonts-dir", default=os.getenv("PDF_FONTS_DIR"),
+                        help="PDFのフォントディレクトリ（既定: docs-dir/fonts）")
+    parser.add_argument("--kroki-url", default=os.getenv("KROKI_URL", "http://kroki-cache:8000"))
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--format", dest="formats", action="append", choices=FORMATS,
+                        help="出力形式（複数指定可。既定: html と pdf）")
+    parser.add_argument("--force", action="store_true", help="依存関係によらずすべてビルドする")
+    parser.add_argument("--worker", action="store_true",
+                        help="常駐ワーカー（adoc_worker.rb）で変換する（文書ごとのRuby・gemの起動を省く）")
+    return parser
+
+
+def builder_from_args(args: argparse.Namespace) -> DocBuilder:
+    """コマンドライン引数から DocBuilder を作成"""
+    fonts_dir = args.fonts_dir or os.path.join(args.docs_dir, "fonts")
+    return DocBuilder(
+        args.docs_dir, theme=args.theme, fonts_dir=fonts_dir, kroki_url=args.kroki_url,
+        jobs=args.jobs, force=args.force, formats=tuple(args.formats or FORMATS), worker=args.worker,
+    )
+
+
+def main() -> int:
+    parser = build_arg_parser()
+    parser.add_argument("documents", nargs="*", help="ビルドする .adoc（既定: docs-dir 直下のすべて）")
+    args = parser.parse_args()
+
+    builder = builder_from_args(args)
+    sources = [os.path.abspath(p) for p in args.documents] or builder.documents()
+    if not sources:
+        print(f"No .adoc files under {builder.docs_dir}", file=sys.stderr)
+        return 1
+
+    try:
+        results = builder.build(sources)
+    finally:
+        builder.close()
+    for r in results:
+        if r.status == "failed":
+            print(f"--- {r.source} ({r.fmt})\n{r.stderr}", file=sys.stderr)
+    print(format_report(results, builder.docs_dir))
+    return 1 if any(r.status == "failed" for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
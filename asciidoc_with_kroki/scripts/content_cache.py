@@ -0,0 +1,151 @@
+"""
+コンテンツアドレス方式のディスクキャッシュ
+
+キー（内容のハッシュ）ごとに1ファイルで保存し、合計サイズが上限を超えたら
+最も長く使われていないものから削除する（LRU）。使用順はファイルのmtimeで保持するため、
+プロセスを再起動しても引き継がれる。
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def content_key(*parts: Any) -> str:
+    """
+    キャッシュキーを作成
+
+    Args:
+        parts: キーに含める値（bytes / str / JSONに変換できる値）
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    h = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, str):
+            part = part.encode("utf-8")
+        elif not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        # 区切りが曖昧にならないよう長さを前置する
+        h.update(len(part).to_bytes(8, "big"))
+        h.update(part)
+    return h.hexdigest()
+
+
+class ContentCache:
+    """サイズ上限付きのLRUディスクキャッシュ"""
+
+    def __init__(self, cache_dir: str, max_bytes: int, suffix: str = ""):
+        """
+        初期化（既存のキャッシュファイルを読み込む）
+
+        Args:
+            cache_dir: 保存先ディレクトリ
+            max_bytes: 合計サイズの上限
+            suffix: キャッシュファイルの拡張子（例: ".svg"）
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, int]" = OrderedDict()  # キー -> サイズ（古い順）
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + self.suffix)
+
+    def _load(self) -> None:
+        """ディレクトリを走査し、mtimeの古い順にエントリを並べる"""
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(self.suffix) or name.startswith("."):
+                    continue
+                stat = os.stat(os.path.join(root, name))
+                found.append((stat.st_mtime, name[:len(name) - len(self.suffix)], stat.st_size))
+        for _, key, size in sorted(found):
+            self.entries[key] = size
+            self.total_bytes += size
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        キャッシュから取得（ヒットした場合は最近使ったものとして記録）
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            保存した内容（なければNone）
+        """
+        path = self._path(key)
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                # 別プロセスに削除された場合
+                self.total_bytes -= self.entries.pop(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def put(self, key: str, data: bytes) -> None:
+        """
+        キャッシュに保存し、上限を超えた分を古い順に削除
+
+        Args:
+            key: キャッシュキー
+            data: 保存する内容
+        """
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # 書き込み途中のファイルを読まれないよう一時ファイルから置き換える
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            self.total_bytes += len(data) - self.entries.pop(key, 0)
+            self.entries[key] = len(data)
+            self._evict()
+
+    def _evict(self) -> None:
+        while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+            key, size = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        """キャッシュの統計情報"""
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
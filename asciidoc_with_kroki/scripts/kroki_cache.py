@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Kroki キャッシュプロキシ
+
+kroki サービスの手前に置き、描画結果を（図の種類, 出力形式, ソース, オプション）の
+ハッシュでディスクにキャッシュする。HTML・PDFの2回の変換や再ビルドで同じ図を
+再描画しないようにする。標準ライブラリのみで動作する。
+
+- GET  /{type}/{format}/{encoded}   （deflate + base64url のソース）
+- POST /{type}/{format}             （本文がソース、またはJSON）
+- POST /                            （diagram_type / output_format を含むJSON）
+- GET  /_cache/stats                キャッシュの統計情報
+- それ以外（/health 等）はキャッシュせずに転送する
+"""
+
+import argparse
+import base64
+import json
+import os
+import re
+import urllib.error
+import urllib.request
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Tuple
+from urllib.parse import urlsplit
+
+from content_cache import ContentCache, content_key
+
+DIAGRAM_PATH_RE = re.compile(r"^/(?P<type>[\w-]+)/(?P<format>[\w-]+)(?:/(?P<encoded>[\w=-]+))?/?$")
+
+# 転送するリクエストヘッダ（描画結果に影響するもの）
+FORWARD_HEADERS = ("content-type", "accept")
+OPTION_HEADER_PREFIX = "kroki-diagram-options-"
+
+CONTENT_TYPES = {
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "pdf": "application/pdf",
+    "txt": "text/plain; charset=utf-8",
+    "utxt": "text/plain; charset=utf-8",
+    "base64": "text/plain",
+}
+
+DEFAULT_UPSTREAM = os.getenv("KROKI_UPSTREAM", "http://kroki:8000")
+DEFAULT_CACHE_DIR = os.getenv("KROKI_CACHE_DIR", "/cache")
+DEFAULT_MAX_SIZE_MB = int(os.getenv("KROKI_CACHE_MAX_SIZE_MB", "512"))
+UPSTREAM_TIMEOUT = 60
+
+
+def decode_source(encoded: str) -> bytes:
+    """
+    GETリクエストのソース（deflate + base64url）を復元
+
+    Args:
+        encoded: URLに埋め込まれたソース
+
+    Returns:
+        ソース（復元できない場合はエンコードされた文字列のまま）
+    """
+    try:
+        padded = encoded + "=" * (-len(encoded) % 4)
+        return zlib.decompress(base64.urlsafe_b64decode(padded))
+    except (ValueError, zlib.error):
+        return encoded.encode("ascii")
+
+
+class KrokiCacheServer(ThreadingHTTPServer):
+    """キャッシュと転送先を保持するHTTPサーバ"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], upstream: str, cache: ContentCache):
+        super().__init__(address, KrokiCacheHandler)
+        self.upstream = upstream.rstrip("/")
+        self.cache = cache
+
+
+class KrokiCacheHandler(BaseHTTPRequestHandler):
+    """Kroki APIへのリクエストをキャッシュ経由で処理するハンドラ"""
+
+    server: KrokiCacheServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass
+
+    def do_GET(self) -> None:  # noqa: N802
+        if self.path == "/_cache/stats":
+            body = json.dumps(self.server.cache.stats()).encode("utf-8")
+            self._send(200, body, "application/json", "")
+            return
+        self._handle(b"")
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        self._handle(self.rfile.read(length))
+
+    def _cache_key(self, body: bytes) -> Tuple[Optional[str], str]:
+        """
+        リクエストからキャッシュキーと出力形式を求める
+
+        Returns:
+            (キャッシュキー（キャッシュ対象外はNone）, 出力形式)
+        """
+        url = urlsplit(self.path)
+        options = {k.lower(): v for k, v in self.headers.items()
+                   if k.lower().startswith(OPTION_HEADER_PREFIX)}
+
+        if self.command == "POST" and url.path.rstrip("/") == "":
+            try:
+                request = json.loads(body)
+                diagram_type, output_format = request["diagram_type"], request["output_format"]
+            except (ValueError, KeyError, TypeError):
+                return None, ""
+            return content_key(diagram_type, output_format, body, url.query, options), output_format
+
+        match = DIAGRAM_PATH_RE.match(url.path)
+        if not match:
+            return None, ""
+        diagram_type, output_format = match["type"].lower(), match["format"].lower()
+        if self.command == "GET":
+            if not match["encoded"]:
+                return None, ""
+            source = decode_source(match["encoded"])
+        else:
+            source = body
+        return content_key(diagram_type, output_format, source, url.query, options), output_format
+
+    def _handle(self, body: bytes) -> None:
+        key, output_format = self._cache_key(body)
+        if key is not None:
+            data = self.server.cache.get(key)
+            if data is not None:
+                self._send(200, data, CONTENT_TYPES.get(output_format, "application/octet-stream"), "HIT")
+                return
+
+        status, data, content_type = self._forward(body)
+        if key is not None and status == 200:
+            self.server.cache.put(key, data)
+        self._send(status, data, content_type, "MISS" if key is not None else "")
+
+    def _forward(self, body: bytes) -> Tuple[int, bytes, str]:
+        """
+        kroki サービスにそのまま転送
+
+        Returns:
+            (ステータス, 本文, Content-Type)
+        """
+        headers = {k: v for k, v in self.headers.items()
+                   if k.lower() in FORWARD_HEADERS or k.lower().startswith(OPTION_HEADER_PREFIX)}
+        request = urllib.request.Request(
+            self.server.upstream + self.path,
+            data=body if self.command == "POST" else None,
+            headers=headers,
+            method=self.command,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=UPSTREAM_TIMEOUT) as response:
+                return response.status, response.read(), response.headers.get("Content-Type", "")
+        except urllib.error.HTTPError as e:
+            return e.code, e.read(), e.headers.get("Content-Type", "")
+        except (urllib.error.URLError, OSError) as e:
+            return 502, f"kroki upstream error: {e}".encode("utf-8"), "text/plain; charset=utf-8"
+
+    def _send(self, status: int, data: bytes, content_type: str, cache_status: str) -> None:
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        if cache_status:
+            self.send_header("X-Kroki-Cache", cache_status)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def create_server(host: str = "0.0.0.0", port: int = 8000, upstream: str = DEFAULT_UPSTREAM,
+                  cache_dir: str = DEFAULT_CACHE_DIR,
+                  max_size_mb: int = DEFAULT_MAX_SIZE_MB) -> KrokiCacheServer:
+    """
+    キャッシュプロキシを作成（serve_forever() は呼び出し側で行う）
+
+    Args:
+        host: 待ち受けアドレス
+        port: 待ち受けポート（0の場合は空きポート）
+        upstream: kroki サービスのURL
+        cache_dir: キャッシュの保存先
+        max_size_mb: キャッシュの合計サイズの上限（MB）
+
+    Returns:
+        サーバ
+    """
+    cache = ContentCache(cache_dir, max_size_mb * 1024 * 1024)
+    return KrokiCacheServer((host, port), upstream, cache)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Kroki キャッシュプロキシ")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--upstream", default=DEFAULT_UPSTREAM, help="kroki サービスのURL")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--max-size-mb", type=int, default=DEFAULT_MAX_SIZE_MB,
+                        help="キャッシュの合計サイズの上限（超えたら古いものから削除）")
+    args = parser.parse_args()
+
+    server = create_server(args.host, args.port, args.upstream, args.cache_dir, args.max_size_mb)
+    stats = server.cache.stats()
+    print(f"Kroki cache proxy: http://{args.host}:{server.server_port} -> {args.upstream} "
+          f"({stats['entries']} entries, {stats['bytes']} bytes)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+# frozen_string_literal: true
+
+# latexmath（STEM）描画結果のキャッシュ
+#
+# asciidoctor-mathematical が呼び出す Mathematical#parse の結果を、数式・出力形式・描画設定
+# （ppi, zoom 等）・gemのバージョンのハッシュでディスクに保存する。文書・ビルドをまたいで共有し、
+# 本文だけを変更した再ビルドでは数式を描画しない。合計サイズが上限を超えたら最も長く
+# 使われていないものから削除する（使用順はファイルのmtimeで保持）。
+#
+#   asciidoctor-pdf -r asciidoctor-mathematical -r /scripts/stem_cache.rb ...
+#
+# 環境変数:
+#   STEM_CACHE_DIR     保存先（既定: $XDG_CACHE_HOME/stem または ~/.cache/stem）
+#   STEM_CACHE_MAX_MB  合計サイズの上限（既定: 256）
+
+require 'digest'
+require 'fileutils'
+require 'json'
+require 'mathematical'
+
+module StemCache
+  DIR = ENV['STEM_CACHE_DIR'] ||
+        File.join(ENV['XDG_CACHE_HOME'] || File.join(Dir.home, '.cache'), 'stem')
+  MAX_BYTES = Integer(ENV['STEM_CACHE_MAX_MB'] || '256') * 1024 * 1024
+  # 上限を超えたらこの割合まで削除する（削除のたびにディレクトリを走査しないため）
+  LOW_WATER = 0.9
+  VERSION = [1, (Gem.loaded_specs['mathematical']&.version).to_s].freeze
+
+  @lock = Mutex.new
+  @total_bytes = nil
+  @stats = Hash.new 0
+
+  class << self
+    attr_reader :stats
+
+    def key(maths, options)
+      Digest::SHA256.hexdigest JSON.generate([VERSION, options.sort_by { |k, _| k.to_s }, maths])
+    end
+
+    def path(key)
+      File.join DIR, key[0, 2], key
+    end
+
+    # 保存した結果を返す（なければnil）
+    def fetch(key)
+      meta_path = "#{path key}.json"
+      unless File.exist? meta_path
+        @stats[:misses] += 1
+        return nil
+      end
+
+      meta = JSON.parse File.read(meta_path)
+      data = File.binread("#{path key}.data").force_encoding meta.delete('encoding')
+      now = Time.now
+      File.utime now, now, meta_path, "#{path key}.data"
+      @stats[:hits] += 1
+      meta.transform_keys(&:to_sym).merge(data: data)
+    rescue SystemCallError, JSON::ParserError
+      # 別プロセスが削除中・書き込み途中の場合は描画し直す
+      @stats[:misses] += 1
+      nil
+    end
+
+    def store(key, result)
+      return unless result.is_a?(Hash) && result[:data].is_a?(String)
+
+      base = path key
+      FileUtils.mkdir_p File.dirname(base)
+      meta = JSON.generate(result.reject { |k, _| k == :data }.merge(encoding: result[:data].encoding.name))
+      # データを先に置き換え、メタデータの存在でエントリが完成したとみなす
+      write_atomic "#{base}.data", result[:data]
+      write_atomic "#{base}.json", meta
+      add_bytes result[:data].bytesize + meta.bytesize
+    rescue SystemCallError => e
+      warn "stem cache: #{e.message}"
+    end
+
+    def write_atomic(path, data)
+      tmp = "#{path}.#{Process.pid}.tmp"
+      File.binwrite tmp, data
+      File.rename tmp, path
+    end
+
+    def entries
+      Dir.glob(File.join(DIR, '*', '*.json')).filter_map do |meta_path|
+        base = meta_path.delete_suffix '.json'
+        files = [meta_path, "#{base}.data"].select { |f| File.exist? f }
+        [File.mtime(meta_path), files, files.sum { |f| File.size f }]
+      rescue SystemCallError
+        nil
+      end
+    end
+
+    def add_bytes(size)
+      @lock.synchronize do
+        @total_bytes ||= entries.sum { |_, _, bytes| bytes }
+        @total_bytes += size
+        evict if @total_bytes > MAX_BYTES
+      end
+    end
+
+    # 他のプロセスの書き込みも含めて走査し直し、古い順に削除する
+    def evict
+      all = entries.sort_by(&:first)
+      @total_bytes = all.sum { |_, _, bytes| bytes }
+      all.each do |_, files, bytes|
+        break if @total_bytes <= MAX_BYTES * LOW_WATER
+
+        FileUtils.rm_f files
+        @total_bytes -= bytes
+        @stats[:evictions] += 1
+      end
+    end
+  end
+
+  # Mathematical#parse の前にキャッシュを参照する
+  module Parse
+    def initialize(options = {})
+      @stem_cache_options = options.dup
+      super
+    end
+
+    def parse(maths)
+      return maths.map { |m| parse m } if maths.is_a? Array
+
+      key = StemCache.key maths, @stem_cache_options || {}
+      cached = StemCache.fetch key
+      return cached if cached
+
+      result = super
+      StemCache.store key, result
+      result
+    end
+  end
+end
+
+Mathematical.prepend StemCache::Parse
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+AsciiDoc ウォッチモード
+
+docs 配下の変更を inotify で監視し、連続した変更をまとめて（デバウンス）から、
+変更されたファイル（.adoc・include・テーマ・画像・図のソース・フォント）に依存する文書だけを
+再ビルドする。プレビューが早く更新されるよう、HTMLをすべて変換してからPDFを変換する。
+
+inotify が使えない環境（Linux以外、一部のネットワークファイルシステム）では --poll で
+更新日時の定期確認に切り替える。
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from build_docs import FONT_EXTENSIONS, FORMATS, DocBuilder, build_arg_parser, builder_from_args, format_report
+
+# 監視しないディレクトリ（キャッシュ・出力）
+IGNORED_DIRS = {".cache", ".git", ".asciidoctor"}
+
+# inotify のイベント（<sys/inotify.h>）
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_ISDIR = 0x40000000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+EVENT_HEADER = struct.Struct("iIII")
+
+
+def walk_dirs(roots: Iterable[str]) -> List[str]:
+    """監視対象のディレクトリ（IGNORED_DIRSを除く）"""
+    dirs = []
+    for root in roots:
+        if not os.path.isdir(root):
+            continue
+        for current, subdirs, _ in os.walk(root):
+            subdirs[:] = [d for d in subdirs if d not in IGNORED_DIRS]
+            dirs.append(os.path.abspath(current))
+    return dirs
+
+
+class InotifyWatcher:
+    """inotify でディレクトリ配下の変更を受け取るクラス（Linuxのみ）"""
+
+    def __init__(self, roots: Iterable[str]):
+        """
+        初期化
+
+        Args:
+            roots: 監視するディレクトリ（サブディレクトリも監視する）
+        """
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+        self.fd = self.libc.inotify_init1(IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: Dict[int, str] = {}
+        for path in walk_dirs(roots):
+            self._add(path)
+
+    def _add(self, path: str) -> None:
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.dirs[wd] = path
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """
+        変更を待つ
+
+        Args:
+            timeout: 待ち時間（秒）。Noneの場合は変更があるまで待つ
+
+        Returns:
+            変更されたファイルのパス（タイムアウトした場合は空）
+        """
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return set()
+
+        buf = os.read(self.fd, 64 * 1024)
+        changed = set()
+        offset = 0
+        while offset < len(buf):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(buf, offset)
+            offset += EVENT_HEADER.size
+            name = os.fsdecode(buf[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+            if mask & IN_ISDIR:
+                # 新しく作られたディレクトリも監視する
+                if mask & (IN_CREATE | IN_MOVED_TO) and name not in IGNORED_DIRS:
+                    for sub in walk_dirs([path]):
+                        self._add(sub)
+                continue
+            changed.add(path)
+        return changed
+
+    def close(self) -> None:
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """更新日時を定期的に確認して変更を検出するクラス（inotifyの代替）"""
+
+    def __init__(self, roots: Iterable[str], interval: float = 0.5):
+        """
+        初期化
+
+        Args:
+            roots: 監視するディレクトリ
+            interval: 確認間隔（秒）
+        """
+        self.roots = list(roots)
+        self.interval = interval
+        self.mtimes = self._scan()
+
+    def _scan(self) -> Dict[str, float]:
+        mtimes = {}
+        for directory in walk_dirs(self.roots):
+            for entry in os.scandir(directory):
+                if entry.is_file():
+                    mtimes[entry.path] = entry.stat().st_mtime
+        return mtimes
+
+    def wait(self, timeout: Optional[float]) -> Set[str]:
+        """変更を待つ（InotifyWatcher.wait と同じ）"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            time.sleep(self.interval if deadline is None else
+                       max(0.0, min(self.interval, deadline - time.monotonic())))
+            mtimes = self._scan()
+            changed = {p for p in mtimes.keys() | self.mtimes.keys() if mtimes.get(p) != self.mtimes.get(p)}
+            self.mtimes = mtimes
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self) -> None:
+        pass
+
+
+#     ____________________
+#____/ [*] 依存関係の逆引き \____________________
+#
+class DependencyMap:
+    """ファイル -> そのファイルに依存する（文書, 形式）の逆引き"""
+
+    def __init__(self, builder: DocBuilder):
+        self.builder = builder
+        self.reverse: Dict[str, Set[Tuple[str, str]]] = {}
+        self.deps: Dict[str, Dict[str, Set[str]]] = {}  # 文書 -> 形式 -> 依存ファイル
+        for source in builder.documents():
+            self.update(source)
+
+    def update(self, source: str) -> None:
+        """文書の依存関係を解析し直す（includeの追加・削除に追従する）"""
+        self.remove(source)
+        if not os.path.exists(source):
+            return
+        deps = self.builder.deps(source)
+        self.deps[source] = {fmt: deps.for_format(fmt) for fmt in self.builder.formats}
+        for fmt, paths in self.deps[source].items():
+            for path in paths:
+                self.reverse.setdefault(path, set()).add((source, fmt))
+
+    def remove(self, source: str) -> None:
+        for fmt, paths in self.deps.pop(source, {}).items():
+            for path in paths:
+                self.reverse.get(path, set()).discard((source, fmt))
+
+    def _is_new_font(self, path: str) -> bool:
+        fonts_dir = self.builder.fonts_dir
+        return (bool(fonts_dir) and "pdf" in self.builder.formats and path not in self.reverse
+                and path.startswith(os.path.abspath(fonts_dir) + os.sep)
+                and path.lower().endswith(FONT_EXTENSIONS))
+
+    def affected(self, changed: Iterable[str]) -> Dict[str, Set[str]]:
+        """
+        変更されたファイルに依存する文書と形式
+
+        Args:
+            changed: 変更されたファイル
+
+        Returns:
+            文書 -> 再ビルドする形式
+        """
+        documents = set(self.builder.documents())
+        targets: Dict[str, Set[str]] = {}
+        for path in changed:
+            path = os.path.abspath(path)
+            # 新しく追加された文書
+            if path in documents and path not in self.deps:
+                self.update(path)
+            for source, fmt in self.reverse.get(path, ()):
+                targets.setdefault(source, set()).add(fmt)
+            # 追加されたフォントはまだ逆引きにないため、PDFをすべて再ビルドする
+            if self._is_new_font(path):
+                for source in self.deps:
+                    targets.setdefault(source, set()).add("pdf")
+        return targets
+
+
+#     ____________________
+#____/ [*] 監視ループ      \____________________
+#
+def collect(watcher, debounce: float) -> Set[str]:
+    """
+    最初の変更を待ち、その後debounce秒間変更がなくなるまでまとめて受け取る
+    """
+    changed = watcher.wait(None)
+    while True:
+        more = watcher.wait(debounce)
+        if not more:
+            return changed
+        changed |= more
+
+
+def rebuild(builder: DocBuilder, deps: DependencyMap, targets: Dict[str, Set[str]]) -> None:
+    """
+    依存する文書を HTML → PDF の順に再ビルド
+    """
+    started = time.perf_counter()
+    for fmt in FORMATS:
+        sources = sorted(source for source, formats in targets.items() if fmt in formats)
+        if not sources:
+            continue
+        results = builder.build(sources, formats=(fmt,))
+        for r in results:
+            if r.status == "failed":
+                print(f"--- {r.source} ({r.fmt})\n{r.stderr}", file=sys.stderr)
+        print(format_report(results, builder.docs_dir), flush=True)
+
+    for source in targets:
+        deps.update(source)
+    print(f"rebuilt in {time.perf_counter() - started:.2f}s", flush=True)
+
+
+def watch(builder: DocBuilder, debounce: float = 0.2, poll: bool = False) -> None:
+    """
+    変更を監視して再ビルドし続ける（Ctrl+Cで終了）
+
+    Args:
+        builder: ビルドドライバ
+        debounce: 変更をまとめる待ち時間（秒）
+        poll: inotify の代わりに更新日時の定期確認を使う
+    """
+    roots = [builder.docs_dir]
+    if builder.fonts_dir:
+        fonts_dir = os.path.abspath(builder.fonts_dir)
+        if not fonts_dir.startswith(builder.docs_dir + os.sep):
+            roots.append(fonts_dir)
+
+    watcher = None
+    if not poll:
+        try:
+            watcher = InotifyWatcher(roots)
+        except OSError as e:
+            print(f"inotify unavailable ({e}), falling back to polling", file=sys.stderr)
+    if watcher is None:
+        watcher = PollingWatcher(roots)
+
+    deps = DependencyMap(builder)
+    print(f"watching {', '.join(roots)} ({type(watcher).__name__})", flush=True)
+    try:
+        while True:
+            targets = deps.affected(collect(watcher, debounce))
+            if targets:
+                rebuild(builder, deps, targets)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
+
+
+def main() -> int:
+    parser = build_arg_parser()
+    parser.add_argument("--debounce-ms", type=int, default=200, help="変更をまとめる待ち時間")
+    parser.add_argument("--poll", action="store_true", help="inotify の代わりに更新日時の定期確認を使う")
+    parser.add_argument("--no-initial-build", action="store_true", help="開始時に古い出力をビルドしない")
+    args = parser.parse_args()
+
+    builder = builder_from_args(args)
+    try:
+        if not args.no_initial_build:
+            # 開始時点で古くなっている出力もHTMLから先に揃える
+            for fmt in builder.formats:
+                print(format_report(builder.build(formats=(fmt,)), builder.docs_dir), flush=True)
+        watch(builder, args.debounce_ms / 1000, args.poll)
+    finally:
+        builder.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+描画・集計のベンチマーク（合成データ）
+
+synthetic_data の合成データで次の処理を同じプロセス内で実行し、件数ごとの実行時間を計測する。
+保存済みのベースラインと比べ、閾値を超えて遅くなったケースがあれば終了コード1で終了する。
+
+- gantt:     GanttChartRenderer.render_from_json（JSON読み込み〜HTML出力）
+- bug_curve: create_label_timeline + create_stacked_chart
+- sfm_graph: gen_grapy.create_graph（CSV読み込み〜HTML出力、PNGなし）
+
+    python render_bench.py --sizes 1000,10000 --save-baseline
+    python render_bench.py --sizes 1000,10000
+"""
+
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, redirect_stdout
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import synthetic_data
+
+ROOT = Path(__file__).resolve().parent.parent
+# 計測対象のスクリプトはパッケージではないため、ディレクトリごとimportパスに追加する
+sys.path[:0] = [str(ROOT / "github_util"), str(ROOT / "plotly_sfm_data")]
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "render_baseline.json"
+
+# 遅くなったと判定する比率（0.2 = ベースラインより20%以上遅い）
+DEFAULT_THRESHOLD = 0.2
+# これより小さい差（秒）は計測のばらつきとして無視する
+MIN_DELTA_SEC = 0.05
+
+
+@contextmanager
+def workdir():
+    """一時ディレクトリに移動して実行（出力ファイルをカレントに書く処理があるため）"""
+    cwd = os.getcwd()
+    path = tempfile.mkdtemp(prefix="render_bench_")
+    os.chdir(path)
+    try:
+        yield path
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+#     ____________________
+#____/ [*] ベンチマーク    \____________________
+#
+def prepare_gantt(n: int, seed: int) -> Callable[[], None]:
+    from draw_gantt_from_issue_and_project import GanttChartRenderer
+
+    json_file = synthetic_data.write_gantt_json("gantt_data.json", n, seed)
+    renderer = GanttChartRenderer()
+    return lambda: renderer.render_from_json(json_file, "bench-repo", "bench-owner")
+
+
+def prepare_bug_curve(n: int, seed: int) -> Callable[[], None]:
+    import generate_bug_curve_from_github_issues as bug_curve
+
+    df = synthetic_data.bug_issue_frame(n, seed)
+    unique_labels = bug_curve.get_unique_labels(df)
+
+    def run() -> None:
+        timeline = bug_curve.create_label_timeline(df, unique_labels)
+        bug_curve.create_stacked_chart(df, timeline, unique_labels, name="bench")
+
+    return run
+
+
+def prepare_sfm_graph(n: int, seed: int) -> Callable[[], None]:
+    import gen_grapy
+
+    csv_file = synthetic_data.write_sfm_csv("sfm_area.csv", n, seed)
+    return lambda: gen_grapy.create_graph([csv_file], jobs=1, png=False, output_dir="out")
+
+
+# ベンチマーク名 -> 準備関数（データを作成し、計測する処理を返す）
+BENCHMARKS: Dict[str, Callable[[int, int], Callable[[], None]]] = {
+    "gantt": prepare_gantt,
+    "bug_curve": prepare_bug_curve,
+    "sfm_graph": prepare_sfm_graph,
+}
+
+
+def run_benchmark(name: str, n: int, seed: int, repeat: int) -> Dict[str, Any]:
+    """
+    ベンチマーク1件を実行して計測（1回目は読み込み・キャッシュの影響を除くため計測しない）
+
+    Args:
+        name: ベンチマーク名
+        n: データ件数
+        seed: 乱数のシード
+        repeat: 計測回数
+
+    Returns:
+        計測結果（中央値・最小値・各回の秒数）
+    """
+    with workdir():
+        func = BENCHMARKS[name](n, seed)
+        times = []
+        # 計測対象の処理が出力する進捗表示は捨てる
+        with redirect_stdout(io.StringIO()):
+            func()
+            for _ in range(repeat):
+                start = time.perf_counter()
+                func()
+                times.append(time.perf_counter() - start)
+    return {
+        "name": name,
+        "size": n,
+        "median_sec": round(statistics.median(times), 4),
+        "min_sec": round(min(times), 4),
+        "runs": [round(t, 4) for t in times],
+    }
+
+
+#     ____________________
+#____/ [*] ベースライン比較 \____________________
+#
+def case_key(result: Dict[str, Any]) -> str:
+    return f"{result['name']}@{result['size']}"
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> None:
+    """
+    ベースラインと比較し、結果に比率と判定（ok / regression / new）を付ける
+
+    Args:
+        result: 今回の計測結果
+        baseline: 保存済みのベースライン（load_baseline の戻り値）
+        threshold: 遅くなったと判定する比率
+    """
+    base = baseline.get("cases", {}).get(case_key(result))
+    if base is None:
+        result.update(baseline_sec=None, ratio=None, status="new")
+        return
+    ratio = result["median_sec"] / base["median_sec"] if base["median_sec"] else float("inf")
+    slower = ratio > 1 + threshold and result["median_sec"] - base["median_sec"] > MIN_DELTA_SEC
+    result.update(baseline_sec=base["median_sec"], ratio=round(ratio, 3),
+                  status="regression" if slower else "ok")
+
+
+def load_baseline(path: Path) -> Optional[Dict[str, Any]]:
+    if not path.exists():
+        return None
+    with path.open(encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: Path, results: List[Dict[str, Any]], params: Dict[str, Any]) -> None:
+    """計測結果をベースラインとして保存（既存のケースは上書きし、それ以外は残す）"""
+    baseline = load_baseline(path) or {"cases": {}}
+    baseline["params"] = params
+    baseline["machine"] = {"python": platform.python_version(), "platform": platform.platform()}
+    for result in results:
+        baseline["cases"][case_key(result)] = {"median_sec": result["median_sec"], "min_sec": result["min_sec"]}
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+def format_result(result: Dict[str, Any]) -> str:
+    line = f"{result['name']:<10} {result['size']:>8,} {result['median_sec']:>9.3f}s"
+    if result.get("baseline_sec") is not None:
+        line += f"  (baseline {result['baseline_sec']:.3f}s, x{result['ratio']:.2f})"
+    return f"{line}  {result.get('status', '')}"
+
+
+def parse_sizes(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="合成データでの描画・集計ベンチマーク")
+    parser.add_argument("--sizes", type=parse_sizes, default=DEFAULT_SIZES,
+                        help="データ件数（カンマ区切り。既定: 1000,10000,100000）")
+    parser.add_argument("--only", action="append", choices=sorted(BENCHMARKS),
+                        help="実行するベンチマーク名（複数指定可）")
+    parser.add_argument("--repeat", type=int, default=3, help="計測回数（中央値で比較）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE, help="ベースラインのJSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="遅くなったと判定する比率（0.2 = 20%%）")
+    parser.add_argument("--save-baseline", action="store_true", help="今回の結果をベースラインとして保存")
+    parser.add_argument("--output", help="計測結果のJSON")
+    args = parser.parse_args(argv)
+
+    baseline = load_baseline(args.baseline)
+    results = []
+    for name in BENCHMARKS:
+        if args.only and name not in args.only:
+            continue
+        for n in args.sizes:
+            result = run_benchmark(name, n, args.seed, args.repeat)
+            if baseline is not None and not args.save_baseline:
+                compare(result, baseline, args.threshold)
+            results.append(result)
+            print(format_result(result), flush=True)
+
+    params = {"seed": args.seed, "repeat": args.repeat}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"params": dict(params, threshold=args.threshold), "results": results},
+                      f, ensure_ascii=False, indent=2)
+        print(f"results saved to {args.output}")
+
+    if args.save_baseline:
+        save_baseline(args.baseline, results, params)
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"no baseline ({args.baseline}); run with --save-baseline to create one")
+        return 0
+
+    regressions = [r for r in results if r.get("status") == "regression"]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}:", file=sys.stderr)
+        for result in regressions:
+            print(f"  {format_result(result)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
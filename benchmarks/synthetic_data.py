@@ -0,0 +1,146 @@
+"""
+描画・集計のベンチマーク用の合成データ
+
+seedを固定すると同じデータを生成する。GitHub APIやCSVの実データなしで、
+次のデータを任意の件数で作成する。
+
+- ガントチャート: fetch_and_save_data が保存するJSONの行
+- Bug Curve: assign_primary_labels の結果と同じ列のIssueデータフレーム
+- SFM面積: gen_grapy が読み込むCSV
+"""
+
+import json
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+# データの基準日（日付の範囲が実行日によって変わらないようにする）
+BASE_DATE = date(2023, 1, 1)
+
+BUG_LABELS = ["bug", "enhancement", "documentation", "question", "regression",
+              "performance", "security", "ui", "build", "None"]
+
+
+def gantt_rows(n: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    ガントチャートのJSONの行（Actual・Baselineがおよそ半数ずつ）
+
+    Args:
+        n: 行数
+        seed: 乱数のシード
+
+    Returns:
+        fetch_and_save_data と同じ形式の行のリスト
+    """
+    rng = random.Random(seed)
+    users = [f"user{i:02d}" for i in range(20)]
+    rows: List[Dict[str, Any]] = []
+    number = 0
+    while len(rows) < n:
+        number += 1
+        process = f"{rng.randint(1, 9)}-{rng.randint(1, 20)}-{rng.randint(1, 50)}"
+        title = f"{process} Task {number} <Phase {rng.randint(1, 5)} sub task {number % 97}>"
+        assignees = ", ".join(rng.sample(users, rng.randint(0, 2)))
+
+        baseline_start = BASE_DATE + timedelta(days=rng.randint(0, 700))
+        baseline_end = baseline_start + timedelta(days=rng.randint(1, 60))
+        actual_start = baseline_start + timedelta(days=rng.randint(-10, 20))
+        ongoing = rng.random() < 0.2
+        actual_end = actual_start + timedelta(days=rng.randint(1, 90))
+
+        rows.append({
+            "issue": title, "type": "Actual",
+            "start": actual_start.isoformat(), "end": actual_end.isoformat(),
+            "assignees": assignees, "number": number, "ongoing": ongoing,
+        })
+        if len(rows) < n:
+            rows.append({
+                "issue": title, "type": "Baseline",
+                "start": baseline_start.isoformat(), "end": baseline_end.isoformat(),
+                "assignees": assignees, "number": number, "ongoing": False,
+            })
+    return rows
+
+
+def write_gantt_json(path: str, n: int, seed: int = 0) -> str:
+    """ガントチャートのJSONを保存してパスを返す"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(gantt_rows(n, seed), f, ensure_ascii=False)
+    return path
+
+
+def bug_issue_frame(n: int, seed: int = 0, days: int = 730):
+    """
+    Bug Curveの集計に渡すIssueのデータフレーム
+
+    Args:
+        n: Issue数
+        seed: 乱数のシード
+        days: 作成日の範囲（日数）
+
+    Returns:
+        created_at / closed_at（未解決はNaT）/ primary_label / all_labels 列のDataFrame
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    # 件数の多いラベルほど先に来るよう、出現率に偏りをつける
+    weights = 1.0 / np.arange(1, len(BUG_LABELS) + 1)
+    labels = rng.choice(BUG_LABELS, size=n, p=weights / weights.sum())
+
+    created = pd.Timestamp(BASE_DATE) + pd.to_timedelta(np.sort(rng.integers(0, days, size=n)), unit="D")
+    close_days = pd.to_timedelta(rng.exponential(20.0, size=n).astype(int), unit="D")
+    closed = pd.Series(created + close_days)
+    # 約15%は未解決。期間の終わりより後にクローズするIssueも未解決とする
+    end = pd.Timestamp(BASE_DATE) + pd.Timedelta(days=days)
+    closed[(rng.random(n) < 0.15) | (closed > end)] = pd.NaT
+
+    return pd.DataFrame({
+        "created_at": created,
+        "closed_at": closed.to_numpy(),
+        "primary_label": labels,
+        "all_labels": [[label] for label in labels],
+    })
+
+
+def sfm_area_frame(n: int, seed: int = 0, modules: int = 20):
+    """
+    SFM面積データ（モジュールごとに日付順で面積が少しずつ増える）
+
+    Args:
+        n: 行数
+        seed: 乱数のシード
+        modules: モジュール数
+
+    Returns:
+        Date / Total Area / Impl-SfM / Design-SfM / target module 列のDataFrame
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    names = [f"module_{i:02d}" for i in range(modules)]
+    module_index = np.arange(n) % modules
+    step = np.arange(n) // modules
+
+    base = rng.uniform(100, 10000, size=modules)
+    growth = rng.normal(1.0, 3.0, size=n)
+    area = np.empty(n)
+    for m in range(modules):
+        mask = module_index == m
+        area[mask] = base[m] + np.cumsum(growth[mask])
+
+    return pd.DataFrame({
+        "Date": pd.Timestamp(BASE_DATE) + pd.to_timedelta(step, unit="h"),
+        "Total Area": area.round(2),
+        "Impl-SfM": rng.choice(["abb", "abc", "abd"], size=n),
+        "Design-SfM": rng.choice(["bba", "bbc"], size=n),
+        "target module": np.asarray(names)[module_index],
+    })
+
+
+def write_sfm_csv(path: str, n: int, seed: int = 0, modules: int = 20) -> str:
+    """SFM面積データのCSVを保存してパスを返す"""
+    sfm_area_frame(n, seed, modules).to_csv(path, index=False)
+    return path
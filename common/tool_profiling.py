@@ -0,0 +1,292 @@
+"""
+処理時間・HTTPリクエスト数・ピークメモリの計測
+
+フェーズ（取得・解析・変換・描画・書き出し）ごとの時間をコンテキストマネージャで記録し、
+requests経由のHTTPリクエスト数・受信バイト数・リトライ数、プロセスのピークメモリと合わせて
+JSONに保存する。フェーズの時間の計測は常に有効（フェーズあたり time.perf_counter 2回）で、
+--profile を指定した場合だけHTTPリクエストを記録して保存する。
+
+    from tool_profiling import phase, profile_session
+
+    with profile_session(args.profile, args.profile_phase):
+        with phase("fetch"):
+            items = fetch()
+
+フェーズは入れ子にできる（親フェーズの時間は子フェーズを含む）。
+cprofile_phase を指定すると、そのフェーズの実行中だけ cProfile で関数ごとの時間を取る。
+
+ThreadPoolExecutor のワーカー内のフェーズは時間（壁時計）と呼び出し回数だけを記録する。
+cProfile はフェーズを開始したスレッドだけを計測するため、ワーカーで実行される関数は
+cProfile の結果に含まれない（ProcessPoolExecutor のワーカー内のフェーズは記録されない）。
+
+標準ライブラリのみで動作する。各ツールのスクリプトは、このディレクトリ（common）を
+importパスに追加して `from tool_profiling import ...` で使う。
+"""
+
+import cProfile
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# cProfileの結果としてJSONに含める関数の数（累積時間の上位）
+CPROFILE_TOP = 30
+
+# cProfileの計測範囲（計測結果のJSONに含める）
+THREAD_NOTE = "cProfile はフェーズを開始したスレッドだけを計測（スレッドプールのワーカーの処理は含まない）"
+
+
+def peak_rss_mb() -> Optional[float]:
+    """プロセスのピークメモリ（最大RSS, MB）"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux はKB、macOS はバイト単位
+    return rss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+class Profiler:
+    """フェーズごとの時間とHTTPリクエストの集計"""
+
+    def __init__(self, cprofile_phase: Optional[str] = None):
+        """
+        初期化
+
+        Args:
+            cprofile_phase: cProfile で計測するフェーズ名
+        """
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.cprofile_phase = cprofile_phase
+        self._cprofile: Optional[cProfile.Profile] = None
+        self._cprofile_depth = 0
+        self._cprofile_thread: Optional[int] = None
+        self._lock = threading.Lock()
+        self.phases: Dict[str, Dict[str, float]] = defaultdict(lambda: {"seconds": 0.0, "calls": 0})
+        self.http: Dict[str, Any] = {
+            "requests": 0, "bytes": 0, "retries": 0, "errors": 0, "seconds": 0.0,
+            "by_status": defaultdict(int),
+        }
+        self.counters: Dict[str, float] = defaultdict(int)
+        self._original_send = None
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        フェーズの時間を記録（同じ名前は呼び出し回数と合計時間を集計）
+
+        Args:
+            name: フェーズ名（例: fetch, parse, transform, render, write）
+        """
+        profiling = name == self.cprofile_phase and self._start_cprofile()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            if profiling:
+                self._stop_cprofile()
+            with self._lock:
+                self.phases[name]["seconds"] += elapsed
+                self.phases[name]["calls"] += 1
+
+    def _start_cprofile(self) -> bool:
+        """
+        cProfile を開始（同じフェーズの入れ子・再帰呼び出しでは1つのプロファイラを使い続ける）
+
+        cProfile は enable したスレッドだけを計測するため、別のスレッドで計測中の場合は
+        開始せずにFalseを返す（そのスレッドのフェーズは時間だけを記録する）
+        """
+        ident = threading.get_ident()
+        with self._lock:
+            if self._cprofile_depth and self._cprofile_thread != ident:
+                return False
+            self._cprofile_depth += 1
+            if self._cprofile_depth > 1:
+                return True
+            self._cprofile_thread = ident
+            if self._cprofile is None:
+                self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+        return True
+
+    def _stop_cprofile(self) -> None:
+        with self._lock:
+            self._cprofile_depth -= 1
+            if self._cprofile_depth > 0:
+                return
+        self._cprofile.disable()
+
+    def count(self, name: str, value: float = 1) -> None:
+        """任意のカウンタを加算（例: 取得したIssue数）"""
+        with self._lock:
+            self.counters[name] += value
+
+    def record_request(self, status: Optional[int], nbytes: int, seconds: float, retries: int = 0) -> None:
+        """
+        HTTPリクエスト1件を記録
+
+        Args:
+            status: ステータスコード（接続エラーの場合はNone）
+            nbytes: 受信したボディのバイト数
+            seconds: 所要時間
+            retries: リトライ回数
+        """
+        with self._lock:
+            self.http["requests"] += 1
+            self.http["bytes"] += nbytes
+            self.http["retries"] += retries
+            self.http["seconds"] += seconds
+            self.http["by_status"][str(status) if status is not None else "error"] += 1
+            if status is None or status >= 400:
+                self.http["errors"] += 1
+
+    def install_http_hooks(self) -> None:
+        """
+        requests.Session.send をラップして、requests・PyGithub経由のすべてのリクエストを記録する
+
+        受信バイト数はボディを読み込んだ場合（stream=False、既定）だけ数える。
+        uninstall_http_hooks() で元に戻す
+        """
+        if self._original_send is not None:
+            return
+        import requests
+
+        original_send = requests.Session.send
+        profiler = self
+
+        def send(session, request, **kwargs):
+            start = time.perf_counter()
+            try:
+                response = original_send(session, request, **kwargs)
+            except requests.RequestException:
+                profiler.record_request(None, 0, time.perf_counter() - start)
+                raise
+            nbytes = 0 if kwargs.get("stream") else len(response.content or b"")
+            retry = getattr(response.raw, "retries", None)
+            retries = len(retry.history) if retry is not None and getattr(retry, "history", None) else 0
+            profiler.record_request(response.status_code, nbytes, time.perf_counter() - start, retries)
+            return response
+
+        requests.Session.send = send
+        self._original_send = original_send
+
+    def uninstall_http_hooks(self) -> None:
+        """install_http_hooks() でラップした requests.Session.send を元に戻す"""
+        if self._original_send is None:
+            return
+        import requests
+
+        requests.Session.send = self._original_send
+        self._original_send = None
+
+    def _cprofile_report(self) -> Optional[Dict[str, Any]]:
+        if self._cprofile is None:
+            return None
+        stats = pstats.Stats(self._cprofile, stream=io.StringIO()).sort_stats("cumulative")
+        top = []
+        for (filename, line, func), (_, ncalls, tottime, cumtime, _) in sorted(
+            stats.stats.items(), key=lambda kv: kv[1][3], reverse=True
+        )[:CPROFILE_TOP]:
+            top.append({
+                "function": f"{os.path.basename(filename)}:{line}({func})",
+                "calls": ncalls, "tottime": round(tottime, 4), "cumtime": round(cumtime, 4),
+            })
+        return {"phase": self.cprofile_phase, "note": THREAD_NOTE, "top": top}
+
+    def report(self) -> Dict[str, Any]:
+        """計測結果（JSONに変換できる辞書）"""
+        with self._lock:
+            http = dict(self.http, by_status=dict(self.http["by_status"]))
+            http["seconds"] = round(http["seconds"], 4)
+            return {
+                "command": " ".join([os.path.basename(sys.argv[0])] + sys.argv[1:]),
+                "started_at": self.started_at,
+                "wall_seconds": round(time.perf_counter() - self.started, 4),
+                "phases": {
+                    name: {"seconds": round(v["seconds"], 4), "calls": v["calls"]}
+                    for name, v in self.phases.items()
+                },
+                "http": http,
+                "counters": dict(self.counters),
+                "peak_rss_mb": None if peak_rss_mb() is None else round(peak_rss_mb(), 1),
+                "cprofile": self._cprofile_report(),
+            }
+
+    def dump(self, path: str) -> Dict[str, Any]:
+        """
+        計測結果をJSONで保存（cProfileを使った場合は同じ名前の .pstats も保存）
+
+        Args:
+            path: 保存先
+
+        Returns:
+            保存した計測結果
+        """
+        report = self.report()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        if self._cprofile is not None:
+            self._cprofile.dump_stats(f"{os.path.splitext(path)[0]}.pstats")
+        return report
+
+
+# プロセス全体で共有する計測器
+PROFILER = Profiler()
+
+
+def phase(name: str):
+    """PROFILER.phase の省略形"""
+    return PROFILER.phase(name)
+
+
+def configure(cprofile_phase: Optional[str] = None) -> Profiler:
+    """cProfileで計測するフェーズを設定（--profile-phase）"""
+    PROFILER.cprofile_phase = cprofile_phase
+    return PROFILER
+
+
+@contextmanager
+def profile_session(path: Optional[str], cprofile_phase: Optional[str] = None,
+                    http: bool = True,
+                    on_saved: Optional[Callable[[str], None]] = None) -> Iterator[Profiler]:
+    """
+    --profile / --profile-phase に対応する計測の範囲
+
+    pathを指定した場合だけHTTPリクエストを記録し、終了時（例外の場合も）に
+    requests.Session.send を元に戻して計測結果を保存する
+
+    Args:
+        path: 計測結果の保存先（Noneの場合は保存せず、HTTPリクエストも記録しない）
+        cprofile_phase: cProfile で計測するフェーズ名（pathを指定した場合のみ）
+        http: HTTPリクエストを記録するか（HTTPを使わないツールはFalse）
+        on_saved: 保存後に保存先を渡して呼ぶ関数（Noneの場合は標準エラー出力に表示）
+    """
+    if not path:
+        yield PROFILER
+        return
+
+    configure(cprofile_phase)
+    if http:
+        PROFILER.install_http_hooks()
+    try:
+        yield PROFILER
+    finally:
+        PROFILER.uninstall_http_hooks()
+        PROFILER.dump(path)
+        if on_saved is None:
+            print(f"profile saved to {path}", file=sys.stderr)
+        else:
+            on_saved(path)
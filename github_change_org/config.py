@@ -6,12 +6,24 @@ import os
 from typing import Dict, Any
 
 # GitHub API設定
-GITHUB_API_BASE_URL = "https://api.github.com"
+GITHUB_API_BASE_URL = os.getenv('GITHUB_API_URL', "https://api.github.com").rstrip('/')
 GITHUB_ACCEPT_HEADER = "application/vnd.github.v3+json"
 
 # レート制限設定
 DEFAULT_RATE_LIMIT_DELAY = int(os.getenv('RATE_LIMIT_DELAY', '2'))  # 秒
 TRANSFER_TIMEOUT = int(os.getenv('TRANSFER_TIMEOUT', '300'))  # 秒
+TRANSFER_POLL_INTERVAL = int(os.getenv('TRANSFER_POLL_INTERVAL', '10'))  # 秒
+RATE_LIMIT_MIN_REMAINING = int(os.getenv('RATE_LIMIT_MIN_REMAINING', '50'))  # この残量以下でリセットまで待機
+
+# HTTP接続設定（keep-aliveセッション）
+HTTP_TIMEOUT = float(os.getenv('HTTP_TIMEOUT', '30'))  # 秒（接続・読み込み）
+HTTP_MAX_RETRIES = int(os.getenv('HTTP_MAX_RETRIES', '3'))
+HTTP_BACKOFF_FACTOR = float(os.getenv('HTTP_BACKOFF_FACTOR', '1.0'))
+HTTP_POOL_SIZE = int(os.getenv('HTTP_POOL_SIZE', '10'))
+HTTP_RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+# レイテンシヒストグラムのバケット境界（ミリ秒）
+LATENCY_BUCKETS_MS = [100, 250, 500, 1000, 2500, 5000]
 
 # 必要なGitHub権限
 REQUIRED_SCOPES = [
@@ -55,4 +67,22 @@ CONFIRMATION_PROMPTS = {
         'prod'
     ],
     'large_repos_mb': 100
-}
\ No newline at end of file
+}
+
+# 転送計画のコストモデル（秒単位の見積もり）
+PLAN_COST_MODEL = {
+    'base_sec': 30,             # 転送API呼び出しと反映待ちの基本時間
+    'sec_per_mb': 0.5,          # ディスク使用量あたり
+    'sec_per_open_pr': 1,       # オープンPRあたり
+    'sec_per_webhook': 2,       # Webhookあたり（転送後の再設定確認を含む）
+    'lfs_penalty_sec': 120,     # Git LFS使用時の追加時間
+}
+
+# 転送計画のバケット境界（見積もり秒）
+PLAN_BUCKET_THRESHOLDS_SEC = {
+    'small': 60,
+    'medium': 300,
+}
+
+# 転送後の設定検証（並列数はHTTP_POOL_SIZE以下にする）
+VERIFY_MAX_WORKERS = int(os.getenv('VERIFY_MAX_WORKERS', '8'))
@@ -6,19 +6,38 @@ GitHubのorganization変更に伴うリポジトリ移動を自動化するツ
 """
 
 import os
+import re
+import sys
 import json
 import time
 import logging
-from typing import List, Dict, Optional, Tuple
+import threading
+from bisect import bisect_right
+from collections import defaultdict
+from typing import Callable, List, Dict, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
 
 import click
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from github import Github, Repository
 from tabulate import tabulate
 from dotenv import load_dotenv
 
+import config
+from transfer_planner import RepoCost, TransferPlan, build_plan, format_plan_report
+from transfer_verifier import (
+    SettingsSnapshot, TransferVerifier, VerificationResult,
+    format_verification_report, load_snapshots, save_snapshots
+)
+
+# 共有モジュール（リポジトリ直下の common）。ツールのディレクトリだけを配置する場合は
+# common/tool_profiling.py をスクリプトと同じディレクトリに置く
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from tool_profiling import phase, profile_session  # noqa: E402
+
 # 環境変数の読み込み
 load_dotenv()
 
@@ -33,6 +52,12 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 除外パターンを1つの正規表現にまとめてコンパイル（リポジトリ毎のループを避ける）
+EXCLUDED_REPO_RE = (
+    re.compile("|".join(f"(?:{p})" for p in config.EXCLUDED_REPO_PATTERNS))
+    if config.EXCLUDED_REPO_PATTERNS else None
+)
+
 @dataclass
 class TransferResult:
     """転送結果を保持するデータクラス"""
@@ -40,24 +65,113 @@ class TransferResult:
     success: bool
     error_message: Optional[str] = None
     transfer_time: Optional[datetime] = None
+    skipped: bool = False  # 事前フィルタで除外されたかどうか
 
 class GitHubOrgTransfer:
     """GitHub organization間でのリポジトリ転送を管理するクラス"""
     
-    def __init__(self, token: str):
+    def __init__(self, token: str, team_map: Optional[Dict[str, str]] = None):
         """
         初期化
         
         Args:
             token: GitHub Personal Access Token
+            team_map: 検証時のチームslugの対応（転送元 -> 転送先。ない場合は同じslug）
         """
         self.token = token
-        self.github = Github(token)
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.github = Github(
+            token,
+            base_url=config.GITHUB_API_BASE_URL,
+            timeout=int(config.HTTP_TIMEOUT),
+            retry=config.HTTP_MAX_RETRIES,
+            pool_size=config.HTTP_POOL_SIZE,
+        )
+        self.session = self._create_session(token)
+        # エンドポイント種別ごとのレイテンシ（ミリ秒）
+        self.request_latencies: Dict[str, List[float]] = defaultdict(list)
+        # レート制限の残量（並列実行時に共有）
+        self._rate_limit_lock = threading.Lock()
+        self._rate_limit_remaining: Optional[int] = None
+        self._rate_limit_reset: float = 0.0
+        self.verifier = TransferVerifier(self._request, team_map=team_map)
+        # 転送可能性チェックで使う認証ユーザー名・転送先organizationの確認結果
+        self._login: Optional[str] = None
+        self._target_org_errors: Dict[str, Optional[str]] = {}
+        self.verification_results: List[VerificationResult] = []
+
+    @staticmethod
+    def _create_session(token: str) -> requests.Session:
+        """
+        keep-alive・コネクションプール・リトライ付きのセッションを作成
+
+        Args:
+            token: GitHub Personal Access Token
+
+        Returns:
+            設定済みのセッション
+        """
+        retry = Retry(
+            total=config.HTTP_MAX_RETRIES,
+            backoff_factor=config.HTTP_BACKOFF_FACTOR,
+            status_forcelist=config.HTTP_RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry,
+            pool_connections=config.HTTP_POOL_SIZE,
+            pool_maxsize=config.HTTP_POOL_SIZE,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
             'Authorization': f'token {token}',
-            'Accept': 'application/vnd.github.v3+json'
+            'Accept': config.GITHUB_ACCEPT_HEADER
         })
+        return session
+
+    def _request(self, method: str, path: str, category: str, **kwargs) -> requests.Response:
+        """
+        共有セッション経由でGitHub APIを呼び出し、レイテンシを記録
+
+        Args:
+            method: HTTPメソッド
+            path: APIパス（例: /repos/owner/name）
+            category: レイテンシ集計用の種別名
+            **kwargs: requestsに渡す追加引数
+
+        Returns:
+            レスポンス
+        """
+        kwargs.setdefault('timeout', config.HTTP_TIMEOUT)
+        url = f"{config.GITHUB_API_BASE_URL}{path}"
+        self._throttle()
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        finally:
+            self.request_latencies[category].append((time.perf_counter() - start) * 1000)
+        
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        if remaining is not None:
+            with self._rate_limit_lock:
+                self._rate_limit_remaining = int(remaining)
+                self._rate_limit_reset = float(response.headers.get('X-RateLimit-Reset', 0))
+        return response
+    
+    def _throttle(self) -> None:
+        """レート制限の残量が少ない場合はリセット時刻まで待機"""
+        with self._rate_limit_lock:
+            if self._rate_limit_remaining is None \
+                    or self._rate_limit_remaining > config.RATE_LIMIT_MIN_REMAINING:
+                return
+            wait = self._rate_limit_reset - time.time()
+            if wait > 0:
+                logger.warning(f"レート制限の残量が少ないため{wait:.0f}秒待機します")
+                with phase("rate_limit_wait"):
+                    time.sleep(wait + 1)
+            self._rate_limit_remaining = None
         
     def get_organization_repos(self, org_name: str) -> List[Repository.Repository]:
         """
@@ -70,14 +184,107 @@ class GitHubOrgTransfer:
             リポジトリのリスト
         """
         try:
-            org = self.github.get_organization(org_name)
-            repos = list(org.get_repos())
+            with phase("fetch"):
+                org = self.github.get_organization(org_name)
+                repos = list(org.get_repos())
             logger.info(f"Organization '{org_name}'から{len(repos)}個のリポジトリを取得しました")
             return repos
         except Exception as e:
             logger.error(f"Organization '{org_name}'のリポジトリ取得に失敗: {e}")
             return []
     
+    def prefilter_reason(self, repo: Repository.Repository) -> Optional[str]:
+        """
+        一覧取得時のメタデータのみで除外判定（追加のAPI呼び出しなし）
+        
+        Args:
+            repo: 判定対象のリポジトリ
+            
+        Returns:
+            除外理由（転送候補の場合はNone）
+        """
+        checks = config.TRANSFER_ELIGIBILITY_CHECKS
+        
+        if EXCLUDED_REPO_RE is not None and EXCLUDED_REPO_RE.match(repo.name):
+            return "除外パターンに一致"
+        if repo.archived:
+            return "アーカイブ済みリポジトリ"
+        if checks.get('check_fork_status') and repo.fork:
+            return "フォークされたリポジトリは転送できません（GitHubの制限）"
+        if checks.get('check_size_limit') and repo.size > config.MAX_REPO_SIZE_MB * 1024:
+            return f"サイズ上限超過（{repo.size // 1024}MB > {config.MAX_REPO_SIZE_MB}MB）"
+        if checks.get('check_private_access') and repo.permissions is not None \
+                and not repo.permissions.admin:
+            return f"リポジトリ '{repo.name}' への管理者権限が必要です"
+        
+        return None
+    
+    def prefilter_repos(self, repos: List[Repository.Repository]
+                        ) -> Tuple[List[Repository.Repository], List[TransferResult]]:
+        """
+        リポジトリ一覧を事前フィルタで振り分け
+        
+        Args:
+            repos: 一覧取得したリポジトリ
+            
+        Returns:
+            (転送候補のリスト, 除外されたリポジトリの結果リスト)
+        """
+        candidates = []
+        skipped = []
+        for repo in repos:
+            reason = self.prefilter_reason(repo)
+            if reason is None:
+                candidates.append(repo)
+            else:
+                skipped.append(TransferResult(repo.name, False, reason, skipped=True))
+        
+        logger.info(f"事前フィルタ: 候補 {len(candidates)}個 / 除外 {len(skipped)}個")
+        return candidates, skipped
+    
+    @staticmethod
+    def confirmation_reason(repo: Repository.Repository) -> Optional[str]:
+        """
+        転送前に確認が必要なリポジトリかどうかを判定
+        
+        Args:
+            repo: 判定対象のリポジトリ
+            
+        Returns:
+            確認が必要な理由（不要な場合はNone）
+        """
+        prompts = config.CONFIRMATION_PROMPTS
+        if repo.name.lower() in prompts['dangerous_repos']:
+            return f"重要な名前のリポジトリです: {repo.name}"
+        if repo.size > prompts['large_repos_mb'] * 1024:
+            return f"大きなリポジトリです: {repo.size // 1024}MB"
+        return None
+    
+    def _get_login(self) -> str:
+        """認証ユーザーのログイン名（1回だけ取得する）"""
+        if self._login is None:
+            response = self._request('GET', "/user", 'eligibility')
+            response.raise_for_status()
+            self._login = response.json()['login']
+        return self._login
+    
+    def _check_target_org(self, target_org: str) -> Optional[str]:
+        """
+        転送先organizationにアクセスできるか確認（organizationごとに1回だけ取得する）
+        
+        Args:
+            target_org: 転送先organization
+            
+        Returns:
+            エラーメッセージ（アクセスできる場合はNone）
+        """
+        if target_org not in self._target_org_errors:
+            response = self._request('GET', f"/orgs/{target_org}", 'eligibility')
+            self._target_org_errors[target_org] = (
+                None if response.status_code == 200 else f"{response.status_code} {response.text}"
+            )
+        return self._target_org_errors[target_org]
+    
     def check_transfer_eligibility(self, repo: Repository.Repository, target_org: str) -> Tuple[bool, str]:
         """
         リポジトリの転送可能性をチェック
@@ -93,23 +300,27 @@ class GitHubOrgTransfer:
         if repo.fork:
             return False, "フォークされたリポジトリは転送できません（GitHubの制限）"
         
-        # 同名リポジトリの存在チェック
+        # 同名リポジトリの存在チェック（_request 経由でレート制限・レイテンシの集計に含める）
         try:
-            target_org_obj = self.github.get_organization(target_org)
-            try:
-                existing_repo = target_org_obj.get_repo(repo.name)
+            error = self._check_target_org(target_org)
+            if error:
+                return False, f"転送先organization '{target_org}'へのアクセス権限がありません: {error}"
+            response = self._request('GET', f"/repos/{target_org}/{repo.name}", 'eligibility')
+            if response.status_code == 200:
                 return False, f"転送先に同名のリポジトリ '{repo.name}' が既に存在します"
-            except:
-                pass  # 同名リポジトリが存在しない（転送可能）
-        except Exception as e:
+        except requests.RequestException as e:
             return False, f"転送先organization '{target_org}'へのアクセス権限がありません: {e}"
         
         # 管理者権限チェック
         try:
-            permissions = repo.get_collaborator_permission(self.github.get_user().login)
+            response = self._request(
+                'GET', f"/repos/{repo.full_name}/collaborators/{self._get_login()}/permission", 'eligibility'
+            )
+            response.raise_for_status()
+            permissions = response.json().get('permission')
             if permissions != 'admin':
                 return False, f"リポジトリ '{repo.name}' への管理者権限が必要です（現在: {permissions}）"
-        except Exception as e:
+        except (requests.RequestException, ValueError) as e:
             return False, f"権限確認エラー: {e}"
         
         # プライベートリポジトリの場合の注意事項
@@ -120,7 +331,7 @@ class GitHubOrgTransfer:
         return True, f"転送可能です{warning}"
     
     def transfer_repository(self, repo: Repository.Repository, target_org: str, 
-                          dry_run: bool = False) -> TransferResult:
+                          dry_run: bool = False, check: bool = True) -> TransferResult:
         """
         リポジトリを指定されたorganizationに転送
         
@@ -128,6 +339,7 @@ class GitHubOrgTransfer:
             repo: 転送対象のリポジトリ
             target_org: 転送先organization
             dry_run: ドライランモード（実際の転送は行わない）
+            check: 転送可能性チェック（API呼び出し）を行うかどうか
             
         Returns:
             転送結果
@@ -135,29 +347,33 @@ class GitHubOrgTransfer:
         start_time = datetime.now()
         
         # 転送可能性チェック
-        can_transfer, reason = self.check_transfer_eligibility(repo, target_org)
-        if not can_transfer:
-            logger.warning(f"リポジトリ '{repo.name}' の転送をスキップ: {reason}")
-            return TransferResult(repo.name, False, reason)
+        if check:
+            can_transfer, reason = self.check_transfer_eligibility(repo, target_org)
+            if not can_transfer:
+                logger.warning(f"リポジトリ '{repo.name}' の転送をスキップ: {reason}")
+                return TransferResult(repo.name, False, reason)
         
         if dry_run:
             logger.info(f"[DRY RUN] リポジトリ '{repo.name}' を '{target_org}' に転送します")
-            return TransferResult(repo.name, True, "ドライランモード", start_time)
+            note = "ドライランモード" if check else "ドライランモード（転送可能性チェックなし）"
+            return TransferResult(repo.name, True, note, start_time)
         
         try:
             # GitHub APIを使用してリポジトリを転送
             # 注意: Repository Transfer APIを使用
-            url = f"https://api.github.com/repos/{repo.full_name}/transfer"
             headers = {
                 'Accept': 'application/vnd.github.nightshade-preview+json',  # Transfer API用ヘッダー
-                'Authorization': f'token {self.token}'
             }
             data = {
                 "new_owner": target_org,
                 "team_ids": []  # 必要に応じてチームIDを指定
             }
             
-            response = requests.post(url, headers=headers, json=data)
+            with phase("transfer"):
+                response = self._request(
+                    'POST', f"/repos/{repo.full_name}/transfer", 'transfer',
+                    headers=headers, json=data
+                )
             
             if response.status_code == 202:  # Accepted
                 logger.info(f"リポジトリ '{repo.name}' の転送を開始しました")
@@ -179,14 +395,14 @@ class GitHubOrgTransfer:
             return TransferResult(repo.name, False, error_msg)
     
     def _wait_for_transfer_completion(self, old_repo_path: str, target_org: str, 
-                                    timeout: int = 300) -> bool:
+                                    timeout: Optional[int] = None) -> bool:
         """
         転送完了を待機
         
         Args:
             old_repo_path: 元のリポジトリパス
             target_org: 転送先organization
-            timeout: タイムアウト時間（秒）
+            timeout: タイムアウト時間（秒、Noneの場合はconfig.TRANSFER_TIMEOUT）
             
         Returns:
             転送完了したかどうか
@@ -194,22 +410,151 @@ class GitHubOrgTransfer:
         repo_name = old_repo_path.split('/')[-1]
         new_repo_path = f"{target_org}/{repo_name}"
         
-        start_time = time.time()
-        while time.time() - start_time < timeout:
-            try:
-                # 新しい場所でリポジトリが存在するかチェック
-                response = self.session.get(f"https://api.github.com/repos/{new_repo_path}")
-                if response.status_code == 200:
-                    return True
-                time.sleep(10)  # 10秒待機
-            except Exception:
-                time.sleep(10)
+        if timeout is None:
+            timeout = config.TRANSFER_TIMEOUT
+        
+        with phase("transfer_poll"):
+            start_time = time.time()
+            while time.time() - start_time < timeout:
+                try:
+                    # 新しい場所でリポジトリが存在するかチェック
+                    response = self._request('GET', f"/repos/{new_repo_path}", 'poll')
+                    if response.status_code == 200:
+                        return True
+                    time.sleep(config.TRANSFER_POLL_INTERVAL)
+                except Exception:
+                    time.sleep(config.TRANSFER_POLL_INTERVAL)
         
         return False
     
+    def collect_cost_signals(self, repo: Repository.Repository,
+                             detailed: bool = True) -> RepoCost:
+        """
+        転送コストの見積もりに使う情報を収集
+        
+        Args:
+            repo: 対象リポジトリ
+            detailed: LFS・オープンPR・Webhookを追加のAPI呼び出しで取得するか
+            
+        Returns:
+            コスト要因
+        """
+        cost = RepoCost(repo.name, repo.full_name, repo.size)
+        if not detailed:
+            return cost
+        
+        # Git LFS（.gitattributesにfilter=lfsがあるか）
+        if config.TRANSFER_ELIGIBILITY_CHECKS.get('check_lfs_usage'):
+            response = self._request(
+                'GET', f"/repos/{repo.full_name}/contents/.gitattributes", 'plan',
+                headers={'Accept': 'application/vnd.github.raw'}
+            )
+            cost.uses_lfs = response.status_code == 200 and 'filter=lfs' in response.text
+        
+        # オープンPR数（per_page=1のページ数から算出）
+        response = self._request(
+            'GET', f"/repos/{repo.full_name}/pulls", 'plan',
+            params={'state': 'open', 'per_page': 1}
+        )
+        if response.status_code == 200:
+            last = response.links.get('last', {}).get('url')
+            match = re.search(r'[?&]page=(\d+)', last) if last else None
+            cost.open_prs = int(match.group(1)) if match else len(response.json())
+        
+        # Webhook数（管理者権限がない場合は0扱い）
+        response = self._request(
+            'GET', f"/repos/{repo.full_name}/hooks", 'plan', params={'per_page': 100}
+        )
+        if response.status_code == 200:
+            cost.webhooks = len(response.json())
+        
+        return cost
+    
+    def plan_transfer(self, source_org: str, target_org: str,
+                      repo_filter: Optional[List[str]] = None,
+                      detailed: bool = True) -> TransferPlan:
+        """
+        転送計画を作成（コスト見積もり・順序付け・予測タイムライン）
+        
+        Args:
+            source_org: 転送元organization
+            target_org: 転送先organization
+            repo_filter: 転送対象リポジトリ名のリスト（Noneの場合は全て）
+            detailed: 追加のAPI呼び出しでコスト要因を取得するか
+            
+        Returns:
+            転送計画
+        """
+        repos = self.get_organization_repos(source_org)
+        if repo_filter:
+            repos = [repo for repo in repos if repo.name in repo_filter]
+        
+        repos, skipped = self.prefilter_repos(repos)
+        with phase("plan"):
+            entries = [self.collect_cost_signals(repo, detailed) for repo in repos]
+        
+        plan = build_plan(
+            source_org, target_org, entries,
+            {r.repo_name: r.error_message for r in skipped}
+        )
+        logger.info(f"転送計画を作成しました: {len(plan.entries)}個のリポジトリ")
+        return plan
+    
+    def execute_plan(self, plan: TransferPlan, dry_run: bool = False,
+                     confirm: Optional[Callable[[Repository.Repository, str], bool]] = None,
+                     verify: bool = False, reapply: bool = False,
+                     repo_filter: Optional[List[str]] = None
+                     ) -> List[TransferResult]:
+        """
+        転送計画の順序どおりに転送を実行
+        
+        ドライランでは転送可能性チェック（リポジトリごとのAPI呼び出し）を行わず、
+        計画の順序と対象だけを確認する。
+        
+        Args:
+            plan: 転送計画
+            dry_run: ドライランモード
+            confirm: 確認が必要なリポジトリで呼ばれる関数（Falseでスキップ）
+            verify: 転送前後の設定を比較するかどうか
+            reapply: 検証で見つかった差分を再設定するかどうか
+            repo_filter: 転送対象リポジトリ名のリスト（Noneの場合は計画の全て）
+            
+        Returns:
+            転送結果のリスト
+        """
+        logger.info(f"計画に従って転送開始: {plan.source_org} -> {plan.target_org}")
+        
+        entries = plan.entries
+        skipped = plan.skipped
+        if repo_filter:
+            entries = [entry for entry in entries if entry.name in repo_filter]
+            skipped = {name: reason for name, reason in skipped.items() if name in repo_filter}
+            logger.info(f"フィルタ適用後: {len(entries)}個のリポジトリ")
+        
+        # 一覧を1回だけ取得し、計画の順序に並べ替える
+        repos_by_name = {repo.name: repo for repo in self.get_organization_repos(plan.source_org)}
+        results = [
+            TransferResult(name, False, reason, skipped=True)
+            for name, reason in skipped.items()
+        ]
+        repos = []
+        for entry in entries:
+            repo = repos_by_name.get(entry.name)
+            if repo is None:
+                results.append(TransferResult(entry.name, False, "転送元にリポジトリが見つかりません"))
+            else:
+                repos.append(repo)
+        
+        return results + self._transfer_repos(
+            repos, plan.target_org, dry_run, confirm, verify, reapply, check=not dry_run
+        )
+    
     def batch_transfer(self, source_org: str, target_org: str, 
                       repo_filter: Optional[List[str]] = None,
-                      dry_run: bool = False) -> List[TransferResult]:
+                      dry_run: bool = False,
+                      confirm: Optional[Callable[[Repository.Repository, str], bool]] = None,
+                      verify: bool = False, reapply: bool = False
+                      ) -> List[TransferResult]:
         """
         複数リポジトリの一括転送
         
@@ -218,6 +563,9 @@ class GitHubOrgTransfer:
             target_org: 転送先organization
             repo_filter: 転送対象リポジトリ名のリスト（Noneの場合は全て）
             dry_run: ドライランモード
+            confirm: 確認が必要なリポジトリで呼ばれる関数（Falseでスキップ）
+            verify: 転送前後の設定を比較するかどうか
+            reapply: 検証で見つかった差分を再設定するかどうか
             
         Returns:
             転送結果のリスト
@@ -232,16 +580,76 @@ class GitHubOrgTransfer:
             repos = [repo for repo in repos if repo.name in repo_filter]
             logger.info(f"フィルタ適用後: {len(repos)}個のリポジトリ")
         
+        # 一覧データのみで除外判定（個別APIチェックの前に実施）
+        repos, results = self.prefilter_repos(repos)
+        
+        return results + self._transfer_repos(
+            repos, target_org, dry_run, confirm, verify, reapply
+        )
+    
+    def _transfer_repos(self, repos: List[Repository.Repository], target_org: str,
+                        dry_run: bool = False,
+                        confirm: Optional[Callable[[Repository.Repository, str], bool]] = None,
+                        verify: bool = False, reapply: bool = False, check: bool = True
+                        ) -> List[TransferResult]:
+        """
+        与えられた順序でリポジトリを転送
+        
+        Args:
+            repos: 転送対象のリポジトリ（実行順）
+            target_org: 転送先organization
+            dry_run: ドライランモード
+            confirm: 確認が必要なリポジトリで呼ばれる関数（Falseでスキップ）
+            verify: 転送前後の設定を比較するかどうか
+            reapply: 検証で見つかった差分を再設定するかどうか
+            check: リポジトリごとの転送可能性チェックを行うかどうか
+            
+        Returns:
+            転送結果のリスト
+        """
+        # 転送前の設定スナップショット（並列取得）
+        snapshots: Dict[str, SettingsSnapshot] = {}
+        if verify and not dry_run:
+            with phase("verify"):
+                snapshots = self.verifier.snapshot_many([repo.full_name for repo in repos])
+            snapshot_file = f"settings_snapshot_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            save_snapshots(snapshots, snapshot_file)
+            logger.info(f"設定スナップショットを {snapshot_file} に保存しました")
+        
         results = []
         for i, repo in enumerate(repos, 1):
             logger.info(f"処理中 ({i}/{len(repos)}): {repo.name}")
             
-            result = self.transfer_repository(repo, target_org, dry_run)
+            if confirm is not None and not dry_run:
+                reason = self.confirmation_reason(repo)
+                if reason and not confirm(repo, reason):
+                    results.append(TransferResult(repo.name, False, "ユーザーによりスキップ", skipped=True))
+                    continue
+            
+            result = self.transfer_repository(repo, target_org, dry_run, check)
             results.append(result)
             
             # レート制限対策（少し待機）
             if not dry_run:
-                time.sleep(2)
+                with phase("rate_limit_wait"):
+                    time.sleep(config.DEFAULT_RATE_LIMIT_DELAY)
+        
+        # 転送に成功したリポジトリを一括で検証
+        if snapshots:
+            transferred = {r.repo_name for r in results if r.success}
+            targets = {k: v for k, v in snapshots.items() if k.split('/')[-1] in transferred}
+            # 転送は完了しているため、検証に失敗しても転送結果は返してレポートを出力する
+            try:
+                with phase("verify"):
+                    self.verification_results.extend(
+                        self.verifier.verify_many(targets, target_org, reapply)
+                    )
+            except Exception as e:
+                logger.error(f"転送後検証中にエラーが発生: {e}")
+                self.verification_results.extend(
+                    VerificationResult(name.split('/')[-1], errors=[f"検証エラー: {e}"])
+                    for name in targets
+                )
         
         return results
     
@@ -256,18 +664,25 @@ class GitHubOrgTransfer:
             レポート文字列
         """
         success_count = sum(1 for r in results if r.success)
-        fail_count = len(results) - success_count
+        skip_count = sum(1 for r in results if r.skipped)
+        fail_count = len(results) - success_count - skip_count
         
         # 成功・失敗の統計
         report = f"\n=== 転送結果レポート ===\n"
         report += f"総処理数: {len(results)}\n"
         report += f"成功: {success_count}\n"
-        report += f"失敗: {fail_count}\n\n"
+        report += f"失敗: {fail_count}\n"
+        report += f"スキップ: {skip_count}\n\n"
         
         # 詳細テーブル
         table_data = []
         for result in results:
-            status = "✅ 成功" if result.success else "❌ 失敗"
+            if result.success:
+                status = "✅ 成功"
+            elif result.skipped:
+                status = "⏭ スキップ"
+            else:
+                status = "❌ 失敗"
             error = result.error_message or "-"
             table_data.append([result.repo_name, status, error])
         
@@ -277,34 +692,151 @@ class GitHubOrgTransfer:
             tablefmt="grid"
         )
         
+        # 転送後検証の結果
+        if self.verification_results:
+            report += "\n" + format_verification_report(self.verification_results)
+        
+        # HTTPレイテンシのヒストグラム
+        if self.request_latencies:
+            report += "\n\n=== HTTPレイテンシ ===\n"
+            report += self._format_latency_histogram()
+            report += "\n（リポジトリ一覧の取得はPyGithub経由のため含みません）"
+        
         return report
+    
+    def _format_latency_histogram(self) -> str:
+        """
+        エンドポイント種別ごとのレイテンシヒストグラムを整形
+        
+        Returns:
+            ヒストグラムのテーブル文字列
+        """
+        bounds = config.LATENCY_BUCKETS_MS
+        labels = [f"<{b}ms" for b in bounds] + [f">={bounds[-1]}ms"]
+        
+        table_data = []
+        for category, latencies in sorted(self.request_latencies.items()):
+            counts = [0] * len(labels)
+            for latency in latencies:
+                counts[bisect_right(bounds, latency)] += 1
+            ordered = sorted(latencies)
+            p50 = ordered[len(ordered) // 2]
+            p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+            table_data.append([
+                category, len(latencies), f"{sum(latencies) / 1000:.1f}s",
+                f"{p50:.0f}ms", f"{p95:.0f}ms", *counts
+            ])
+        
+        return tabulate(
+            table_data,
+            headers=["種別", "回数", "合計", "p50", "p95", *labels],
+            tablefmt="grid"
+        )
+
+def parse_team_map(ctx: click.Context, param: click.Parameter,
+                   value: Optional[str]) -> Optional[Dict[str, str]]:
+    """--team-map（"転送元slug=転送先slug" のカンマ区切り）を辞書に変換"""
+    if not value:
+        return None
+    team_map = {}
+    for pair in value.split(','):
+        source, sep, target = pair.partition('=')
+        if not sep or not source.strip() or not target.strip():
+            raise click.BadParameter(f"転送元slug=転送先slug の形式で指定してください: {pair}")
+        team_map[source.strip()] = target.strip()
+    return team_map
 
 @click.group()
-def cli():
+@click.option('--profile', 'profile_file', type=click.Path(dir_okay=False),
+              help='フェーズごとの時間・HTTPリクエスト数・ピークメモリをJSONに保存')
+@click.option('--profile-phase',
+              type=click.Choice(['fetch', 'plan', 'transfer', 'transfer_poll', 'verify']),
+              help='指定したフェーズを cProfile で計測（--profile と併用）')
+@click.pass_context
+def cli(ctx: click.Context, profile_file: Optional[str], profile_phase: Optional[str]):
     """GitHub Organization Repository Transfer Tool"""
-    pass
+    # 終了時にHTTPのフックを外して計測結果を保存する（--profile指定時のみ）
+    ctx.with_resource(profile_session(
+        profile_file, profile_phase,
+        on_saved=lambda path: click.echo(f"計測結果を {path} に保存しました")))
 
 @cli.command()
 @click.option('--source-org', required=True, help='転送元organization名')
 @click.option('--target-org', required=True, help='転送先organization名')
 @click.option('--repos', help='転送対象リポジトリ名（カンマ区切り）')
-@click.option('--dry-run', is_flag=True, help='ドライランモード（実際の転送は行わない）')
+@click.option('--output', '-o', default='transfer_plan.json', show_default=True,
+              help='転送計画の出力先JSON')
+@click.option('--quick', is_flag=True, help='一覧データのみで見積もる（LFS/PR/Webhookの取得を省略）')
+@click.option('--token', envvar='GITHUB_TOKEN', help='GitHub Personal Access Token')
+def plan(source_org: str, target_org: str, repos: Optional[str], output: str,
+         quick: bool, token: str):
+    """転送計画（コスト見積もりと予測タイムライン）を作成"""
+    
+    if not token:
+        click.echo("エラー: GitHub tokenが必要です。環境変数GITHUB_TOKENまたは--tokenで指定してください。")
+        return
+    
+    repo_filter = None
+    if repos:
+        repo_filter = [name.strip() for name in repos.split(',')]
+    
+    try:
+        transfer_tool = GitHubOrgTransfer(token)
+        transfer_plan = transfer_tool.plan_transfer(
+            source_org, target_org, repo_filter, detailed=not quick
+        )
+        click.echo(format_plan_report(transfer_plan))
+        
+        transfer_plan.save(output)
+        click.echo(f"\n🗺  転送計画を {output} に保存しました")
+        
+    except Exception as e:
+        logger.error(f"転送計画の作成中にエラーが発生: {e}")
+        click.echo(f"❌ エラー: {e}")
+
+@cli.command()
+@click.option('--source-org', help='転送元organization名（--plan未指定時は必須）')
+@click.option('--target-org', help='転送先organization名（--plan未指定時は必須）')
+@click.option('--repos', help='転送対象リポジトリ名（カンマ区切り。--plan指定時は計画から絞り込む）')
+@click.option('--plan', 'plan_file', type=click.Path(exists=True, dir_okay=False),
+              help='planコマンドで作成した転送計画JSON（計画の順序で実行）')
+@click.option('--dry-run', is_flag=True,
+              help='ドライランモード（実際の転送は行わない。--plan指定時は転送可能性チェックも省略）')
+@click.option('--yes', '-y', is_flag=True, help='重要/大容量リポジトリの確認プロンプトを省略')
+@click.option('--verify', is_flag=True, help='転送前後のWebhook・ブランチ保護・チーム権限を比較')
+@click.option('--reapply', is_flag=True, help='検証で見つかった差分を転送先に再設定（--verifyを含む）')
+@click.option('--team-map', callback=parse_team_map,
+              help='検証で比較するチームの対応（転送元slug=転送先slug のカンマ区切り。未指定のチームは同じslug）')
 @click.option('--token', envvar='GITHUB_TOKEN', help='GitHub Personal Access Token')
-def transfer(source_org: str, target_org: str, repos: Optional[str], 
-            dry_run: bool, token: str):
+def transfer(source_org: Optional[str], target_org: Optional[str], repos: Optional[str],
+            plan_file: Optional[str], dry_run: bool, yes: bool, verify: bool,
+            reapply: bool, team_map: Optional[Dict[str, str]], token: str):
     """リポジトリの転送を実行"""
     
     if not token:
         click.echo("エラー: GitHub tokenが必要です。環境変数GITHUB_TOKENまたは--tokenで指定してください。")
         return
     
+    transfer_plan = None
+    if plan_file:
+        transfer_plan = TransferPlan.load(plan_file)
+        source_org, target_org = transfer_plan.source_org, transfer_plan.target_org
+    elif not source_org or not target_org:
+        click.echo("エラー: --source-org と --target-org、または --plan を指定してください。")
+        return
+    
     # リポジトリフィルタの解析
     repo_filter = None
     if repos:
         repo_filter = [name.strip() for name in repos.split(',')]
+        if transfer_plan is not None:
+            planned = {entry.name for entry in transfer_plan.entries} | set(transfer_plan.skipped)
+            missing = [name for name in repo_filter if name not in planned]
+            if missing:
+                raise click.UsageError(f"--repos のリポジトリが転送計画にありません: {', '.join(missing)}")
     
     try:
-        transfer_tool = GitHubOrgTransfer(token)
+        transfer_tool = GitHubOrgTransfer(token, team_map)
         
         if dry_run:
             click.echo(f"🔍 ドライランモード: {source_org} -> {target_org}")
@@ -312,9 +844,18 @@ def transfer(source_org: str, target_org: str, repos: Optional[str],
             click.echo(f"🚀 転送開始: {source_org} -> {target_org}")
         
         # 転送実行
-        results = transfer_tool.batch_transfer(
-            source_org, target_org, repo_filter, dry_run
-        )
+        confirm = None
+        if not yes:
+            confirm = lambda repo, reason: click.confirm(f"⚠️  {reason}。転送しますか？")
+        if transfer_plan is not None:
+            results = transfer_tool.execute_plan(
+                transfer_plan, dry_run, confirm, verify or reapply, reapply, repo_filter
+            )
+        else:
+            results = transfer_tool.batch_transfer(
+                source_org, target_org, repo_filter, dry_run, confirm,
+                verify or reapply, reapply
+            )
         
         # レポート生成・表示
         report = transfer_tool.generate_report(results)
@@ -331,6 +872,32 @@ def transfer(source_org: str, target_org: str, repos: Optional[str],
         logger.error(f"転送処理中にエラーが発生: {e}")
         click.echo(f"❌ エラー: {e}")
 
+@cli.command()
+@click.option('--snapshot', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='transfer --verify で保存した設定スナップショットJSON')
+@click.option('--target-org', required=True, help='転送先organization名')
+@click.option('--reapply', is_flag=True, help='差分を転送先に再設定')
+@click.option('--team-map', callback=parse_team_map,
+              help='比較するチームの対応（転送元slug=転送先slug のカンマ区切り。未指定のチームは同じslug）')
+@click.option('--token', envvar='GITHUB_TOKEN', help='GitHub Personal Access Token')
+def verify(snapshot: str, target_org: str, reapply: bool, team_map: Optional[Dict[str, str]], token: str):
+    """転送済みリポジトリの設定をスナップショットと比較"""
+    
+    if not token:
+        click.echo("エラー: GitHub tokenが必要です。")
+        return
+    
+    try:
+        transfer_tool = GitHubOrgTransfer(token, team_map)
+        results = transfer_tool.verifier.verify_many(
+            load_snapshots(snapshot), target_org, reapply
+        )
+        click.echo(format_verification_report(results))
+        
+    except Exception as e:
+        logger.error(f"転送後検証中にエラーが発生: {e}")
+        click.echo(f"❌ エラー: {e}")
+
 @cli.command()
 @click.option('--org', required=True, help='organization名')
 @click.option('--token', envvar='GITHUB_TOKEN', help='GitHub Personal Access Token')
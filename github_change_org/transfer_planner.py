@@ -0,0 +1,225 @@
+"""
+転送計画 - GitHub Organization Transfer Tool
+
+リポジトリごとの転送コストを見積もり、実行順序と予測タイムラインを決める
+"""
+
+import json
+import math
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from tabulate import tabulate
+
+import config
+
+
+@dataclass
+class RepoCost:
+    """リポジトリ1件分のコスト要因と見積もり"""
+    name: str
+    full_name: str
+    size_kb: int
+    uses_lfs: bool = False
+    open_prs: int = 0
+    webhooks: int = 0
+    cost_sec: float = 0.0
+    bucket: str = "small"
+    eta_start_sec: float = 0.0
+    eta_end_sec: float = 0.0
+
+
+@dataclass
+class TransferPlan:
+    """実行可能な転送計画（JSONとして保存・読み込み可能）"""
+    source_org: str
+    target_org: str
+    created_at: str
+    entries: List[RepoCost] = field(default_factory=list)
+    skipped: Dict[str, str] = field(default_factory=dict)  # リポジトリ名 -> 除外理由
+
+    @property
+    def total_sec(self) -> float:
+        """予測される総所要時間（秒）"""
+        return self.entries[-1].eta_end_sec if self.entries else 0.0
+
+    def save(self, path: str) -> None:
+        """
+        計画をJSONファイルに保存
+
+        Args:
+            path: 出力先パス
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> 'TransferPlan':
+        """
+        JSONファイルから計画を読み込み
+
+        Args:
+            path: 計画ファイルのパス
+
+        Returns:
+            転送計画
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        data['entries'] = [RepoCost(**entry) for entry in data.get('entries', [])]
+        return cls(**data)
+
+
+def estimate_cost(cost: RepoCost) -> float:
+    """
+    コストモデルに基づき転送所要時間（秒）を見積もる
+
+    Args:
+        cost: コスト要因
+
+    Returns:
+        見積もり時間（秒）
+    """
+    model = config.PLAN_COST_MODEL
+    seconds = model['base_sec']
+    seconds += cost.size_kb / 1024 * model['sec_per_mb']
+    seconds += cost.open_prs * model['sec_per_open_pr']
+    seconds += cost.webhooks * model['sec_per_webhook']
+    if cost.uses_lfs:
+        seconds += model['lfs_penalty_sec']
+    return seconds
+
+
+def classify_bucket(cost_sec: float) -> str:
+    """
+    見積もり時間からバケット（small/medium/large）を決定
+
+    Args:
+        cost_sec: 見積もり時間（秒）
+
+    Returns:
+        バケット名
+    """
+    thresholds = config.PLAN_BUCKET_THRESHOLDS_SEC
+    if cost_sec < thresholds['small']:
+        return "small"
+    if cost_sec < thresholds['medium']:
+        return "medium"
+    return "large"
+
+
+def order_entries(entries: List[RepoCost]) -> List[RepoCost]:
+    """
+    小さいリポジトリを先頭に、大きいリポジトリは等間隔に分散させて並べる
+
+    Args:
+        entries: コスト見積もり済みのエントリ
+
+    Returns:
+        実行順に並べたエントリ
+    """
+    ordered = sorted(entries, key=lambda e: (e.cost_sec, e.name))
+    regular = [e for e in ordered if e.bucket != "large"]
+    large = [e for e in ordered if e.bucket == "large"]
+    if not large or not regular:
+        return ordered
+
+    # 通常リポジトリ chunk 件ごとに大きいリポジトリを1件挟む
+    chunk = math.ceil(len(regular) / len(large))
+    result: List[RepoCost] = []
+    for i, big in enumerate(large):
+        result.extend(regular[i * chunk:(i + 1) * chunk])
+        result.append(big)
+    result.extend(regular[len(large) * chunk:])
+    return result
+
+
+def build_plan(source_org: str, target_org: str, entries: List[RepoCost],
+               skipped: Optional[Dict[str, str]] = None) -> TransferPlan:
+    """
+    コスト見積もり・順序付け・タイムライン計算を行い計画を作成
+
+    Args:
+        source_org: 転送元organization
+        target_org: 転送先organization
+        entries: コスト要因を埋めたエントリ
+        skipped: 事前フィルタで除外されたリポジトリと理由
+
+    Returns:
+        転送計画
+    """
+    for entry in entries:
+        entry.cost_sec = estimate_cost(entry)
+        entry.bucket = classify_bucket(entry.cost_sec)
+
+    ordered = order_entries(entries)
+
+    # 予測タイムライン（リポジトリ間のレート制限待機を含む）
+    elapsed = 0.0
+    for i, entry in enumerate(ordered):
+        if i > 0:
+            elapsed += config.DEFAULT_RATE_LIMIT_DELAY
+        entry.eta_start_sec = elapsed
+        elapsed += entry.cost_sec
+        entry.eta_end_sec = elapsed
+
+    return TransferPlan(
+        source_org=source_org,
+        target_org=target_org,
+        created_at=datetime.now().isoformat(timespec='seconds'),
+        entries=ordered,
+        skipped=dict(skipped or {}),
+    )
+
+
+def _format_duration(seconds: float) -> str:
+    """秒数を h:mm:ss 形式に整形"""
+    seconds = int(round(seconds))
+    return f"{seconds // 3600}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+
+def format_plan_report(plan: TransferPlan) -> str:
+    """
+    予測タイムラインのレポートを生成
+
+    Args:
+        plan: 転送計画
+
+    Returns:
+        レポート文字列
+    """
+    buckets = {"small": 0, "medium": 0, "large": 0}
+    for entry in plan.entries:
+        buckets[entry.bucket] += 1
+
+    report = f"\n=== 転送計画 ({plan.source_org} -> {plan.target_org}) ===\n"
+    report += f"対象: {len(plan.entries)} (small {buckets['small']} / "
+    report += f"medium {buckets['medium']} / large {buckets['large']})\n"
+    report += f"除外: {len(plan.skipped)}\n"
+    report += f"予測所要時間: {_format_duration(plan.total_sec)}\n\n"
+
+    table_data = []
+    for i, entry in enumerate(plan.entries, 1):
+        table_data.append([
+            i, entry.name, entry.bucket, f"{entry.size_kb // 1024}MB",
+            "✔" if entry.uses_lfs else "-", entry.open_prs, entry.webhooks,
+            f"{entry.cost_sec:.0f}s",
+            _format_duration(entry.eta_start_sec), _format_duration(entry.eta_end_sec),
+        ])
+
+    report += tabulate(
+        table_data,
+        headers=["#", "リポジトリ名", "区分", "サイズ", "LFS", "Open PR",
+                 "Webhook", "見積もり", "開始予測", "終了予測"],
+        tablefmt="grid"
+    )
+
+    if plan.skipped:
+        report += "\n\n" + tabulate(
+            sorted(plan.skipped.items()),
+            headers=["除外リポジトリ", "理由"],
+            tablefmt="grid"
+        )
+
+    return report
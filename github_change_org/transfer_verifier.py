@@ -0,0 +1,464 @@
+"""
+転送後検証 - GitHub Organization Transfer Tool
+
+転送前に取得した設定スナップショット（Webhook・ブランチ保護・チーム権限）と
+転送後の設定を並列に比較し、差分の報告と再設定を行う
+"""
+
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import requests
+from tabulate import tabulate
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# (method, path, category, **kwargs) -> Response
+RequestFunc = Callable[..., requests.Response]
+
+# 一覧APIの1ページあたりの件数（GitHub APIの上限）
+PER_PAGE = 100
+
+
+@dataclass
+class SettingsSnapshot:
+    """転送で失われやすいリポジトリ設定のスナップショット"""
+    full_name: str
+    webhooks: Dict[str, Dict[str, Any]] = field(default_factory=dict)     # URL -> 設定
+    protections: Dict[str, Dict[str, Any]] = field(default_factory=dict)  # ブランチ -> 保護設定
+    teams: Dict[str, str] = field(default_factory=dict)                   # チームslug -> 権限
+    errors: List[str] = field(default_factory=list)
+    hook_ids: Dict[str, int] = field(default_factory=dict)                # URL -> Webhook ID
+
+
+@dataclass(frozen=True)
+class Difference:
+    """転送前後の設定の差分1件"""
+    kind: str     # webhook / protection / team / team_missing
+    key: str      # 転送元のWebhook URL・ブランチ名・チームslug
+    message: str  # レポートに表示する説明
+
+    def __str__(self) -> str:
+        return f"{self.kind}:{self.key} {self.message}"
+
+
+@dataclass
+class VerificationResult:
+    """転送後検証の結果"""
+    repo_name: str
+    differences: List[Difference] = field(default_factory=list)
+    reapplied: List[Difference] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """差分もエラーも残っていないかどうか"""
+        return not self.errors and len(self.differences) == len(self.reapplied)
+
+
+def save_snapshots(snapshots: Dict[str, SettingsSnapshot], path: str) -> None:
+    """
+    スナップショットをJSONファイルに保存
+
+    Args:
+        snapshots: リポジトリのフルネーム -> スナップショット
+        path: 出力先パス
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({k: asdict(v) for k, v in snapshots.items()}, f, ensure_ascii=False, indent=2)
+
+
+def load_snapshots(path: str) -> Dict[str, SettingsSnapshot]:
+    """
+    JSONファイルからスナップショットを読み込み
+
+    Args:
+        path: スナップショットファイルのパス
+
+    Returns:
+        リポジトリのフルネーム -> スナップショット
+    """
+    with open(path, encoding='utf-8') as f:
+        data = json.load(f)
+    return {k: SettingsSnapshot(**v) for k, v in data.items()}
+
+
+def _normalize_hook(hook: Dict[str, Any]) -> Dict[str, Any]:
+    """Webhookを比較・再作成用の形式に変換"""
+    hook_config = hook.get('config', {})
+    return {
+        'events': sorted(hook.get('events', [])),
+        'active': hook.get('active', True),
+        'content_type': hook_config.get('content_type', 'form'),
+        'insecure_ssl': str(hook_config.get('insecure_ssl', '0')),
+    }
+
+
+def _normalize_protection(protection: Dict[str, Any]) -> Dict[str, Any]:
+    """ブランチ保護をPUT /branches/{branch}/protection の形式に変換"""
+    checks = protection.get('required_status_checks')
+    reviews = protection.get('required_pull_request_reviews')
+    restrictions = protection.get('restrictions')
+
+    def enabled(key: str) -> bool:
+        return bool((protection.get(key) or {}).get('enabled', False))
+
+    return {
+        'required_status_checks': {
+            'strict': checks.get('strict', False),
+            'contexts': sorted(checks.get('contexts', [])),
+        } if checks else None,
+        'enforce_admins': enabled('enforce_admins'),
+        'required_pull_request_reviews': {
+            'dismiss_stale_reviews': reviews.get('dismiss_stale_reviews', False),
+            'require_code_owner_reviews': reviews.get('require_code_owner_reviews', False),
+            'required_approving_review_count': reviews.get('required_approving_review_count', 1),
+        } if reviews else None,
+        'restrictions': {
+            'users': sorted(u['login'] for u in restrictions.get('users', [])),
+            'teams': sorted(t['slug'] for t in restrictions.get('teams', [])),
+            'apps': sorted(a['slug'] for a in restrictions.get('apps', [])),
+        } if restrictions else None,
+        'required_linear_history': enabled('required_linear_history'),
+        'allow_force_pushes': enabled('allow_force_pushes'),
+        'allow_deletions': enabled('allow_deletions'),
+    }
+
+
+class TransferVerifier:
+    """転送前後のリポジトリ設定を並列に取得・比較するクラス"""
+
+    def __init__(self, request: RequestFunc, max_workers: Optional[int] = None,
+                 team_map: Optional[Dict[str, str]] = None):
+        """
+        初期化
+
+        Args:
+            request: 共有セッションでAPIを呼び出す関数（GitHubOrgTransfer._request）
+            max_workers: 並列数（Noneの場合はconfig.VERIFY_MAX_WORKERS）
+            team_map: 転送元のチームslug -> 転送先organizationのチームslug（ない場合は同じslug）
+        """
+        self.request = request
+        self.max_workers = max_workers or config.VERIFY_MAX_WORKERS
+        self.team_map = team_map or {}
+        # organization -> チームslug（organizationごとに1回だけ取得する）
+        self._org_teams: Dict[str, Optional[Set[str]]] = {}
+        self._org_teams_lock = threading.Lock()
+
+    def _get_all(self, path: str, category: str,
+                 params: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        一覧APIの全ページを取得（Linkヘッダに next がなくなるまでページを進める）
+
+        Args:
+            path: APIパス
+            category: レイテンシ集計用の種別名
+            params: クエリパラメータ（per_page / page は指定不要）
+
+        Returns:
+            (全ページの要素, ステータスコード)。途中でエラーになった場合はそのステータスコード
+        """
+        items: List[Dict[str, Any]] = []
+        page = 1
+        while True:
+            response = self.request('GET', path, category,
+                                    params={**(params or {}), 'per_page': PER_PAGE, 'page': page})
+            if response.status_code != 200:
+                return items, response.status_code
+            batch = response.json()
+            items.extend(batch)
+            if not batch or 'next' not in response.links:
+                return items, 200
+            page += 1
+
+    def org_teams(self, org: str) -> Optional[Set[str]]:
+        """
+        organizationのチームslug（取得できない場合はNone）
+
+        Args:
+            org: organization名
+
+        Returns:
+            チームslugの集合
+        """
+        with self._org_teams_lock:
+            if org in self._org_teams:
+                return self._org_teams[org]
+            teams, status = self._get_all(f"/orgs/{org}/teams", 'verify')
+            if status == 200:
+                self._org_teams[org] = {team['slug'] for team in teams}
+            else:
+                logger.warning(f"{org} のチーム一覧を取得できません: {status}")
+                self._org_teams[org] = None
+            return self._org_teams[org]
+
+    def target_team(self, slug: str) -> str:
+        """転送元のチームslugに対応する転送先のチームslug"""
+        return self.team_map.get(slug, slug)
+
+    def snapshot(self, full_name: str) -> SettingsSnapshot:
+        """
+        リポジトリ1件分の設定を取得
+
+        Args:
+            full_name: リポジトリのフルネーム（owner/name）
+
+        Returns:
+            設定スナップショット
+        """
+        snap = SettingsSnapshot(full_name)
+
+        # 接続エラー・タイムアウト等はリポジトリ単位のエラーとして記録し、他のリポジトリの処理を続ける
+        try:
+            hooks, status = self._get_all(f"/repos/{full_name}/hooks", 'verify')
+            if status == 200:
+                for hook in hooks:
+                    url = hook.get('config', {}).get('url')
+                    if url:
+                        snap.webhooks[url] = _normalize_hook(hook)
+                        snap.hook_ids[url] = hook['id']
+            else:
+                snap.errors.append(f"Webhook取得エラー: {status}")
+
+            branches, status = self._get_all(f"/repos/{full_name}/branches", 'verify', {'protected': 'true'})
+            if status == 200:
+                for branch in branches:
+                    name = branch['name']
+                    detail = self.request('GET', f"/repos/{full_name}/branches/{name}/protection", 'verify')
+                    if detail.status_code == 200:
+                        snap.protections[name] = _normalize_protection(detail.json())
+                    else:
+                        snap.errors.append(f"ブランチ保護取得エラー ({name}): {detail.status_code}")
+            else:
+                snap.errors.append(f"ブランチ一覧取得エラー: {status}")
+
+            teams, status = self._get_all(f"/repos/{full_name}/teams", 'verify')
+            if status == 200:
+                snap.teams = {team['slug']: team['permission'] for team in teams}
+            else:
+                snap.errors.append(f"チーム権限取得エラー: {status}")
+        except (requests.RequestException, ValueError) as e:
+            snap.errors.append(f"設定取得エラー: {e}")
+
+        return snap
+
+    def snapshot_many(self, full_names: List[str]) -> Dict[str, SettingsSnapshot]:
+        """
+        複数リポジトリの設定を並列に取得
+
+        Args:
+            full_names: リポジトリのフルネームのリスト
+
+        Returns:
+            リポジトリのフルネーム -> スナップショット
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            snapshots = list(executor.map(self.snapshot, full_names))
+        logger.info(f"{len(snapshots)}個のリポジトリの設定スナップショットを取得しました")
+        return dict(zip(full_names, snapshots))
+
+    def diff(self, before: SettingsSnapshot, after: SettingsSnapshot,
+             target_teams: Optional[Set[str]] = None) -> List[Difference]:
+        """
+        スナップショット同士の差分を列挙
+
+        チームは転送元organizationのslugを team_map で転送先のslugに読み替えて比較する。
+
+        Args:
+            before: 転送前のスナップショット
+            after: 転送後のスナップショット
+            target_teams: 転送先organizationのチームslug（Noneの場合はチームの有無を確認しない）
+
+        Returns:
+            差分のリスト
+        """
+        differences = []
+        for url, hook in before.webhooks.items():
+            if url not in after.webhooks:
+                differences.append(Difference('webhook', url, "が存在しません"))
+            elif after.webhooks[url] != hook:
+                differences.append(Difference('webhook', url, "の設定が異なります"))
+        for branch, protection in before.protections.items():
+            if branch not in after.protections:
+                differences.append(Difference('protection', branch, "の保護がありません"))
+            elif after.protections[branch] != protection:
+                differences.append(Difference('protection', branch, "の保護設定が異なります"))
+        for slug, permission in before.teams.items():
+            target_slug = self.target_team(slug)
+            if target_teams is not None and target_slug not in target_teams:
+                # 転送先にチームがないため再設定できない（--team-map で対応するチームを指定する）
+                differences.append(Difference(
+                    'team_missing', slug, f"に対応するチーム {target_slug} が転送先にありません"
+                ))
+            elif after.teams.get(target_slug) != permission:
+                current = after.teams.get(target_slug, 'なし')
+                mapped = f"転送先: {target_slug}、" if target_slug != slug else ""
+                differences.append(Difference(
+                    'team', slug, f"の権限が {permission} ではありません（{mapped}現在: {current}）"
+                ))
+        return differences
+
+    def reapply(self, before: SettingsSnapshot, target_full_name: str,
+                differences: List[Difference], after: Optional[SettingsSnapshot] = None
+                ) -> List[Difference]:
+        """
+        差分のある設定を転送先リポジトリに再設定
+
+        転送先に同じURLのWebhookがある場合は新しく作成せずに設定を更新する。
+        転送先にないチーム（team_missing）は再設定できないため対象外。
+
+        Args:
+            before: 転送前のスナップショット
+            target_full_name: 転送後のフルネーム
+            differences: diff() の結果
+            after: 転送後のスナップショット（既存のWebhookのIDを参照する）
+
+        Returns:
+            再設定に成功した差分のリスト
+        """
+        reapplied = []
+        for difference in differences:
+            try:
+                response = self._reapply_one(before, target_full_name, difference, after)
+            except requests.RequestException as e:
+                logger.warning(f"{target_full_name} の再設定に失敗 ({difference}): {e}")
+                continue
+            if response is None:
+                continue
+
+            if response.status_code in (200, 201, 204):
+                reapplied.append(difference)
+            else:
+                logger.warning(
+                    f"{target_full_name} の再設定に失敗 ({difference}): {response.status_code}"
+                )
+
+        return reapplied
+
+    def _reapply_one(self, before: SettingsSnapshot, target_full_name: str, difference: Difference,
+                     after: Optional[SettingsSnapshot]) -> Optional[requests.Response]:
+        """差分1件を再設定（再設定できない種別の場合はNone）"""
+        target_org = target_full_name.split('/')[0]
+        repo_name = target_full_name.split('/')[-1]
+        kind, key = difference.kind, difference.key
+
+        if kind == 'webhook':
+            hook = before.webhooks[key]
+            # シークレットはAPIで取得できないため再設定後に手動で登録が必要
+            body = {
+                'active': hook['active'],
+                'events': hook['events'],
+                'config': {
+                    'url': key,
+                    'content_type': hook['content_type'],
+                    'insecure_ssl': hook['insecure_ssl'],
+                },
+            }
+            hook_id = after.hook_ids.get(key) if after is not None else None
+            if hook_id is not None:
+                response = self.request(
+                    'PATCH', f"/repos/{target_full_name}/hooks/{hook_id}", 'reapply', json=body
+                )
+            else:
+                response = self.request(
+                    'POST', f"/repos/{target_full_name}/hooks", 'reapply', json={'name': 'web', **body}
+                )
+        elif kind == 'protection':
+            response = self.request(
+                'PUT', f"/repos/{target_full_name}/branches/{key}/protection", 'reapply',
+                json=before.protections[key]
+            )
+        elif kind == 'team':
+            response = self.request(
+                'PUT', f"/orgs/{target_org}/teams/{self.target_team(key)}/repos/{target_org}/{repo_name}",
+                'reapply', json={'permission': before.teams[key]}
+            )
+        elif kind == 'team_missing':
+            response = None
+        else:
+            raise ValueError(f"未対応の差分の種別: {kind}")
+        return response
+
+    def verify(self, before: SettingsSnapshot, target_org: str,
+               reapply: bool = False) -> VerificationResult:
+        """
+        転送後のリポジトリ1件を検証
+
+        Args:
+            before: 転送前のスナップショット
+            target_org: 転送先organization
+            reapply: 差分を再設定するかどうか
+
+        Returns:
+            検証結果
+        """
+        repo_name = before.full_name.split('/')[-1]
+        target_full_name = f"{target_org}/{repo_name}"
+        after = self.snapshot(target_full_name)
+
+        result = VerificationResult(repo_name, errors=list(after.errors))
+        try:
+            target_teams = self.org_teams(target_org) if before.teams else None
+        except (requests.RequestException, ValueError) as e:
+            # チームの有無は確認せずに比較する
+            result.errors.append(f"チーム一覧取得エラー: {e}")
+            target_teams = None
+        result.differences = self.diff(before, after, target_teams)
+        if reapply and result.differences:
+            result.reapplied = self.reapply(before, target_full_name, result.differences, after)
+        return result
+
+    def verify_many(self, snapshots: Dict[str, SettingsSnapshot], target_org: str,
+                    reapply: bool = False) -> List[VerificationResult]:
+        """
+        複数リポジトリを並列に検証
+
+        Args:
+            snapshots: 転送前のスナップショット
+            target_org: 転送先organization
+            reapply: 差分を再設定するかどうか
+
+        Returns:
+            検証結果のリスト
+        """
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(
+                lambda snap: self.verify(snap, target_org, reapply), snapshots.values()
+            ))
+
+
+def format_verification_report(results: List[VerificationResult]) -> str:
+    """
+    検証結果のレポートを生成
+
+    Args:
+        results: 検証結果のリスト
+
+    Returns:
+        レポート文字列
+    """
+    ok_count = sum(1 for r in results if r.ok)
+    report = "\n=== 転送後検証レポート ===\n"
+    report += f"検証数: {len(results)}\n"
+    report += f"一致: {ok_count}\n"
+    report += f"差分あり: {len(results) - ok_count}\n\n"
+
+    table_data = []
+    for result in results:
+        status = "✅ 一致" if result.ok else "⚠️ 差分"
+        remaining = [str(d) for d in result.differences if d not in result.reapplied]
+        notes = remaining + [f"再設定済み: {d}" for d in result.reapplied] + result.errors
+        table_data.append([result.repo_name, status, "\n".join(notes) or "-"])
+
+    report += tabulate(
+        table_data,
+        headers=["リポジトリ名", "ステータス", "差分/メモ"],
+        tablefmt="grid"
+    )
+    return report
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+GitHub API スタンドインを使ったベンチマークハーネス
+
+擬似サーバを起動し、各スクリプトをサブプロセスで実行して
+実行時間（wall time）とサーバ側のリクエスト数・転送バイト数を記録する
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List
+
+from fake_github import FakeGitHubServer, create_server
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# (ベンチマーク名, スクリプト, 引数, 追加の環境変数)
+SCENARIOS = [
+    ("transfer_plan", "github_change_org/github_org_transfer.py",
+     ["plan", "--source-org", "{org}", "--target-org", "{target_org}"], {}),
+    ("transfer_dry_run", "github_change_org/github_org_transfer.py",
+     ["transfer", "--source-org", "{org}", "--target-org", "{target_org}", "--dry-run", "--yes"], {}),
+    ("transfer", "github_change_org/github_org_transfer.py",
+     ["transfer", "--source-org", "{org}", "--target-org", "{target_org}", "--yes", "--verify"], {}),
+    ("bug_curve", "github_util/generate_bug_curve_from_github_issues.py", [],
+     {"OWNER": "{org}", "REPO": "{issue_repo}"}),
+    ("gantt", "github_util/draw_gantt_from_issue_and_project.py", [],
+     {"OWNER": "{org}", "REPO": "{issue_repo}", "PROJECT_NUMBER": "1"}),
+    ("project_info", "github_util/get_github_project_info.py", [], {}),
+]
+
+
+def _admin(server: FakeGitHubServer, method: str, path: str) -> Dict[str, Any]:
+    request = urllib.request.Request(f"{server.base_url}{path}", method=method)
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run_scenario(server: FakeGitHubServer, name: str, script: str, args: List[str],
+                 extra_env: Dict[str, str], timeout: float) -> Dict[str, Any]:
+    """
+    シナリオ1件を実行して計測
+
+    Args:
+        server: 起動済みの擬似サーバ
+        name: ベンチマーク名
+        script: リポジトリルートからのスクリプトパス
+        args: コマンドライン引数（{org}等はデータ設定で置換）
+        extra_env: 追加の環境変数
+        timeout: タイムアウト（秒）
+
+    Returns:
+        計測結果
+    """
+    data = server.data
+    fmt = {"org": data.org, "target_org": data.target_org, "issue_repo": data.issue_repo}
+
+    workdir = Path(tempfile.mkdtemp(prefix=f"bench_{name}_"))
+    home = workdir / "home"
+    (home / ".github").mkdir(parents=True)
+    (home / ".github" / "token.json").write_text(json.dumps({"token": "fake-token"}))
+
+    env = dict(os.environ)
+    env.update({
+        "HOME": str(home),
+        "GITHUB_TOKEN": "fake-token",
+        "GITHUB_API_URL": server.base_url,
+        "GITHUB_GRAPHQL_URL": f"{server.base_url}/graphql",
+        "RATE_LIMIT_DELAY": "0",
+        "TRANSFER_POLL_INTERVAL": "0",
+        "PYTHONPATH": str((ROOT / script).parent),
+    })
+    env.update({k: v.format(**fmt) for k, v in extra_env.items()})
+    env.pop("GITHUB_ACTIONS", None)
+
+    # 転送系は状態を変えるため、毎回データを作り直したサーバで計測する前提
+    _admin(server, "POST", "/_reset")
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, str(ROOT / script), *[a.format(**fmt) for a in args]],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=timeout,
+    )
+    wall = time.perf_counter() - start
+    stats = _admin(server, "GET", "/_stats")
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "name": name,
+        "returncode": proc.returncode,
+        "wall_sec": round(wall, 3),
+        "requests": stats["requests"],
+        "bytes_sent": stats["bytes_sent"],
+        "by_route": stats["by_route"],
+        "stderr_tail": proc.stderr[-2000:] if proc.returncode else "",
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GitHub API スタンドインでのベンチマーク")
+    parser.add_argument("--repos", dest="n_repos", type=int, default=1000)
+    parser.add_argument("--issues", dest="n_issues", type=int, default=10000)
+    parser.add_argument("--items", dest="n_items", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--transfer-delay", type=float, default=0.2)
+    parser.add_argument("--only", action="append", help="実行するベンチマーク名（複数指定可）")
+    parser.add_argument("--timeout", type=float, default=1800.0)
+    parser.add_argument("--output", default="bench_results.json")
+    args = parser.parse_args()
+
+    results = []
+    for name, script, script_args, extra_env in SCENARIOS:
+        if args.only and name not in args.only:
+            continue
+        # シナリオごとにデータを作り直し、転送の副作用を持ち越さない
+        server = create_server(
+            seed=args.seed, n_repos=args.n_repos, n_issues=args.n_issues, n_items=args.n_items,
+            latency_ms=args.latency_ms, transfer_delay_sec=args.transfer_delay,
+        )
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            result = run_scenario(server, name, script, script_args, extra_env, args.timeout)
+        finally:
+            server.shutdown()
+            server.server_close()
+        results.append(result)
+        status = "ok" if result["returncode"] == 0 else f"rc={result['returncode']}"
+        print(f"{name:<18} {result['wall_sec']:>9.2f}s {result['requests']:>8} req "
+              f"{result['bytes_sent'] / 1024:>10.1f} KiB  {status}")
+        if result["stderr_tail"]:
+            print(result["stderr_tail"], file=sys.stderr)
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({
+            "params": {k: v for k, v in vars(args).items() if k != "only"},
+            "results": results,
+        }, f, ensure_ascii=False, indent=2)
+    print(f"results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
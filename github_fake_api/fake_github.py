@@ -0,0 +1,731 @@
+#!/usr/bin/env python3
+"""
+GitHub API スタンドイン（ローカル擬似サーバ）
+
+github_change_org / github_util のスクリプトが使うエンドポイントだけを
+標準ライブラリのみで実装したベンチマーク・検証用のサーバ
+
+- REST: organization / repos / teams / issues / comments / transfer / hooks / branches / pulls
+- GraphQL: projectV2 の fields / items（repository / organization / user。fieldValueByName に対応）
+- 遅延の注入、X-RateLimit-* ヘッダ、転送の202応答と遅延反映（結果整合性）
+- 合成データ生成（例: 1,000 リポジトリ、10,000 Issue）
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlparse
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+
+LABELS = ["bug", "enhancement", "documentation", "question", "regression", "performance", "security"]
+STATUSES = ["Todo", "In Progress", "Done"]
+PRIORITIES = ["P0", "P1", "P2"]
+
+# Projectのフィールド定義（名前, 型, アイテムのキー）
+PROJECT_FIELDS = [
+    ("Title", "TITLE", None),
+    ("Status", "SINGLE_SELECT", "status"),
+    ("Priority", "SINGLE_SELECT", "priority"),
+    ("Start date", "DATE", "start"),
+    ("End date", "DATE", "end"),
+]
+# エイリアス: fieldValueByName(name: "...")
+FIELD_VALUE_BY_NAME = re.compile(r'(\w+)\s*:\s*fieldValueByName\(\s*name\s*:\s*("(?:[^"\\]|\\.)*")\s*\)')
+
+
+def _iso(dt: datetime) -> str:
+    """GitHub形式のISO8601文字列に変換"""
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+#     ____________________
+#____/ [*] 合成データ      \____________________
+#
+class FakeGitHubData:
+    """擬似サーバが保持するデータ一式"""
+
+    def __init__(self, seed: int = 0, n_repos: int = 100, n_issues: int = 1000,
+                 n_items: int = 200, comments_per_issue: int = 2,
+                 org: str = "src-org", target_org: str = "dst-org",
+                 issue_repo: str = "issues-repo", user: str = "bench-user"):
+        """
+        合成データを生成
+
+        Args:
+            seed: 乱数シード（同じ値なら同じデータ）
+            n_repos: 転送元organizationのリポジトリ数
+            n_issues: issue_repo に作成するIssue数（PRを約1割含む）
+            n_items: projectV2 のアイテム数
+            comments_per_issue: Issueあたりのコメント数
+            org: 転送元organization
+            target_org: 転送先organization
+            issue_repo: Issue/Projectを持つリポジトリ名
+            user: 認証ユーザー名
+        """
+        self.rng = random.Random(seed)
+        self.user = user
+        self.org = org
+        self.target_org = target_org
+        self.issue_repo = issue_repo
+        self.comments_per_issue = comments_per_issue
+        self.lock = threading.Lock()
+
+        # (owner, name) -> リポジトリ属性
+        self.repos: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        # (owner, name) -> 転送が反映される時刻
+        self.pending: Dict[Tuple[str, str], float] = {}
+        self.orgs = {org, target_org}
+        # organization -> チームslug（転送先にも同じslugのチームがある）
+        self.teams = {org: {"developers"}, target_org: {"developers"}}
+
+        self._generate_repos(n_repos)
+        self.repos[(org, issue_repo)] = self._repo_attrs(issue_repo, size=2048)
+        self.issues = self._generate_issues(n_issues)
+        self.items = self._generate_items(n_items)
+
+    def _repo_attrs(self, name: str, size: int, **extra) -> Dict[str, Any]:
+        attrs = {
+            "name": name, "size": size, "private": False, "fork": False,
+            "archived": False, "lfs": False, "open_prs": 0, "hooks": [],
+            "protected": {}, "teams": {},
+        }
+        attrs.update(extra)
+        return attrs
+
+    def _generate_repos(self, n: int) -> None:
+        rng = self.rng
+        for i in range(n):
+            roll = rng.random()
+            if roll < 0.05:
+                name = f"site-{i}.github.io"
+            elif roll < 0.08:
+                name = f"old-{i}-archived"
+            else:
+                name = f"repo-{i:04d}"
+            hooks = [
+                {"url": f"https://hooks.example.com/{name}/{h}", "events": ["push"], "active": True}
+                for h in range(rng.choice([0, 0, 1, 2]))
+            ]
+            protected = {"main": {"strict": True, "contexts": ["ci"], "reviews": 1}} if rng.random() < 0.5 else {}
+            self.repos[(self.org, name)] = self._repo_attrs(
+                name,
+                size=int(rng.lognormvariate(8, 2)),  # KB
+                private=rng.random() < 0.3,
+                fork=rng.random() < 0.05,
+                archived=rng.random() < 0.03,
+                lfs=rng.random() < 0.05,
+                open_prs=rng.choice([0, 0, 1, 3, 10]),
+                hooks=hooks,
+                protected=protected,
+                teams={"developers": "push"} if rng.random() < 0.5 else {},
+            )
+
+    def _generate_issues(self, n: int) -> List[Dict[str, Any]]:
+        rng = self.rng
+        start = datetime(2015, 1, 1, tzinfo=timezone.utc)
+        span_days = 365 * 10
+        issues = []
+        for number in range(1, n + 1):
+            created = start + timedelta(days=rng.random() * span_days)
+            closed = None
+            if rng.random() < 0.8:
+                closed = created + timedelta(days=rng.expovariate(1 / 30))
+            issues.append({
+                "number": number,
+                "title": f"{rng.randint(1, 9)}-{rng.randint(1, 9)}-{rng.randint(1, 9)} Issue {number} <sub>",
+                "labels": rng.sample(LABELS, rng.choice([0, 1, 1, 2])),
+                "created_at": created,
+                "closed_at": closed,
+                "is_pr": rng.random() < 0.1,
+                "assignees": [f"dev{rng.randint(1, 20)}"] if rng.random() < 0.7 else [],
+            })
+        # GitHubと同様に新しい順
+        issues.sort(key=lambda x: x["number"], reverse=True)
+        return issues
+
+    def _generate_items(self, n: int) -> List[Dict[str, Any]]:
+        rng = self.rng
+        candidates = [i for i in self.issues if not i["is_pr"]][:n]
+        items = []
+        for issue in candidates:
+            start = issue["created_at"].date()
+            end = start + timedelta(days=rng.randint(1, 60))
+            baseline_end = start + timedelta(days=rng.randint(1, 60))
+            items.append({
+                "issue": issue,
+                "start": start.isoformat() if rng.random() < 0.8 else None,
+                "end": end.isoformat() if rng.random() < 0.6 else None,
+                "status": rng.choice(STATUSES),
+                "priority": rng.choice(PRIORITIES),
+                "body": (
+                    "### Roadmap\n```Roadmap\njson\n"
+                    + json.dumps({"Baseline_Start_Date": start.isoformat(),
+                                  "Baseline_End_Date": baseline_end.isoformat()})
+                    + "\n```\n"
+                ),
+            })
+        return items
+
+    def resolve_repo(self, owner: str, name: str) -> Optional[Dict[str, Any]]:
+        """転送の反映状況を考慮してリポジトリを返す"""
+        with self.lock:
+            due = self.pending.get((owner, name))
+            if due is not None:
+                if time.time() < due:
+                    return None
+                del self.pending[(owner, name)]
+            if name == self.issue_repo and (self.org, name) in self.repos:
+                # Issue/Projectを持つリポジトリはownerを問わず参照可能にする
+                return self.repos[(self.org, name)]
+            return self.repos.get((owner, name))
+
+    def start_transfer(self, owner: str, name: str, new_owner: str, delay: float) -> bool:
+        """転送を受け付け、delay秒後に転送先で参照可能にする"""
+        with self.lock:
+            attrs = self.repos.pop((owner, name), None)
+            if attrs is None:
+                return False
+            self.repos[(new_owner, name)] = attrs
+            self.pending[(new_owner, name)] = time.time() + delay
+            # チームは転送元organizationのものなので転送先では外れる
+            attrs["teams"] = {}
+            return True
+
+
+#     ____________________
+#____/ [*] HTTPサーバ      \____________________
+#
+class FakeGitHubServer(ThreadingHTTPServer):
+    """遅延・レート制限・統計を持つ擬似GitHubサーバ"""
+
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], data: FakeGitHubData,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 rate_limit: int = 5000, rate_window_sec: int = 3600,
+                 transfer_delay_sec: float = 1.0):
+        super().__init__(address, FakeGitHubHandler)
+        self.data = data
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.rate_window_sec = rate_window_sec
+        self.transfer_delay_sec = transfer_delay_sec
+        self.stats_lock = threading.Lock()
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self) -> None:
+        """統計とレート制限をリセット"""
+        with self.stats_lock:
+            self.requests_by_route: Dict[str, int] = {}
+            self.bytes_sent = 0
+            self.rate_remaining = self.rate_limit
+            self.rate_reset = int(time.time()) + self.rate_window_sec
+
+    def stats(self) -> Dict[str, Any]:
+        """統計を辞書で返す"""
+        with self.stats_lock:
+            return {
+                "requests": sum(self.requests_by_route.values()),
+                "bytes_sent": self.bytes_sent,
+                "by_route": dict(sorted(self.requests_by_route.items())),
+            }
+
+    def consume_rate(self) -> Tuple[bool, int, int]:
+        """レート制限を1消費し、(許可, 残量, リセット時刻) を返す"""
+        with self.stats_lock:
+            now = time.time()
+            if now >= self.rate_reset:
+                self.rate_remaining = self.rate_limit
+                self.rate_reset = int(now) + self.rate_window_sec
+            if self.rate_remaining <= 0:
+                return False, 0, self.rate_reset
+            self.rate_remaining -= 1
+            return True, self.rate_remaining, self.rate_reset
+
+    def record(self, route: str, nbytes: int) -> None:
+        with self.stats_lock:
+            self.requests_by_route[route] = self.requests_by_route.get(route, 0) + 1
+            self.bytes_sent += nbytes
+
+
+class FakeGitHubHandler(BaseHTTPRequestHandler):
+    """ルーティングとレスポンス生成"""
+
+    server: FakeGitHubServer
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    # (メソッド, パターン, ハンドラ名)
+    ROUTES = [
+        ("GET", r"/user", "get_user"),
+        ("GET", r"/orgs/(?P<org>[^/]+)", "get_org"),
+        ("GET", r"/orgs/(?P<org>[^/]+)/repos", "list_org_repos"),
+        ("GET", r"/orgs/(?P<org>[^/]+)/teams", "list_org_teams"),
+        ("PUT", r"/orgs/(?P<org>[^/]+)/teams/(?P<team>[^/]+)/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)", "put_team_repo"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)", "get_repo"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/transfer", "post_transfer"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/collaborators/(?P<user>[^/]+)/permission", "get_permission"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/contents/\.gitattributes", "get_gitattributes"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/pulls", "list_pulls"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/hooks", "list_hooks"),
+        ("POST", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/hooks", "post_hook"),
+        ("PATCH", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/hooks/(?P<hook_id>\d+)", "patch_hook"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/branches", "list_branches"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/branches/(?P<branch>[^/]+)/protection", "get_protection"),
+        ("PUT", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/branches/(?P<branch>[^/]+)/protection", "put_protection"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/teams", "list_teams"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues", "list_issues"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues/(?P<number>\d+)", "get_issue"),
+        ("GET", r"/repos/(?P<owner>[^/]+)/(?P<repo>[^/]+)/issues/(?P<number>\d+)/comments", "list_comments"),
+        ("POST", r"/graphql", "post_graphql"),
+        ("GET", r"/_stats", "get_stats"),
+        ("POST", r"/_reset", "post_reset"),
+    ]
+    COMPILED = [(m, re.compile(f"^(?:/api/v3)?{p}/?$"), h) for m, p, h in ROUTES]
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        pass  # ベンチマーク時のノイズを避ける
+
+    # --- 共通処理 ------------------------------------------------------
+    def _dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        self.query = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        self.body = json.loads(raw) if raw else {}
+
+        for route_method, pattern, handler in self.COMPILED:
+            match = pattern.match(parsed.path)
+            if route_method == method and match:
+                internal = handler in ("get_stats", "post_reset")
+                if not internal:
+                    allowed, remaining, reset = self.server.consume_rate()
+                    self.rate_headers = {
+                        "X-RateLimit-Limit": str(self.server.rate_limit),
+                        "X-RateLimit-Remaining": str(remaining),
+                        "X-RateLimit-Reset": str(reset),
+                    }
+                    self._sleep_latency()
+                    if not allowed:
+                        self._send(403, {"message": "API rate limit exceeded"}, route=handler)
+                        return
+                else:
+                    self.rate_headers = {}
+                getattr(self, handler)(**match.groupdict())
+                return
+        self.rate_headers = {}
+        self._send(404, {"message": "Not Found"}, route="not_found")
+
+    def _sleep_latency(self) -> None:
+        latency = self.server.latency_ms
+        if self.server.jitter_ms:
+            latency += random.uniform(0, self.server.jitter_ms)
+        if latency > 0:
+            time.sleep(latency / 1000)
+
+    def _send(self, status: int, payload: Any, route: str,
+              headers: Optional[Dict[str, str]] = None, raw: Optional[str] = None) -> None:
+        body = (raw if raw is not None else json.dumps(payload)).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain" if raw is not None else "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in {**self.rate_headers, **(headers or {})}.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.record(route, len(body))
+
+    def _paginate(self, items: List[Any], route: str) -> None:
+        """page/per_page でページングしLinkヘッダを付けて返す"""
+        per_page = min(int(self.query.get("per_page", DEFAULT_PER_PAGE)), MAX_PER_PAGE)
+        page = max(int(self.query.get("page", 1)), 1)
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        chunk = items[(page - 1) * per_page:page * per_page]
+
+        path = urlparse(self.path).path
+        links = []
+
+        def link(p: int, rel: str) -> str:
+            query = dict(self.query, page=str(p), per_page=str(per_page))
+            return f'<{self.server.base_url}{path}?{urlencode(query)}>; rel="{rel}"'
+
+        if page < last:
+            links += [link(page + 1, "next"), link(last, "last")]
+        if page > 1:
+            links += [link(page - 1, "prev"), link(1, "first")]
+        self._send(200, chunk, route, {"Link": ", ".join(links)} if links else None)
+
+    def _repo_json(self, owner: str, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        base = self.server.base_url
+        full_name = f"{owner}/{attrs['name']}"
+        return {
+            "id": abs(hash(full_name)) % 10**9,
+            "name": attrs["name"],
+            "full_name": full_name,
+            "owner": {"login": owner, "type": "Organization", "url": f"{base}/users/{owner}"},
+            "private": attrs["private"],
+            "fork": attrs["fork"],
+            "archived": attrs["archived"],
+            "size": attrs["size"],
+            "open_issues_count": attrs["open_prs"],
+            "permissions": {"admin": True, "push": True, "pull": True},
+            "url": f"{base}/repos/{full_name}",
+            "html_url": f"https://github.com/{full_name}",
+        }
+
+    def _issue_json(self, owner: str, repo: str, issue: Dict[str, Any]) -> Dict[str, Any]:
+        base = self.server.base_url
+        url = f"{base}/repos/{owner}/{repo}/issues/{issue['number']}"
+        payload = {
+            "id": issue["number"],
+            "number": issue["number"],
+            "title": issue["title"],
+            "state": "closed" if issue["closed_at"] else "open",
+            "labels": [{"name": name, "url": f"{base}/repos/{owner}/{repo}/labels/{name}"}
+                       for name in issue["labels"]],
+            "created_at": _iso(issue["created_at"]),
+            "closed_at": _iso(issue["closed_at"]) if issue["closed_at"] else None,
+            "user": {"login": self.server.data.user},
+            "url": url,
+            "comments_url": f"{url}/comments",
+            # 実APIと同様にPRのhtml_urlは /pull/ になる
+            "html_url": f"https://github.com/{owner}/{repo}/{'pull' if issue['is_pr'] else 'issues'}/{issue['number']}",
+            "comments": self.server.data.comments_per_issue,
+        }
+        if issue["is_pr"]:
+            payload["pull_request"] = {"url": f"{base}/repos/{owner}/{repo}/pulls/{issue['number']}"}
+        return payload
+
+    def _require_repo(self, owner: str, repo: str) -> Optional[Dict[str, Any]]:
+        attrs = self.server.data.resolve_repo(owner, repo)
+        if attrs is None:
+            self._send(404, {"message": "Not Found"}, route="repo_not_found")
+        return attrs
+
+    def do_GET(self) -> None:  # noqa: N802
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:  # noqa: N802
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:  # noqa: N802
+        self._dispatch("PUT")
+
+    def do_PATCH(self) -> None:  # noqa: N802
+        self._dispatch("PATCH")
+
+    # --- REST ----------------------------------------------------------
+    def get_user(self) -> None:
+        login = self.server.data.user
+        self._send(200, {"login": login, "url": f"{self.server.base_url}/users/{login}"}, "user")
+
+    def get_org(self, org: str) -> None:
+        if org not in self.server.data.orgs:
+            self._send(404, {"message": "Not Found"}, "org")
+            return
+        self._send(200, {"login": org, "url": f"{self.server.base_url}/orgs/{org}",
+                         "repos_url": f"{self.server.base_url}/orgs/{org}/repos"}, "org")
+
+    def list_org_repos(self, org: str) -> None:
+        data = self.server.data
+        with data.lock:
+            repos = [self._repo_json(owner, attrs) for (owner, _), attrs in data.repos.items()
+                     if owner == org and (owner, attrs["name"]) not in data.pending]
+        self._paginate(repos, "org_repos")
+
+    def get_repo(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is not None:
+            self._send(200, self._repo_json(owner, attrs), "repo")
+
+    def post_transfer(self, owner: str, repo: str) -> None:
+        new_owner = self.body.get("new_owner")
+        if not self.server.data.start_transfer(owner, repo, new_owner, self.server.transfer_delay_sec):
+            self._send(404, {"message": "Not Found"}, "transfer")
+            return
+        attrs = {"name": repo, "size": 0, "private": False, "fork": False, "archived": False, "open_prs": 0}
+        self._send(202, self._repo_json(new_owner, attrs), "transfer")
+
+    def get_permission(self, owner: str, repo: str, user: str) -> None:
+        if self._require_repo(owner, repo) is not None:
+            self._send(200, {"permission": "admin", "user": {"login": user}}, "permission")
+
+    def get_gitattributes(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        if attrs["lfs"]:
+            self._send(200, None, "contents", raw="*.bin filter=lfs diff=lfs merge=lfs -text\n")
+        else:
+            self._send(404, {"message": "Not Found"}, "contents")
+
+    def list_pulls(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is not None:
+            self._paginate([{"number": n} for n in range(attrs["open_prs"])], "pulls")
+
+    def list_hooks(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        hooks = [{
+            "id": i, "name": "web", "active": h["active"], "events": h["events"],
+            "config": {"url": h["url"], "content_type": "json", "insecure_ssl": "0"},
+        } for i, h in enumerate(attrs["hooks"])]
+        self._paginate(hooks, "hooks")
+
+    def post_hook(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        hook = {"url": self.body["config"]["url"], "events": self.body.get("events", ["push"]),
+                "active": self.body.get("active", True)}
+        attrs["hooks"].append(hook)
+        self._send(201, {"id": len(attrs["hooks"]) - 1, **hook}, "post_hook")
+
+    def patch_hook(self, owner: str, repo: str, hook_id: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        index = int(hook_id)
+        if index >= len(attrs["hooks"]):
+            self._send(404, {"message": "Not Found"}, "patch_hook")
+            return
+        hook = attrs["hooks"][index]
+        hook.update({k: self.body[k] for k in ("events", "active") if k in self.body})
+        if "url" in self.body.get("config", {}):
+            hook["url"] = self.body["config"]["url"]
+        self._send(200, {"id": index, **hook}, "patch_hook")
+
+    def list_branches(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        names = list(attrs["protected"]) if self.query.get("protected") == "true" \
+            else sorted({"main", *attrs["protected"]})
+        self._paginate([{"name": n, "protected": n in attrs["protected"]} for n in names], "branches")
+
+    def get_protection(self, owner: str, repo: str, branch: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        rule = attrs["protected"].get(branch)
+        if rule is None:
+            self._send(404, {"message": "Branch not protected"}, "protection")
+            return
+        self._send(200, {
+            "required_status_checks": {"strict": rule["strict"], "contexts": rule["contexts"]},
+            "enforce_admins": {"enabled": False},
+            "required_pull_request_reviews": {"required_approving_review_count": rule["reviews"]},
+            "restrictions": None,
+        }, "protection")
+
+    def put_protection(self, owner: str, repo: str, branch: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is None:
+            return
+        checks = self.body.get("required_status_checks") or {}
+        reviews = self.body.get("required_pull_request_reviews") or {}
+        attrs["protected"][branch] = {
+            "strict": checks.get("strict", False), "contexts": checks.get("contexts", []),
+            "reviews": reviews.get("required_approving_review_count", 1),
+        }
+        self._send(200, self.body, "put_protection")
+
+    def list_teams(self, owner: str, repo: str) -> None:
+        attrs = self._require_repo(owner, repo)
+        if attrs is not None:
+            self._paginate([{"slug": k, "permission": v} for k, v in attrs["teams"].items()], "teams")
+
+    def list_org_teams(self, org: str) -> None:
+        if org not in self.server.data.orgs:
+            self._send(404, {"message": "Not Found"}, "org_teams")
+            return
+        teams = sorted(self.server.data.teams.get(org, ()))
+        self._paginate([{"slug": slug, "name": slug} for slug in teams], "org_teams")
+
+    def put_team_repo(self, org: str, team: str, owner: str, repo: str) -> None:
+        if team not in self.server.data.teams.get(org, ()):
+            self._send(404, {"message": "Not Found"}, "put_team_repo")
+            return
+        attrs = self._require_repo(owner, repo)
+        if attrs is not None:
+            attrs["teams"][team] = self.body.get("permission", "pull")
+            self._send(204, None, "put_team_repo", raw="")
+
+    def list_issues(self, owner: str, repo: str) -> None:
+        if self._require_repo(owner, repo) is None:
+            return
+        state = self.query.get("state", "open")
+        issues = self.server.data.issues if repo == self.server.data.issue_repo else []
+        if state != "all":
+            issues = [i for i in issues if (i["closed_at"] is None) == (state == "open")]
+        self._paginate([self._issue_json(owner, repo, i) for i in issues], "issues")
+
+    def get_issue(self, owner: str, repo: str, number: str) -> None:
+        if self._require_repo(owner, repo) is None:
+            return
+        for issue in self.server.data.issues:
+            if issue["number"] == int(number):
+                self._send(200, self._issue_json(owner, repo, issue), "issue")
+                return
+        self._send(404, {"message": "Not Found"}, "issue")
+
+    def list_comments(self, owner: str, repo: str, number: str) -> None:
+        created = _iso(datetime(2020, 1, 1, tzinfo=timezone.utc))
+        comments = [{
+            "id": int(number) * 1000 + i,
+            "user": {"login": self.server.data.user},
+            "body": f"comment {i} on #{number}",
+            "created_at": created,
+        } for i in range(self.server.data.comments_per_issue)]
+        self._paginate(comments, "comments")
+
+    # --- GraphQL -------------------------------------------------------
+    def post_graphql(self) -> None:
+        query = self.body.get("query", "")
+        variables = self.body.get("variables", {})
+        data = self.server.data
+        owner = variables.get("owner", data.org)
+
+        # クエリは解析せず、含まれる項目だけを返す（レスポンスの大きさを実APIに近づける）
+        project: Dict[str, Any] = {"id": "PVT_fake", "title": "Fake Project"}
+        if "fields(" in query:
+            project["fields"] = {"nodes": [
+                {"id": f"F_{name}", "name": name, "dataType": dtype} for name, dtype, _ in PROJECT_FIELDS
+            ]}
+        if "items(" in query:
+            first = 100
+            after = int(variables.get("after") or 0)
+            page = data.items[after:after + first]
+            has_next = after + first < len(data.items)
+            by_name = {alias: json.loads(name) for alias, name in FIELD_VALUE_BY_NAME.findall(query)}
+            project["items"] = {
+                "nodes": [self._project_item(owner, item, by_name, "fieldValues" in query) for item in page],
+                "pageInfo": {"hasNextPage": has_next, "endCursor": str(after + first) if has_next else None},
+            }
+
+        if "organization(" in query:
+            payload = {"organization": {"projectV2": project}}
+        elif "user(" in query:
+            payload = {"user": {"projectV2": project}}
+        else:
+            payload = {"repository": {"projectV2": project}}
+        self._send(200, {"data": payload}, "graphql")
+
+    @staticmethod
+    def _field_value(item: Dict[str, Any], name: str, dtype: str, key: str) -> Optional[Dict[str, Any]]:
+        """フィールド1つの値（未設定はNone）"""
+        if not item[key]:
+            return None
+        return {"date" if dtype == "DATE" else "name": item[key], "field": {"name": name}}
+
+    def _project_item(self, owner: str, item: Dict[str, Any], by_name: Dict[str, str],
+                      all_values: bool) -> Dict[str, Any]:
+        """
+        Projectアイテム
+
+        Args:
+            owner: オーナー
+            item: 合成データのアイテム
+            by_name: fieldValueByName のエイリアス -> フィールド名
+            all_values: fieldValues（全フィールドの値）を含めるか
+        """
+        issue = item["issue"]
+        repo = self.server.data.issue_repo
+        node = {
+            "id": f"PVTI_{issue['number']}",
+            "content": {
+                "number": issue["number"],
+                "title": issue["title"],
+                "body": item["body"],
+                "url": f"https://github.com/{owner}/{repo}/issues/{issue['number']}",
+                "state": "CLOSED" if issue["closed_at"] else "OPEN",
+                "createdAt": _iso(issue["created_at"]),
+                "assignees": {"nodes": [{"login": a} for a in issue["assignees"]]},
+            },
+        }
+
+        fields = {name: (dtype, key) for name, dtype, key in PROJECT_FIELDS if key}
+        for alias, name in by_name.items():
+            value = self._field_value(item, name, *fields[name]) if name in fields else None
+            if value is not None:
+                value.pop("field")  # fieldValueByName のクエリは値だけを選択する
+            node[alias] = value
+        if all_values:
+            values: List[Dict[str, Any]] = [{}]  # 実APIと同様に対象外の型は空オブジェクト
+            values += [v for v in (self._field_value(item, name, dtype, key)
+                                   for name, dtype, key in PROJECT_FIELDS if key) if v]
+            node["fieldValues"] = {"nodes": values}
+        return node
+
+    # --- 管理用 ---------------------------------------------------------
+    def get_stats(self) -> None:
+        self._send(200, self.server.stats(), "_stats")
+
+    def post_reset(self) -> None:
+        self.server.reset_stats()
+        self._send(200, {"reset": True}, "_reset")
+
+
+def create_server(host: str = "127.0.0.1", port: int = 0, **kwargs: Any) -> FakeGitHubServer:
+    """
+    擬似サーバを作成（port=0で空きポートを自動割り当て）
+
+    Args:
+        host: 待ち受けアドレス
+        port: 待ち受けポート
+        **kwargs: FakeGitHubData / FakeGitHubServer の引数
+
+    Returns:
+        起動前のサーバ（serve_forever() で起動）
+    """
+    data_keys = {"seed", "n_repos", "n_issues", "n_items", "comments_per_issue",
+                 "org", "target_org", "issue_repo", "user"}
+    data = FakeGitHubData(**{k: v for k, v in kwargs.items() if k in data_keys})
+    server_kwargs = {k: v for k, v in kwargs.items() if k not in data_keys}
+    return FakeGitHubServer((host, port), data, **server_kwargs)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GitHub API スタンドイン")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repos", dest="n_repos", type=int, default=1000)
+    parser.add_argument("--issues", dest="n_issues", type=int, default=10000)
+    parser.add_argument("--items", dest="n_items", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="1リクエストあたりの遅延")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="遅延に加える一様乱数の最大値")
+    parser.add_argument("--rate-limit", type=int, default=5000, help="ウィンドウあたりのリクエスト上限")
+    parser.add_argument("--rate-window", dest="rate_window_sec", type=int, default=3600)
+    parser.add_argument("--transfer-delay", dest="transfer_delay_sec", type=float, default=1.0,
+                        help="転送202応答から転送先で参照可能になるまでの秒数")
+    args = vars(parser.parse_args())
+
+    host, port = args.pop("host"), args.pop("port")
+    server = create_server(host, port, **args)
+    print(f"Fake GitHub API: {server.base_url}")
+    print(f"  export GITHUB_API_URL={server.base_url}")
+    print(f"  export GITHUB_GRAPHQL_URL={server.base_url}/graphql")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,43 @@
 #! /Users/tfuku/Tools/miniforge3/envs/py313/bin/python3
 
+from __future__ import annotations
+
+import argparse
 import json
 import os
 import re
+import sys
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Dict, List, Optional, Set, Tuple
 
-import numpy as np
-import pandas as pd
-import plotly.express as px
 import pytz
-import requests
+
+from github_client import get_token, graphql
+from project_fields import field_value, field_value_selections, get_field_schema, resolve_fields
+
+# 共有モジュール（リポジトリ直下の common）。ツールのディレクトリだけを配置する場合は
+# common/tool_profiling.py をスクリプトと同じディレクトリに置く
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from tool_profiling import PROFILER, phase, profile_session  # noqa: E402
+
+# numpy / pandas / plotly は使うメソッドの中で読み込む（importしただけで時間がかからないようにする）
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class GitHubDataFetcher:
-    def __init__(self, token: str):
+    def __init__(self, token: Optional[str] = None):
+        # セッションは github_client で共有する（Noneの場合は最初の呼び出しでトークンを解決）
         self.token = token
-        self.headers = {
-            "Authorization": f"token {token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
 
     def get_project_items(
         self, owner: str, repo: str, project_number: int
     ) -> List[Dict]:
         """GitHubプロジェクトからアイテム一覧を取得"""
+        # 開始日・終了日のフィールドだけを名前で取得する（フィールド定義はプロジェクトごとに1回取得）
+        schema = get_field_schema(owner, project_number, repo=repo, token=self.token)
+        fields = resolve_fields(schema, ("start", "end"))
+
         # GraphQL APIを使用してプロジェクトデータを取得
         query = """
         query($owner: String!, $repo: String!, $number: Int!) {
@@ -46,32 +58,18 @@ class GitHubDataFetcher:
                       }
                     }
                   }
-                  fieldValues(first: 20) {
-                    nodes {
-                      ... on ProjectV2ItemFieldDateValue {
-                        field {
-                          ... on ProjectV2FieldCommon {
-                            name
-                          }
-                        }
-                        date
-                      }
-                    }
-                  }
+                  {field_values}
                 }
               }
             }
           }
         }
-        """
-
-        response = requests.post(
-            "https://api.github.com/graphql",
-            headers=self.headers,
-            json={
-                "query": query,
-                "variables": {"owner": owner, "repo": repo, "number": project_number},
-            },
+        """.replace("{field_values}", field_value_selections(fields))
+
+        response = graphql(
+            query,
+            {"owner": owner, "repo": repo, "number": project_number},
+            self.token,
         )
 
         if response.status_code == 200:
@@ -137,17 +135,7 @@ class GitHubDataFetcher:
         self, item: Dict
     ) -> Tuple[Optional[str], Optional[str]]:
         """プロジェクトアイテムからstart dateとend dateを抽出"""
-        start_date: Optional[str] = None
-        end_date: Optional[str] = None
-
-        for field_value in item.get("fieldValues", {}).get("nodes", []):
-            field_name = field_value.get("field", {}).get("name", "")
-            if field_name.lower() in ("start date", "start"):
-                start_date = field_value.get("date")
-            elif field_name.lower() in ("end date", "end", "due date", "due"):
-                end_date = field_value.get("date")
-
-        return start_date, end_date
+        return field_value(item, "start"), field_value(item, "end")
 
     def fetch_and_save_data(
         self, owner: str, repo: str, project_number: int, output_file: str = None
@@ -156,7 +144,9 @@ class GitHubDataFetcher:
         if output_file is None:
             output_file = f"{repo}_gantt_data.json"
             
-        items = self.get_project_items(owner, repo, project_number)
+        with phase("fetch"):
+            items = self.get_project_items(owner, repo, project_number)
+        PROFILER.count("items", len(items))
         data: List[Dict] = []
 
         for item in items:
@@ -181,7 +171,8 @@ class GitHubDataFetcher:
             issue_label = f"{issue_title}"
 
             # Actualデータ（プロジェクトから）
-            actual_start, actual_end = self.extract_dates_from_project_item(item)
+            with phase("parse"):
+                actual_start, actual_end = self.extract_dates_from_project_item(item)
 
             # 今日の日付を取得
             today = datetime.now(pytz.timezone("Asia/Tokyo")).date()
@@ -207,7 +198,8 @@ class GitHubDataFetcher:
                 )
 
             # Baselineデータ（Issueのbodyから）
-            roadmap_data = self.parse_roadmap_json(issue_body)
+            with phase("parse"):
+                roadmap_data = self.parse_roadmap_json(issue_body)
             if roadmap_data:
                 baseline_start = roadmap_data.get("Baseline_Start_Date")
                 baseline_end = roadmap_data.get("Baseline_End_Date")
@@ -226,7 +218,7 @@ class GitHubDataFetcher:
                     )
 
         # JSONファイルに保存
-        with open(output_file, 'w', encoding='utf-8') as f:
+        with phase("write"), open(output_file, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
         
         print(f"データを{output_file}に保存しました")
@@ -239,6 +231,8 @@ class GanttChartRenderer:
 
     def load_data_from_json(self, json_file: str) -> pd.DataFrame:
         """JSONファイルからデータを読み込みDataFrameに変換"""
+        import pandas as pd
+
         with open(json_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
@@ -255,6 +249,8 @@ class GanttChartRenderer:
         self, df: pd.DataFrame, repo: str, owner: str
     ) -> pd.DataFrame:
         """データをガントチャート用のデータへ構築"""
+        import pandas as pd
+
         if df.empty:
             print("データが見つかりませんでした")
             return
@@ -309,6 +305,9 @@ class GanttChartRenderer:
 
     def create_gantt_chart(self, df: pd.DataFrame, repo: str, owner: str) -> None:
         """二重線ガントチャートを作成"""
+        import numpy as np
+        import plotly.express as px
+        import plotly.io as pio
 
         # 1. 明度差セット（推奨）
         color_pairs = [
@@ -376,17 +375,15 @@ class GanttChartRenderer:
         today = datetime.now(pytz.timezone("Asia/Tokyo")).date()
 
         # 完了したIssueを判定（Actualのend_dateが今日より過去）
-        completed_issues: List[str] = []
-        ongoing_issues: List[str] = []
-        for issue in df[df["type"] == "Actual"]["issue_url"].unique():
-            issue_data = df[(df["type"] == "Actual") & (df["issue_url"] == issue)].iloc[
-                0
-            ]
-            end_date = issue_data["end"].date()
-            if issue_data["ongoing"]:
-                ongoing_issues.append(issue)
-            elif end_date <= today:
-                completed_issues.append(issue)
+        # Issueごとに最初のActual行で判定（trace.y と照合するため集合にする）
+        completed_issues: Set[str] = set()
+        ongoing_issues: Set[str] = set()
+        actual = df[df["type"] == "Actual"].drop_duplicates("issue_url")
+        for issue, end, ongoing in zip(actual["issue_url"], actual["end"], actual["ongoing"]):
+            if ongoing:
+                ongoing_issues.add(issue)
+            elif end.date() <= today:
+                completed_issues.add(issue)
 
         # データフレームに 'color_set' 列を追加
         df["color_set"] = np.where(
@@ -463,13 +460,16 @@ class GanttChartRenderer:
 
         fig.update_traces(width=0.32)
 
-        # issueごとに薄いグレーの横線を追加
+        # issueごとに薄いグレーの横線（最初のissue以外）
+        # 図に追加すると図形の数の2乗で検証に時間がかかるため、出力時に辞書へ直接追加する
         unique_issues = df["issue"].unique()
-        for i, issue in enumerate(unique_issues):
-            if i > 0:  # 最初のissue以外に横線を追加
-                fig.add_hline(
-                    y=i - 0.5, line_width=1, line_color="lightgray", opacity=0.3
-                )
+        separators = [
+            dict(
+                line=dict(color="lightgray", width=1), opacity=0.3, type="line",
+                x0=0, x1=1, xref="x domain", y0=i - 0.5, y1=i - 0.5, yref="y",
+            )
+            for i in range(1, len(unique_issues))
+        ]
 
         # 今日の日付に赤い縦線を追加
         today = datetime.now().strftime("%Y-%m-%d")
@@ -489,54 +489,72 @@ class GanttChartRenderer:
             font=dict(color="red", size=12, family="Arial Black"),
         )
 
-        fig.write_html(
-            f"{repo}_gantt_chart.html",
-            include_plotlyjs="cdn",
-            config={"displaylogo": False, "displayModeBar": False, "responsive": True},
-        )
+        fig_dict = fig.to_dict()
+        fig_dict["layout"]["shapes"] = separators + fig_dict["layout"].get("shapes", [])
+
+        with phase("write"):
+            pio.write_html(
+                fig_dict,
+                f"{repo}_gantt_chart.html",
+                include_plotlyjs="cdn",
+                config={"displaylogo": False, "displayModeBar": False, "responsive": True},
+                validate=False,
+            )
         print(f"ガントチャートを{repo}_gantt_chart.htmlに保存しました")
 
     def render_from_json(self, json_file: str, repo: str, owner: str) -> None:
         """JSONファイルからガントチャートを生成"""
-        df = self.load_data_from_json(json_file)
-        df = self.create_gantt_data(df, repo, owner)
-        self.create_gantt_chart(df, repo, owner)
+        with phase("transform"):
+            df = self.load_data_from_json(json_file)
+            df = self.create_gantt_data(df, repo, owner)
+        # render の時間は HTML の書き出し（write）を含む
+        with phase("render"):
+            self.create_gantt_chart(df, repo, owner)
 
 
-def main():
+def parse_args(argv=None):
+    """コマンドライン引数（対象リポジトリ等は環境変数で指定する）"""
+    parser = argparse.ArgumentParser(description="GitHub Projectのガントチャートを作成")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="フェーズごとの時間・HTTPリクエスト数・ピークメモリをJSONに保存")
+    parser.add_argument("--profile-phase", metavar="PHASE",
+                        choices=["fetch", "parse", "transform", "render", "write"],
+                        help="指定したフェーズを cProfile で計測（--profile と併用）")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
     # GitHub Actionsまたはローカル環境からトークンを取得
-    token = os.getenv("GITHUB_TOKEN")
-
-    if not token:
-        # ローカル環境の場合はファイルから読み込み
-        path = Path("~/.github/token.json").expanduser()
-        if path.exists():
-            with path.open(encoding="utf-8") as f:
-                token = json.load(f)["token"]
-        else:
-            print("GITHUB_TOKEN環境変数または~/.github/token.jsonを設定してください")
-            return
+    try:
+        token = get_token()
+    except ValueError as e:
+        print(e)
+        return
 
     # 環境変数またはデフォルト値を使用
     owner = os.getenv("OWNER", "tfukuda675")
     repo = os.getenv("REPO", "my_todo")
     project_number = int(os.getenv("PROJECT_NUMBER", "4"))
 
-    try:
-        # データ取得フェーズ
-        data_fetcher = GitHubDataFetcher(token)
-        json_file = data_fetcher.fetch_and_save_data(owner, repo, project_number)
+    with profile_session(args.profile, args.profile_phase,
+                         on_saved=lambda path: print(f"計測結果を{path}に保存しました")):
+        try:
+            # データ取得フェーズ
+            data_fetcher = GitHubDataFetcher(token)
+            json_file = data_fetcher.fetch_and_save_data(owner, repo, project_number)
 
-        # グラフ描画フェーズ
-        chart_renderer = GanttChartRenderer()
-        chart_renderer.render_from_json(json_file, repo, owner)
+            # グラフ描画フェーズ
+            chart_renderer = GanttChartRenderer()
+            chart_renderer.render_from_json(json_file, repo, owner)
 
-    except Exception as e:
-        import traceback
+        except Exception as e:
+            import traceback
 
-        print(f"エラーが発生しました: {e}")
-        print("詳細なトレースバック:")
-        traceback.print_exc()
+            print(f"エラーが発生しました: {e}")
+            print("詳細なトレースバック:")
+            traceback.print_exc()
 
 
 if __name__ == "__main__":
@@ -1,43 +1,57 @@
 #! /Users/tfuku/Tools/miniforge3/envs/py313/bin/python3
 
-import json
+import argparse
+import fnmatch
+import math
 import os
-from pathlib import Path
-from typing import Dict, List
-
-import pandas as pd
-import plotly.graph_objects as go
-import plotly.io as pio
-from github import Github
-
-def get_token():
-    """GitHub Actionsまたはローカル環境からトークンを取得"""
-    token = os.getenv("GITHUB_TOKEN")
-    
-    if not token:
-        # ローカル環境の場合はファイルから読み込み
-        home_dir = os.path.expanduser("~")
-        token_path = Path(f"{home_dir}/.github/token.json")
-        if token_path.exists():
-            with open(token_path) as f:
-                token = json.load(f)["token"]
-        else:
-            raise ValueError("GITHUB_TOKEN環境変数または~/.github/token.jsonを設定してください")
-    
-    return token
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from github_client import get_github
+
+# 共有モジュール（リポジトリ直下の common）。ツールのディレクトリだけを配置する場合は
+# common/tool_profiling.py をスクリプトと同じディレクトリに置く
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from tool_profiling import PROFILER, phase, profile_session  # noqa: E402
+
+# numpy / pandas / plotly は使う関数の中で読み込む（importしただけで時間がかからないようにする）
 
 # 環境変数またはデフォルト値を使用
-TOKEN = get_token()
 OWNER = os.getenv("OWNER", "nsitexe")
 REPO = os.getenv("REPO", "Design-SFM")
 #OWNER = os.getenv("OWNER", "codecrafters-io")
 #REPO = os.getenv("REPO", "build-your-own-x")
+# 複数リポジトリモード: REPOS（カンマ区切りの REPO または OWNER/REPO）、
+# または REPO_FILTER（OWNER配下のリポジトリ名に対するglob。例: "Design-*"）
+REPOS = [name.strip() for name in os.getenv("REPOS", "").split(",") if name.strip()]
+REPO_FILTER = os.getenv("REPO_FILTER", "")
+# 同時に取得するリポジトリ数
+FETCH_WORKERS = int(os.getenv("FETCH_WORKERS", "8"))
+# リポジトリ別グラフの列数
+FACET_COLUMNS = 3
+# グラフの集計単位（auto / daily / weekly / monthly）と表示形式（bar: 積み上げ棒, area: 積み上げ面）
+BUCKET = os.getenv("BUCKET", "auto")
+CHART_STYLE = os.getenv("CHART_STYLE", "bar")
+BUCKET_RULES = {"daily": "D", "weekly": "W", "monthly": "ME"}
+# auto の場合、点の数がこれ以下になる最も細かい集計単位を選ぶ
+AUTO_BUCKET_MAX_POINTS = 200
 
-gh   = Github(TOKEN)
-repo = gh.get_repo(f"{OWNER}/{REPO}")
+# 解決時間（MTTR）・未解決Issueの経過日数で集計するパーセンタイル
+PERCENTILES = [0.5, 0.9]
+# グラフに解決時間を表示するラベル数（頻度順）
+STATS_DISPLAY_LABELS = 10
+
+def get_client():
+    """
+    GitHubクライアント（複数リポジトリを並列に取得するため、接続プールをワーカー数に合わせる）
+
+    lazy のため get_repo はリポジトリ情報を取得しない（Issueの取得時に初めてAPIを呼ぶ）
+    """
+    return get_github(pool_size=max(FETCH_WORKERS, 10), lazy=True)
 
 def get_label_priority(df):
     """ラベルの優先順位を計算（出現頻度が少ないほど高い優先度）"""
+    import pandas as pd
     all_labels = [label for labels_list in df["labels"] for label in labels_list]
     label_counts = pd.Series(all_labels).value_counts()
     # 出現回数が少ないほど高い優先度（昇順でソート）
@@ -52,50 +66,113 @@ def select_primary_label(labels, label_priority):
     sorted_labels = sorted(labels, key=lambda x: label_priority.get(x, float('inf')))
     return sorted_labels[0]
 
-def collect_issue_data():
-    """Issue一覧を取得してデータフレームを作成"""
-    issues = repo.get_issues(state="all")
-    
-    # 第1パス: 全ラベルを収集してデータフレームを作成
-    temp_data = []
-    for issue in issues:
-        if issue.pull_request is not None:
+def fetch_issue_records(repo):
+    """Issue一覧を取得（PRを除く）"""
+    records = []
+    for issue in repo.get_issues(state="all"):
+        # PRの判定は一覧に含まれる html_url で行う
+        # （issue.pull_request はPR以外のIssueで1件ずつ詳細を取得し直すため）
+        if "/pull/" in issue.html_url:
             continue  # PR は除外
         labels = [label.name for label in issue.labels]
         # ラベルがない場合は"None"を追加
         if not labels:
             labels = ["None"]
-        temp_data.append({
+        records.append({
             "created_at": issue.created_at.date(),
             "closed_at": issue.closed_at.date() if issue.closed_at else None,
             "labels": labels,
             "title": issue.title,
         })
-    
-    temp_df = pd.DataFrame(temp_data)
-    
+    return records
+
+def records_to_frame(records, repo_name=None):
+    """取得したIssueをデータフレームに変換（複数リポジトリの場合はrepo列を付ける）"""
+    import pandas as pd
+    temp_df = pd.DataFrame(records, columns=["created_at", "closed_at", "labels", "title"])
+    temp_df["closed_at"] = pd.to_datetime(temp_df["closed_at"])
+    temp_df["created_at"] = pd.to_datetime(temp_df["created_at"])
+    if repo_name is not None:
+        temp_df.insert(0, "repo", repo_name)
+    return temp_df
+
+def assign_primary_labels(temp_df):
+    """ラベルの優先順位に基づいて各Issueの主要ラベルを選択"""
     # ラベルの優先順位を計算
     label_priority = get_label_priority(temp_df)
     print("ラベルの優先順位（出現回数少ない順）:")
     print(label_priority)
     
-    # 第2パス: 優先度に基づいて主要ラベルを選択
-    data = []
-    for row in temp_data:
-        primary_label = select_primary_label(row["labels"], label_priority)
-        print(f"Issue: {row['title']}, All Labels: {row['labels']}, Primary: {primary_label}")
-        data.append({
-            "created_at": row["created_at"],
-            "closed_at": row["closed_at"],
-            "primary_label": primary_label,
-            "all_labels": row["labels"],
-        })
+    # 優先度に基づいて主要ラベルを選択
+    primary_labels = []
+    for title, labels in zip(temp_df["title"], temp_df["labels"]):
+        primary_label = select_primary_label(labels, label_priority)
+        print(f"Issue: {title}, All Labels: {labels}, Primary: {primary_label}")
+        primary_labels.append(primary_label)
     
-    df = pd.DataFrame(data)
-    df["closed_at"] = pd.to_datetime(df["closed_at"])
-    df["created_at"] = pd.to_datetime(df["created_at"])
+    columns = ["repo"] if "repo" in temp_df.columns else []
+    df = temp_df[columns + ["created_at", "closed_at"]].copy()
+    df["primary_label"] = primary_labels
+    df["all_labels"] = temp_df["labels"]
+    return df.reset_index(drop=True)
+
+def collect_issue_data(repo=None):
+    """Issue一覧を取得してデータフレームを作成"""
+    repo = repo or get_client().get_repo(f"{OWNER}/{REPO}")
+    with phase("fetch"):
+        records = fetch_issue_records(repo)
+    PROFILER.count("issues", len(records))
+    with phase("transform"):
+        return assign_primary_labels(records_to_frame(records))
+
+def resolve_repo_names():
+    """複数リポジトリモードの対象（OWNER/REPO の一覧）"""
+    names = [name if "/" in name else f"{OWNER}/{name}" for name in REPOS]
+    if REPO_FILTER:
+        names += [
+            r.full_name for r in get_client().get_organization(OWNER).get_repos()
+            if fnmatch.fnmatch(r.name, REPO_FILTER) and not r.archived
+        ]
+    return list(dict.fromkeys(names))
+
+def collect_multi_repo_issue_data(repo_names):
+    """
+    複数リポジトリのIssueを並列に取得してrepo列付きのデータフレームを作成
+
+    取得の終わったリポジトリから順にデータフレームに変換し、残りの取得と重ねる。
+    取得に失敗したリポジトリ（404/403・一時的なエラー）は除いて集計する
+    """
+    import pandas as pd
+    frames = []
+    skipped = []
+    # 取得とデータフレームへの変換が重なるため、fetch の時間は変換を含む
+    with phase("fetch"), ThreadPoolExecutor(max_workers=max(1, FETCH_WORKERS)) as executor:
+        futures = {
+            executor.submit(fetch_issue_records, get_client().get_repo(name)): name
+            for name in repo_names
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                records = future.result()
+            except Exception as e:
+                # 404/403・一時的なエラーのリポジトリは除き、取得できたリポジトリで集計する
+                print(f"{name}: skipped ({e})")
+                skipped.append(name)
+                continue
+            print(f"{name}: {len(records)} issues")
+            PROFILER.count("issues", len(records))
+            with phase("transform"):
+                frames.append(records_to_frame(records, name))
     
-    return df
+    if skipped:
+        print(f"Skipped repositories: {len(skipped)} ({', '.join(sorted(skipped))})")
+    if not frames:
+        return pd.DataFrame()
+
+    with phase("transform"):
+        temp_df = pd.concat(frames, ignore_index=True).sort_values(["repo", "created_at"], kind="stable")
+        return assign_primary_labels(temp_df)
 
 def get_unique_labels(df):
     """ユニークなラベル一覧を取得"""
@@ -107,12 +184,15 @@ def get_unique_labels(df):
 
 def create_label_timeline(df, unique_labels):
     """ラベル別のクローズ数を日付別に集計"""
+    import pandas as pd
     if df.empty:
         return pd.DataFrame()
     
-    # 日付範囲を作成
+    # 日付範囲を作成（最後のクローズより後に作成されたIssueも含める）
     start_date = df["created_at"].min()
-    end_date = df["closed_at"].max() if df["closed_at"].notnull().any() else df["created_at"].max()
+    end_date = df["created_at"].max()
+    if df["closed_at"].notnull().any():
+        end_date = max(end_date, df["closed_at"].max())
     all_dates = pd.date_range(start_date, end_date)
     
     # ラベル別のクローズ数を集計
@@ -140,8 +220,149 @@ def create_label_timeline(df, unique_labels):
     
     return timeline
 
-def create_stacked_chart(df, timeline, unique_labels):
-    """ラベル別の積み上げグラフを作成"""
+def cumulative_counts(df, dates, keys, key_column):
+    """
+    キーごとの日ごとの累積作成数・累積クローズ数
+
+    作成日・クローズ日を searchsorted で日付範囲上の位置に変換し、(キー, 日) ごとの件数を
+    bincount で数えて累積和を取る（日ごと・Issueごとのループを使わない）。
+    日付範囲より前の作成・クローズは初日に含め、範囲より後のものは数えない
+
+    Returns:
+        (累積作成数, 累積クローズ数)。いずれも shape が (キー数, 日数) の配列
+    """
+    import numpy as np
+    import pandas as pd
+    n_days = len(dates)
+    size = len(keys) * n_days
+    day_values = dates.values
+    codes = pd.Categorical(df[key_column], categories=keys).codes.astype(np.int64)
+    closed = df["closed_at"].notna().to_numpy()
+
+    created_pos = np.searchsorted(day_values, df["created_at"].to_numpy())
+    closed_pos = np.searchsorted(day_values, df.loc[closed, "closed_at"].to_numpy())
+    closed_codes = codes[closed]
+
+    # 範囲外の位置（n_days）は次のキーの初日と重なるため除く。keysにないキー（-1）も除く
+    in_created = (created_pos < n_days) & (codes >= 0)
+    in_closed = (closed_pos < n_days) & (closed_codes >= 0)
+    created = np.bincount(codes[in_created] * n_days + created_pos[in_created], minlength=size)
+    closed = np.bincount(closed_codes[in_closed] * n_days + closed_pos[in_closed], minlength=size)
+    return (created.reshape(-1, n_days).cumsum(axis=1),
+            closed.reshape(-1, n_days).cumsum(axis=1))
+
+def compute_backlog(df, dates, unique_labels):
+    """
+    日ごとの未解決Issue数（全体・ラベル別）を計算
+
+    累積作成数 - 累積クローズ数（クローズした日は未解決に含めない）
+    """
+    import pandas as pd
+    created, closed = cumulative_counts(df, dates, unique_labels, "primary_label")
+    open_counts = created - closed
+
+    backlog = pd.DataFrame(open_counts.T, index=dates,
+                           columns=[f"open_{label}" for label in unique_labels])
+    backlog.insert(0, "open_total", open_counts.sum(axis=0))
+    return backlog
+
+def compute_repo_curves(df, dates, repos):
+    """リポジトリ別の累積作成数・累積クローズ数・未解決Issue数（縦持ち）"""
+    import numpy as np
+    import pandas as pd
+    created, closed = cumulative_counts(df, dates, repos, "repo")
+    return pd.DataFrame({
+        "date": np.tile(dates.values, len(repos)),
+        "repo": np.repeat(repos, len(dates)),
+        "cumulative_issues": created.ravel(),
+        "cumulative_closed": closed.ravel(),
+        "open": (created - closed).ravel(),
+    })
+
+def _close_stats_table(frame):
+    """label列ごとの件数・解決時間・経過日数の集計"""
+    import pandas as pd
+    grouped = frame.groupby("label", sort=False)
+    stats = pd.DataFrame({
+        "issues": grouped.size(),
+        "open": grouped["age_days"].count(),
+        "mttr_mean_days": grouped["ttc_days"].mean(),
+    })
+    for q in PERCENTILES:
+        stats[f"mttr_p{int(q * 100)}_days"] = grouped["ttc_days"].quantile(q)
+    for q in PERCENTILES:
+        stats[f"open_age_p{int(q * 100)}_days"] = grouped["age_days"].quantile(q)
+    return stats
+
+def compute_close_stats(df, unique_labels, as_of=None):
+    """
+    解決時間（MTTR, 作成からクローズまでの日数）と未解決Issueの経過日数のパーセンタイル
+
+    先頭行が全体（"(all)"）、以降はラベル別（unique_labels の順）
+    """
+    import pandas as pd
+    as_of = pd.Timestamp.now().normalize() if as_of is None else as_of
+    frame = pd.DataFrame({
+        "label": df["primary_label"],
+        "ttc_days": (df["closed_at"] - df["created_at"]).dt.days,
+        "age_days": (as_of - df["created_at"]).dt.days.where(df["closed_at"].isna()),
+    })
+    total = _close_stats_table(frame.assign(label="(all)"))
+    by_label = _close_stats_table(frame).reindex(unique_labels)
+    stats = pd.concat([total, by_label])
+    stats.index.name = "label"
+    return stats.round(1)
+
+def format_close_stats(stats):
+    """グラフに表示する解決時間の要約（全体と頻度上位のラベル）"""
+    import pandas as pd
+    lines = []
+    for label, row in stats.head(STATS_DISPLAY_LABELS + 1).iterrows():
+        mttr = " / ".join(
+            "-" if pd.isna(row[f"mttr_p{int(q * 100)}_days"]) else f"{row[f'mttr_p{int(q * 100)}_days']:g}d"
+            for q in PERCENTILES
+        )
+        age = "-" if pd.isna(row["open_age_p50_days"]) else f"{row['open_age_p50_days']:g}d"
+        lines.append(f"{label}: {mttr}, open {int(row['open'])} (age p50 {age})")
+    header = "MTTR " + " / ".join(f"p{int(q * 100)}" for q in PERCENTILES)
+    return "<br>".join([header] + lines)
+
+def select_bucket(dates, bucket="auto"):
+    """集計単位を決定（auto の場合は期間の長さから選ぶ）"""
+    if bucket == "auto":
+        for candidate, days in (("daily", 1), ("weekly", 7)):
+            if len(dates) / days <= AUTO_BUCKET_MAX_POINTS:
+                return candidate
+        return "monthly"
+    if bucket not in BUCKET_RULES:
+        raise ValueError(f"BUCKETは auto, {', '.join(BUCKET_RULES)} のいずれかを指定してください: {bucket}")
+    return bucket
+
+def bucket_dates(dates, bucket):
+    """
+    集計単位ごとの最終日
+
+    累積数・未解決数は期間末の値を表示するため、resample で各期間の最後の日付を選ぶ
+    （期間の途中でデータが終わる場合はその日）
+    """
+    import pandas as pd
+    if bucket == "daily":
+        return dates
+    last = pd.Series(dates, index=dates).resample(BUCKET_RULES[bucket]).last().dropna()
+    return pd.DatetimeIndex(last.values)
+
+def create_stacked_chart(df, timeline, unique_labels, backlog=None, stats=None, name=None,
+                         bucket="auto", style="bar"):
+    """
+    ラベル別の積み上げグラフを作成
+
+    backlog: 未解決Issue数, stats: 解決時間の集計, name: タイトル,
+    bucket: 集計単位（auto / daily / weekly / monthly）, style: bar（積み上げ棒）/ area（積み上げ面）
+    """
+    import pandas as pd
+    import plotly.graph_objects as go
+    if style not in ("bar", "area"):
+        raise ValueError(f"CHART_STYLEは bar または area を指定してください: {style}")
     fig = go.Figure()
     
     # カラーパレット（ラベル数に応じて色を割り当て）
@@ -156,7 +377,15 @@ def create_stacked_chart(df, timeline, unique_labels):
                               df["closed_at"].max() if df["closed_at"].notnull().any() else df["created_at"].max())
     total_timeline = pd.DataFrame(index=all_dates)
     total_timeline = total_timeline.join(total_created.rename("cumulative_issues"), how="left")
-    total_timeline = total_timeline.fillna(method="ffill").fillna(0)
+    total_timeline = total_timeline.ffill().fillna(0)
+
+    # 期間が長くても点・棒の数が増えすぎないよう集計単位ごとの値にする
+    bucket = select_bucket(timeline.index, bucket)
+    dates = bucket_dates(timeline.index, bucket)
+    timeline = timeline.loc[dates]
+    total_timeline = total_timeline.reindex(dates)
+    if backlog is not None:
+        backlog = backlog.loc[dates]
     
     fig.add_trace(
         go.Scatter(
@@ -168,10 +397,23 @@ def create_stacked_chart(df, timeline, unique_labels):
         )
     )
     
-    # ラベル別の累積クローズIssues（積み上げ棒グラフ）
+    # ラベル別の累積クローズIssues（積み上げ棒グラフ・積み上げ面グラフ）
     for i, label in enumerate(unique_labels):
         col_name = f"cumulative_{label}"
-        if col_name in timeline.columns:
+        if col_name not in timeline.columns:
+            continue
+        if style == "area":
+            fig.add_trace(
+                go.Scatter(
+                    x=timeline.index,
+                    y=timeline[col_name],
+                    name=f"{label}",
+                    stackgroup="closed",
+                    line=dict(color=colors[i % len(colors)], width=0.5),
+                    mode="lines"
+                )
+            )
+        else:
             fig.add_trace(
                 go.Bar(
                     x=timeline.index,
@@ -182,9 +424,41 @@ def create_stacked_chart(df, timeline, unique_labels):
                 )
             )
     
+    # 未解決Issue数（折れ線）。ラベル別は凡例のクリックで表示する
+    if backlog is not None:
+        fig.add_trace(
+            go.Scatter(
+                x=backlog.index,
+                y=backlog["open_total"],
+                name="未解決 Issues",
+                line=dict(color="red", width=2, dash="dash"),
+                mode="lines"
+            )
+        )
+        for i, label in enumerate(unique_labels):
+            fig.add_trace(
+                go.Scatter(
+                    x=backlog.index,
+                    y=backlog[f"open_{label}"],
+                    name=f"未解決 {label}",
+                    line=dict(color=colors[i % len(colors)], width=1, dash="dot"),
+                    mode="lines",
+                    visible="legendonly"
+                )
+            )
+
+    if stats is not None:
+        fig.add_annotation(
+            text=format_close_stats(stats),
+            xref="paper", yref="paper", x=1.0, y=1.0,
+            xanchor="right", yanchor="top", align="left",
+            showarrow=False, bgcolor="rgba(255,255,255,0.8)", bordercolor="#7f7f7f",
+            font=dict(size=11),
+        )
+
     fig.update_layout(
-        title=dict(text=f"Bug Curve {REPO} - ラベル別積み上げ", x=0.5, y=0.95, font=dict(size=20)),
-        xaxis_title="Date",
+        title=dict(text=f"Bug Curve {name or REPO} - ラベル別積み上げ", x=0.5, y=0.95, font=dict(size=20)),
+        xaxis_title=f"Date ({bucket})",
         yaxis_title="Count",
         legend=dict(x=0, y=1.0),
         barmode="stack",  # 積み上げモード
@@ -195,57 +469,154 @@ def create_stacked_chart(df, timeline, unique_labels):
     
     return fig
 
-def main():
+def create_repo_facets(curves, repos, name, bucket="auto"):
+    """リポジトリ別の累積Issues・累積クローズ・未解決Issuesのグラフ（リポジトリごとに1区画）"""
+    import pandas as pd
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    dates = pd.DatetimeIndex(curves["date"].unique())
+    curves = curves[curves["date"].isin(bucket_dates(dates, select_bucket(dates, bucket)))]
+    rows = math.ceil(len(repos) / FACET_COLUMNS)
+    fig = make_subplots(
+        rows=rows, cols=FACET_COLUMNS, shared_xaxes=True,
+        subplot_titles=repos, vertical_spacing=min(0.08, 0.3 / rows),
+    )
+    series = [
+        ("cumulative_issues", "累積 Issues", dict(color="black", width=2)),
+        ("cumulative_closed", "累積クローズ", dict(color="#1f77b4", width=2)),
+        ("open", "未解決 Issues", dict(color="red", width=2, dash="dash")),
+    ]
+    for i, (repo_name, repo_curves) in enumerate(curves.groupby("repo", sort=False)):
+        for column, label, line in series:
+            fig.add_trace(
+                go.Scatter(
+                    x=repo_curves["date"],
+                    y=repo_curves[column],
+                    name=label,
+                    legendgroup=column,
+                    showlegend=i == 0,
+                    line=line,
+                    mode="lines"
+                ),
+                row=i // FACET_COLUMNS + 1,
+                col=i % FACET_COLUMNS + 1,
+            )
+    
+    fig.update_layout(
+        title=dict(text=f"Bug Curve {name} - リポジトリ別", x=0.5, font=dict(size=20)),
+        template="plotly_white",
+        width=1200,
+        height=max(400, 260 * rows),
+    )
+    return fig
+
+def write_chart(fig, output_file):
+    """グラフをHTMLに保存"""
+    import plotly.io as pio
+    pio.write_html(
+        fig,
+        file=output_file,
+        auto_open=False,
+        include_plotlyjs="cdn",
+        config={
+            "displaylogo": False,
+            "displayModeBar": True,
+            "responsive": True,
+        },
+    )
+    print(f"Bug curve saved to {output_file}")
+
+def parse_args(argv=None):
+    """コマンドライン引数（対象リポジトリ等は環境変数で指定する）"""
+    parser = argparse.ArgumentParser(description="GitHub IssueからBug Curveを作成")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="フェーズごとの時間・HTTPリクエスト数・ピークメモリをJSONに保存")
+    parser.add_argument("--profile-phase", metavar="PHASE",
+                        choices=["fetch", "transform", "render", "write"],
+                        help="指定したフェーズを cProfile で計測（--profile と併用）")
+    return parser.parse_args(argv)
+
+def main(argv=None):
     """メイン処理"""
-    try:
-        print(f"Repository: {OWNER}/{REPO}")
-        
-        # データ収集
-        df = collect_issue_data()
-        print(f"Total issues: {len(df)}")
-        
-        if df.empty:
-            print("No issues found")
-            return
+    args = parse_args(argv)
+    with profile_session(args.profile, args.profile_phase,
+                         on_saved=lambda path: print(f"Profile saved to {path}")):
+        try:
+            multi_repo = bool(REPOS or REPO_FILTER)
+            # 設定の誤りはIssueを取得する前に検出する
+            select_bucket([], BUCKET)
+            if CHART_STYLE not in ("bar", "area"):
+                raise ValueError(f"CHART_STYLEは bar または area を指定してください: {CHART_STYLE}")
         
-        # ラベル取得
-        unique_labels = get_unique_labels(df)
-        print(f"Unique labels: {unique_labels}")
+            # データ収集
+            if multi_repo:
+                with phase("fetch"):
+                    repo_names = resolve_repo_names()
+                print(f"Repositories: {len(repo_names)} ({OWNER})")
+                if not repo_names:
+                    print("No repositories found")
+                    return
+                df = collect_multi_repo_issue_data(repo_names)
+                name = OWNER
+            else:
+                print(f"Repository: {OWNER}/{REPO}")
+                df = collect_issue_data()
+                name = REPO
+            print(f"Total issues: {len(df)}")
         
-        # タイムライン作成
-        timeline = create_label_timeline(df, unique_labels)
+            if df.empty:
+                print("No issues found")
+                return
         
-        # グラフ作成
-        fig = create_stacked_chart(df, timeline, unique_labels)
-        
-        # HTMLファイル保存
-        output_file = f"{REPO}_bug_curve_stacked.html"
+            with phase("transform"):
+                # ラベル取得
+                unique_labels = get_unique_labels(df)
+                print(f"Unique labels: {unique_labels}")
+            
+                # タイムライン作成
+                timeline = create_label_timeline(df, unique_labels)
+
+                # 未解決Issue数・解決時間
+                backlog = compute_backlog(df, timeline.index, unique_labels)
+                stats = compute_close_stats(df, unique_labels)
+            print(stats.to_string())
         
-        # GitHub Actions環境対応
-        if os.getenv("GITHUB_ACTIONS"):
-            output_file = "bug_curve_stacked.html"
+            # グラフ作成（複数リポジトリの場合は全体の集計）
+            with phase("render"):
+                fig = create_stacked_chart(df, timeline, unique_labels, backlog, stats, name,
+                                           bucket=BUCKET, style=CHART_STYLE)
         
-        pio.write_html(
-            fig,
-            file=output_file,
-            auto_open=False,
-            include_plotlyjs="cdn",
-            config={
-                "displaylogo": False,
-                "displayModeBar": True,
-                "responsive": True,
-            },
-        )
+            # HTMLファイル保存
+            output_file = f"{name}_bug_curve_stacked.html"
+            facet_file = f"{name}_bug_curve_by_repo.html"
         
-        print(f"Bug curve saved to {output_file}")
+            # GitHub Actions環境対応
+            if os.getenv("GITHUB_ACTIONS"):
+                output_file = "bug_curve_stacked.html"
+                facet_file = "bug_curve_by_repo.html"
         
-        # CSVも保存
-        timeline.to_csv(f"{REPO}_timeline_stacked.csv", index=True, index_label="date")
-        df.to_csv(f"{REPO}_issues.csv", index=False)
+            with phase("write"):
+                write_chart(fig, output_file)
+            
+                # CSVも保存
+                timeline.join(backlog).to_csv(f"{name}_timeline_stacked.csv", index=True, index_label="date")
+                stats.to_csv(f"{name}_close_stats.csv", index=True)
+                df.to_csv(f"{name}_issues.csv", index=False)
+
+            # リポジトリ別
+            if multi_repo:
+                repos = sorted(df["repo"].unique())
+                with phase("transform"):
+                    curves = compute_repo_curves(df, timeline.index, repos)
+                with phase("render"):
+                    facets = create_repo_facets(curves, repos, name, BUCKET)
+                with phase("write"):
+                    write_chart(facets, facet_file)
+                    curves.to_csv(f"{name}_repo_curves.csv", index=False)
         
-    except Exception as e:
-        print(f"Error: {e}")
-        raise
+        except Exception as e:
+            print(f"Error: {e}")
+            raise
 
 if __name__ == "__main__":
     main()
@@ -1,38 +1,29 @@
 #! /Users/tfuku/Tools/miniforge3/envs/py313/bin/python3
 
+import argparse
 import os, textwrap
-import json
 import sys
-import requests
-from github import Github
 
-TOKEN = None
-home_dir = os.path.expanduser("~")
-with open(f"{home_dir}/.github/token.json") as f:
-    TOKEN = json.load(f)["token"]
+# トークン・クライアントは最初のAPI呼び出しで作成する（importしただけではファイル・ネットワークにアクセスしない）
+from github_client import get_github, graphql
+from project_fields import field_value, field_value_selections, get_field_schema, resolve_fields
+
+# 共有モジュール（リポジトリ直下の common）。ツールのディレクトリだけを配置する場合は
+# common/tool_profiling.py をスクリプトと同じディレクトリに置く
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from tool_profiling import phase, profile_session  # noqa: E402
 
-GITHUB_API_URL = "https://api.github.com/graphql"
 OWNER            = "nsitexe"
 PROJECT_NUMBER   = 94  # Project number (not ID)
 
-headers = {
-    "Authorization": f"Bearer {TOKEN}"
-}
+# 項目ごとの値（{field_values}）はフィールド定義から作る（fetch_all_items）
+FIELD_ROLES_TO_SHOW = ("start", "end", "priority", "status", "size")
 
 query_org = """
 query($owner: String!, $number: Int!, $after: String) {
   organization(login: $owner) {
     projectV2(number: $number) {
       title
-      fields(first: 50) {
-        nodes {
-          ... on ProjectV2FieldCommon {
-            id
-            name
-            dataType
-          }
-        }
-      }
       items(first: 100, after: $after) {
         nodes {
           content {
@@ -49,26 +40,7 @@ query($owner: String!, $number: Int!, $after: String) {
               }
             }
           }
-          fieldValues(first: 20) {
-            nodes {
-              ... on ProjectV2ItemFieldDateValue {
-                date
-                field {
-                  ... on ProjectV2FieldCommon {
-                    name
-                  }
-                }
-              }
-              ... on ProjectV2ItemFieldSingleSelectValue {
-                name
-                field {
-                  ... on ProjectV2FieldCommon {
-                    name
-                  }
-                }
-              }
-            }
-          }
+          {field_values}
         }
         pageInfo {
           hasNextPage
@@ -119,6 +91,10 @@ def fetch_all_items():
     all_items     = []
     project_title = None
 
+    # フィールド定義は1回だけ取得し、ページごとには必要なフィールドの値だけを取得する
+    fields = resolve_fields(get_field_schema(OWNER, PROJECT_NUMBER), FIELD_ROLES_TO_SHOW)
+    query  = query_org.replace("{field_values}", field_value_selections(fields))
+
     while True:
         variables = {
             "owner":  OWNER,
@@ -126,11 +102,7 @@ def fetch_all_items():
             "after":  after_cursor,
         }
 
-        response = requests.post(
-            GITHUB_API_URL,
-            json={"query": query_org, "variables": variables},
-            headers=headers,
-        )
+        response = graphql(query, variables)
         if response.status_code != 200:
             print(f"Error {response.status_code}: {response.text}")
             break
@@ -169,37 +141,11 @@ def display_items(project_title, items, ghobj):
         create_at  = content["createdAt"]
         assignees  = [node["login"] for node in content["assignees"]["nodes"]]
 
-        start_date = None
-        end_date   = None
-        priority   = None
-        status     = None
-        size       = None
-
-        for field_value in item["fieldValues"]["nodes"]:
-            if field_value == {} or field_value.get("field") is None:
-                continue
-
-            field_name = field_value["field"]["name"]
-            date       = field_value.get("date")
-
-            # 日付情報
-            if field_name in ["開始日", "Start Date", "Start date"]:
-                start_date = date
-            elif field_name in ["完了日", "Due Date", "End Date", "End date"]:
-                end_date = date
-
-            # プライオリティ
-            if field_name in ["Priority"]:
-                priority = field_value.get("name")
-
-            # ステータス
-            if field_name in ["Status"]:
-                status = field_value.get("name")
-
-            # サイズ
-            if field_name in ["Size"]:
-                size = field_value.get("name")
-
+        start_date = field_value(item, "start")
+        end_date   = field_value(item, "end")
+        priority   = field_value(item, "priority")
+        status     = field_value(item, "status")
+        size       = field_value(item, "size")
 
         print(f"- Title      : {title}")
         print(f"  URL        : {url}")
@@ -218,15 +164,16 @@ def display_items(project_title, items, ghobj):
 
 # Issue からの情報を取得して表示
 def display_issue_items(repo_name, issue_no, ghobj):
-    # 1. GitHub API を使用してリポジトリ情報を取得
-    repo  = ghobj.get_repo(f"{OWNER}/{repo_name}")
-    issue = repo.get_issue(number=issue_no)
+    with phase("fetch_comments"):
+        # 1. GitHub API を使用してリポジトリ情報を取得
+        repo  = ghobj.get_repo(f"{OWNER}/{repo_name}")
+        issue = repo.get_issue(number=issue_no)
 
-    # 2. コメント情報を取得
-    comments = issue.get_comments()
+        # 2. コメント情報を取得（件数のための追加リクエストを避けるため一度に読み込む）
+        comments = list(issue.get_comments())
 
     # 3. Issue 情報を表示
-    print(f"Total comments found: {comments.totalCount}")
+    print(f"Total comments found: {len(comments)}")
     print(" " * 4 + "-" * 40)
     for comment in comments:
         print(" " * 4 + f"Author    : {comment.user.login}")
@@ -238,7 +185,16 @@ def display_issue_items(repo_name, issue_no, ghobj):
 
 
 if __name__ == "__main__":
-    gh = Github(TOKEN)
-    project_title, all_items = fetch_all_items()
-    display_items(project_title, all_items, gh)
+    parser = argparse.ArgumentParser(description="GitHub Projectのアイテムとコメントを表示")
+    parser.add_argument("--profile", metavar="JSON",
+                        help="フェーズごとの時間・HTTPリクエスト数・ピークメモリをJSONに保存")
+    parser.add_argument("--profile-phase", metavar="PHASE", choices=["fetch", "fetch_comments"],
+                        help="指定したフェーズを cProfile で計測（--profile と併用）")
+    args = parser.parse_args()
+
+    with profile_session(args.profile, args.profile_phase):
+        gh = get_github()
+        with phase("fetch"):
+            project_title, all_items = fetch_all_items()
+        display_items(project_title, all_items, gh)
 
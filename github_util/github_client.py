@@ -0,0 +1,148 @@
+"""
+github_util のスクリプトで共有するGitHubクライアント
+
+トークン・PyGithubクライアント・requestsセッションは最初に使う時点で作成し、
+同じプロセス内では使い回す（importしただけではファイル・ネットワークにアクセスしない）
+
+    from github_client import get_github, graphql
+    repo = get_github().get_repo("OWNER/REPO")
+    data = graphql(query, {"owner": "OWNER"})
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", "https://api.github.com/graphql")
+TOKEN_FILE = Path("~/.github/token.json")
+
+# HTTP接続設定
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "30"))  # 秒
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "3"))
+HTTP_BACKOFF_FACTOR = float(os.getenv("HTTP_BACKOFF_FACTOR", "1.0"))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))
+HTTP_RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+_lock = threading.Lock()
+_cache: Dict[Any, Any] = {}
+
+
+def _cached(key: Any, factory):
+    """keyごとに1回だけfactoryを呼び出して結果を使い回す（スレッドセーフ）"""
+    with _lock:
+        if key not in _cache:
+            _cache[key] = factory()
+        return _cache[key]
+
+
+def get_token() -> str:
+    """GitHub Actionsまたはローカル環境からトークンを取得"""
+    def load() -> str:
+        token = os.getenv("GITHUB_TOKEN")
+        if token:
+            return token
+        # ローカル環境の場合はファイルから読み込み
+        path = TOKEN_FILE.expanduser()
+        if not path.exists():
+            raise ValueError("GITHUB_TOKEN環境変数または~/.github/token.jsonを設定してください")
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)["token"]
+
+    return _cached("token", load)
+
+
+def get_github(token: Optional[str] = None, pool_size: int = HTTP_POOL_SIZE, lazy: bool = False):
+    """
+    PyGithubクライアント（トークン・接続プールの大きさ・lazyごとに1つ）
+
+    Args:
+        token: トークン（Noneの場合は get_token()）
+        pool_size: 接続プールの大きさ（並列に取得する場合はスレッド数以上にする）
+        lazy: get_repo 等で対象を取得せずにオブジェクトを作る（PyGithub 2.6以降）
+
+    Returns:
+        github.Github
+    """
+    token = token or get_token()
+
+    def create():
+        from github import Auth, Github
+
+        return Github(
+            auth=Auth.Token(token),
+            base_url=GITHUB_API_URL,
+            timeout=int(HTTP_TIMEOUT),
+            retry=HTTP_MAX_RETRIES,
+            pool_size=pool_size,
+            lazy=lazy,
+        )
+
+    return _cached(("github", token, pool_size, lazy), create)
+
+
+def get_session(token: Optional[str] = None):
+    """
+    keep-alive・コネクションプール・リトライ付きのrequestsセッション（トークンごとに1つ）
+
+    Args:
+        token: トークン（Noneの場合は get_token()）
+
+    Returns:
+        requests.Session
+    """
+    token = token or get_token()
+
+    def create():
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        retry = Retry(
+            total=HTTP_MAX_RETRIES,
+            backoff_factor=HTTP_BACKOFF_FACTOR,
+            status_forcelist=HTTP_RETRY_STATUS_CODES,
+            allowed_methods=None,  # GraphQLのPOSTもリトライする（読み取りのみのため）
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(max_retries=retry, pool_connections=HTTP_POOL_SIZE,
+                              pool_maxsize=HTTP_POOL_SIZE)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Authorization": f"Bearer {token}"})
+        return session
+
+    return _cached(("session", token), create)
+
+
+def graphql(query: str, variables: Dict[str, Any], token: Optional[str] = None):
+    """
+    GraphQL APIを呼び出す
+
+    Args:
+        query: クエリ
+        variables: 変数
+        token: トークン（Noneの場合は get_token()）
+
+    Returns:
+        requests.Response（ステータス・エラーの扱いは呼び出し側で行う）
+    """
+    return get_session(token).post(
+        GITHUB_GRAPHQL_URL,
+        json={"query": query, "variables": variables},
+        timeout=HTTP_TIMEOUT,
+    )
+
+
+def clear_cache() -> None:
+    """作成済みのクライアント・セッション・トークンを破棄（トークンを切り替える場合等）"""
+    with _lock:
+        for value in _cache.values():
+            close = getattr(value, "close", None)
+            if close is not None:
+                close()
+        _cache.clear()
@@ -0,0 +1,176 @@
+"""
+GitHub Project（V2）のフィールド定義を使ったアイテム取得の補助
+
+フィールド定義（名前・型）はプロジェクトごとに1回だけ取得して使い回し、アイテムの取得では
+開始日・終了日・ステータス等の必要なフィールドの値だけを名前で指定して取得する
+（fieldValues で全フィールドの値を取得して名前で探すより、レスポンスも解析も小さい）。
+
+    fields = resolve_fields(get_field_schema("OWNER", 1), ("start", "end"))
+    query = ITEMS_QUERY.replace("{field_values}", field_value_selections(fields))
+    ...
+    start = field_value(item, "start")
+"""
+
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from github_client import graphql
+
+# 用途 -> フィールド名の候補（大文字・小文字は区別しない。先に書いたものを優先）
+FIELD_ROLES: Dict[str, Tuple[str, ...]] = {
+    "start": ("start date", "start", "開始日"),
+    "end": ("end date", "end", "due date", "due", "完了日"),
+    "status": ("status", "ステータス"),
+    "priority": ("priority", "プライオリティ"),
+    "size": ("size", "サイズ"),
+}
+
+# フィールドの型 -> 値を取得するフラグメント（値のキー）
+VALUE_FRAGMENTS: Dict[str, Tuple[str, str]] = {
+    "DATE": ("ProjectV2ItemFieldDateValue", "date"),
+    "SINGLE_SELECT": ("ProjectV2ItemFieldSingleSelectValue", "name"),
+    "TEXT": ("ProjectV2ItemFieldTextValue", "text"),
+    "NUMBER": ("ProjectV2ItemFieldNumberValue", "number"),
+    "ITERATION": ("ProjectV2ItemFieldIterationValue", "title"),
+}
+
+SCHEMA_QUERY = """
+query($owner: String!, $number: Int!{repo_variable}) {
+  {owner_field} {
+    projectV2(number: $number) {
+      fields(first: 100) {
+        nodes {
+          ... on ProjectV2FieldCommon {
+            id
+            name
+            dataType
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+OWNER_FIELDS = {
+    "repository": "repository(owner: $owner, name: $repo)",
+    "organization": "organization(login: $owner)",
+    "user": "user(login: $owner)",
+}
+
+_lock = threading.Lock()
+_schemas: Dict[Tuple[Any, ...], List[Dict[str, str]]] = {}
+
+
+def get_field_schema(owner: str, number: int, repo: Optional[str] = None,
+                     owner_type: str = "organization", token: Optional[str] = None) -> List[Dict[str, str]]:
+    """
+    プロジェクトのフィールド定義（プロジェクトごとに1回だけ取得する）
+
+    Args:
+        owner: オーナー（organization・ユーザー）
+        number: プロジェクト番号
+        repo: リポジトリのプロジェクトの場合はリポジトリ名
+        owner_type: repoを指定しない場合のオーナーの種類（organization / user）
+        token: トークン（Noneの場合は get_token()）
+
+    Returns:
+        フィールドのリスト（id / name / dataType）
+    """
+    key = (owner, repo, owner_type, number, token)
+    with _lock:
+        if key in _schemas:
+            return _schemas[key]
+
+    owner_type = "repository" if repo else owner_type
+    query = (SCHEMA_QUERY
+             .replace("{repo_variable}", ", $repo: String!" if repo else "")
+             .replace("{owner_field}", OWNER_FIELDS[owner_type]))
+    variables: Dict[str, Any] = {"owner": owner, "number": number}
+    if repo:
+        variables["repo"] = repo
+
+    response = graphql(query, variables, token)
+    if response.status_code != 200:
+        raise RuntimeError(f"GitHub API error: {response.status_code} - {response.text}")
+    body = response.json()
+    if body.get("errors"):
+        messages = ", ".join(e.get("message", "Unknown error") for e in body["errors"])
+        raise RuntimeError(f"GraphQL APIでエラーが発生しました: {messages}")
+    try:
+        nodes = body["data"][owner_type]["projectV2"]["fields"]["nodes"]
+    except (KeyError, TypeError) as e:
+        raise RuntimeError(f"予期しない形式のレスポンス: {e}")
+
+    # 共通の項目を持たないフィールドは空オブジェクトで返る
+    schema = [node for node in nodes if node.get("name")]
+    with _lock:
+        _schemas[key] = schema
+    return schema
+
+
+def resolve_fields(schema: Iterable[Dict[str, str]], roles: Iterable[str]) -> Dict[str, Dict[str, str]]:
+    """
+    用途ごとに使うフィールドを選ぶ
+
+    Args:
+        schema: get_field_schema の戻り値
+        roles: 用途（FIELD_ROLES のキー）
+
+    Returns:
+        用途 -> フィールド（プロジェクトにない用途は含まない）
+    """
+    by_name = {}
+    for field in schema:
+        by_name.setdefault(field["name"].lower(), field)
+
+    fields = {}
+    for role in roles:
+        for candidate in FIELD_ROLES[role]:
+            field = by_name.get(candidate)
+            if field is not None and field.get("dataType") in VALUE_FRAGMENTS:
+                fields[role] = field
+                break
+    return fields
+
+
+def field_value_selections(fields: Dict[str, Dict[str, str]]) -> str:
+    """
+    アイテムのクエリに入れる、用途ごとの fieldValueByName（用途をエイリアスにする）
+
+    Args:
+        fields: resolve_fields の戻り値
+
+    Returns:
+        GraphQLの選択（フィールドがない場合は空文字列）
+    """
+    selections = []
+    for role, field in fields.items():
+        fragment, key = VALUE_FRAGMENTS[field["dataType"]]
+        # json.dumps の文字列リテラルはGraphQLの文字列としても正しい
+        selections.append(
+            f"{role}: fieldValueByName(name: {json.dumps(field['name'])}) "
+            f"{{ ... on {fragment} {{ {key} }} }}"
+        )
+    return "\n".join(selections)
+
+
+def field_value(item: Dict[str, Any], role: str) -> Any:
+    """
+    アイテムから用途の値を取り出す（値が設定されていない場合はNone）
+
+    Args:
+        item: field_value_selections を含むクエリで取得したアイテム
+        role: 用途
+    """
+    value = item.get(role)
+    if not value:
+        return None
+    return next(iter(value.values()), None)
+
+
+def clear_cache() -> None:
+    """取得済みのフィールド定義を破棄（プロジェクトのフィールドを変更した場合等）"""
+    with _lock:
+        _schemas.clear()
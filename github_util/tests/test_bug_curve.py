@@ -0,0 +1,90 @@
+"""
+Bug Curve の日別集計のテスト
+
+    cd github_util && python -m pytest tests
+"""
+
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import generate_bug_curve_from_github_issues as bug_curve  # noqa: E402
+
+
+@pytest.fixture
+def opened_after_last_close():
+    """最後のクローズ（1/5）より後に作成されたIssue（1/10）を含むデータ"""
+    return pd.DataFrame({
+        "created_at": pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-10"]),
+        "closed_at": pd.to_datetime(["2024-01-05", None, None]),
+        "primary_label": ["bug", "bug", "ui"],
+    })
+
+
+def test_timeline_spans_last_created(opened_after_last_close):
+    df = opened_after_last_close
+    timeline = bug_curve.create_label_timeline(df, bug_curve.get_unique_labels(df))
+    assert timeline.index[-1] == pd.Timestamp("2024-01-10")
+
+
+def test_backlog_with_issue_opened_after_last_close(opened_after_last_close):
+    df = opened_after_last_close
+    labels = bug_curve.get_unique_labels(df)
+    timeline = bug_curve.create_label_timeline(df, labels)
+    backlog = bug_curve.compute_backlog(df, timeline.index, labels)
+
+    assert backlog.loc["2024-01-05"].tolist() == [1, 1, 0]
+    assert backlog.loc["2024-01-10"].tolist() == [2, 1, 1]
+
+
+def test_counts_outside_dates_do_not_spill_into_next_key(opened_after_last_close):
+    # 日付範囲より後のIssueは数えず、次のラベルの初日にも加算しない
+    df = opened_after_last_close
+    dates = pd.date_range("2024-01-01", "2024-01-05")
+    created, closed = bug_curve.cumulative_counts(df, dates, ["bug", "ui"], "primary_label")
+
+    assert created.tolist() == [[1, 2, 2, 2, 2], [0, 0, 0, 0, 0]]
+    assert closed.tolist() == [[0, 0, 0, 0, 1], [0, 0, 0, 0, 0]]
+
+
+def test_repo_curves_with_repo_newer_than_every_close():
+    # repo-b の最新Issue（1/10）は全体の最後のクローズ（1/05）より後
+    df = pd.DataFrame({
+        "repo": ["repo-a", "repo-a", "repo-b", "repo-b"],
+        "created_at": pd.to_datetime(["2024-01-01", "2024-01-03", "2024-01-02", "2024-01-10"]),
+        "closed_at": pd.to_datetime(["2024-01-05", None, None, None]),
+        "primary_label": ["bug", "bug", "ui", "bug"],
+    })
+    labels = bug_curve.get_unique_labels(df)
+    timeline = bug_curve.create_label_timeline(df, labels)
+    curves = bug_curve.compute_repo_curves(df, timeline.index, ["repo-a", "repo-b"])
+
+    last = curves[curves["date"] == pd.Timestamp("2024-01-10")].set_index("repo")
+    assert last.loc["repo-a", ["cumulative_issues", "cumulative_closed", "open"]].tolist() == [2, 1, 1]
+    assert last.loc["repo-b", ["cumulative_issues", "cumulative_closed", "open"]].tolist() == [2, 0, 2]
+
+    first = curves[curves["date"] == pd.Timestamp("2024-01-01")].set_index("repo")
+    assert first.loc["repo-b", "cumulative_issues"] == 0
+
+
+def test_multi_repo_skips_repos_that_fail(monkeypatch):
+    # 取得に失敗したリポジトリは除き、取得できたリポジトリだけで集計する
+    class Client:
+        def get_repo(self, name):
+            return name
+
+    def fetch(repo):
+        if repo == "org/missing":
+            raise RuntimeError("404 Not Found")
+        return [("2024-01-01", None, ["bug"], "Issue 1"), ("2024-01-02", "2024-01-03", [], "Issue 2")]
+
+    monkeypatch.setattr(bug_curve, "get_client", lambda: Client())
+    monkeypatch.setattr(bug_curve, "fetch_issue_records", fetch)
+    df = bug_curve.collect_multi_repo_issue_data(["org/ok", "org/missing"])
+
+    assert df["repo"].unique().tolist() == ["org/ok"]
+    assert len(df) == 2
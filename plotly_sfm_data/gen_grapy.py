@@ -1,20 +1,39 @@
-#! /Users/tfuku/Tools/miniforge3/envs/py313/bin/python3
+#!/usr/bin/env python3
+"""
+SFM面積データのグラフ・一覧ページを生成する
+
+コマンドラインのほか、ライブラリとしても使える（import時にファイル出力・ログ設定・
+pandas/plotlyの読み込みは行わない）
+
+    import gen_grapy
+    artifacts = gen_grapy.create_graph(["sfm_*.csv"], output_dir="out", png=False)
+    figs = gen_grapy.build_figures(df)   # ファイル出力なしで図だけ作成
+"""
 
-import sys
 import os
+import glob
+import gzip
+import hashlib
+import json
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from logging import getLogger, StreamHandler, FileHandler, Formatter, DEBUG, INFO
 import click
-import pandas as pd
-import plotly.express as px
-import plotly.io as pio
 
-os.environ["PATH"] = "/Users/tfuku/Tools/miniforge3/envs/py313/bin:" + os.environ["PATH"]
+# 共有モジュール（リポジトリ直下の common）。ツールのディレクトリだけを配置する場合は
+# common/tool_profiling.py をスクリプトと同じディレクトリに置く
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from tool_profiling import PROFILER, phase, profile_session  # noqa: E402
+
+# numpy / pandas / plotly は使う関数の中で読み込む（--help やimportを速くするため）
 
 #     ____________________
 #____/ [*] logger設定      \____________________
 #
 def setup_logger(name, logfile='logger_log.log'):
-    logger = getLogger(__name__)
+    logger = getLogger(name)
     logger.setLevel(INFO)
 
 
@@ -34,7 +53,8 @@ def setup_logger(name, logfile='logger_log.log'):
 
     return logger
 
-logger = setup_logger(__name__)
+# ハンドラの設定はコマンドライン実行時のみ（ライブラリ利用時は呼び出し側の設定に従う）
+logger = getLogger(__name__)
 
 
 
@@ -44,49 +64,416 @@ logger = setup_logger(__name__)
 #
 
 @click.command()
-@click.option('--csv', '-c', required=True, type=str)
-def run(csv):
-    create_graph(csv)
+@click.option('--csv', '-c', required=True, type=str, multiple=True,
+              help='入力CSV（複数指定・globパターン可）')
+@click.option('--chunksize', type=int, default=None,
+              help='指定行数ずつ読み込み、チャンクごとに事前集約する（メモリ使用量を抑える）')
+@click.option('--aggregate', 'aggregate_freq', default=None,
+              help='モジュール・期間ごとに最後の値へ事前集約する（例: D, W, M。--chunksize指定時の既定はD）')
+@click.option('--max-points', type=click.IntRange(min=4), default=None,
+              help='モジュールごとの最大プロット点数（4以上。超える場合は間引く。元データはCSVに出力）')
+@click.option('--decimate', 'decimate_method', type=click.Choice(['lttb', 'minmax']), default='lttb',
+              show_default=True, help='間引き方法（lttb: 形状保持, minmax: 区間ごとの最小・最大を保持）')
+@click.option('--jobs', '-j', default=os.cpu_count() or 1, show_default=True, type=int,
+              help='モジュール別グラフを並列に描画するプロセス数')
+@click.option('--png/--no-png', default=True, show_default=True,
+              help='PNG出力（kaleido）を行うか（fullモードのみ）')
+@click.option('--output-mode', type=click.Choice(['full', 'compact']), default='full', show_default=True,
+              help='full: モジュール別HTML/PNG + 一覧ページ, compact: データファイル1つ + 遅延描画の一覧ページ')
+@click.option('--gzip', 'gzip_data', is_flag=True,
+              help='compactモードのデータファイルをgzip圧縮する（HTTPサーバ経由で表示する場合）')
+@click.option('--metrics', is_flag=True,
+              help='派生指標（前回比・増加率・面積増加のアラート）を計算し、サマリ表とアラート一覧を出力する')
+@click.option('--alert-pct', type=float, default=None,
+              help='アラートにする前回比の増加率（既定: 0.1）')
+@click.option('--alert-z', type=float, default=None,
+              help='アラートにする前回差分のzスコア（既定: 3.0）')
+@click.option('--growth-window', type=int, default=None,
+              help='増加率を見るサンプル数（既定: 7）')
+@click.option('--incremental', is_flag=True,
+              help='データが変わったモジュールだけを再描画する（fullモードのみ。マニフェストとDIVキャッシュを使用）')
+@click.option('--output-dir', '-o', default='.', show_default=True, type=click.Path(file_okay=False),
+              help='出力先ディレクトリ')
+@click.option('--profile', 'profile_path', default=None, type=click.Path(dir_okay=False),
+              help='フェーズごとの処理時間・ピークメモリをJSONで保存する（描画内訳は --jobs 1 の場合のみ）')
+@click.option('--profile-phase', default=None,
+              type=click.Choice(['load', 'metrics', 'decimate', 'render', 'build_figure', 'write_html', 'write_image', 'write']),
+              help='指定フェーズの実行中だけcProfileで関数ごとの時間を取る（--profile指定時）')
+def run(csv, chunksize, aggregate_freq, max_points, decimate_method, jobs, png, output_mode, gzip_data,
+        metrics, alert_pct, alert_z, growth_window, incremental, output_dir, profile_path, profile_phase):
+    setup_logger(__name__)
+    metrics_options = None
+    if metrics:
+        options = dict(alert_pct=alert_pct, alert_z=alert_z, growth_window=growth_window)
+        metrics_options = {k: v for k, v in options.items() if v is not None}
+    # HTTPリクエストは行わないため、フェーズの時間とメモリだけを計測する
+    with profile_session(profile_path, profile_phase, http=False,
+                         on_saved=lambda path: logger.info(f"profile: {path}")):
+        create_graph(list(csv), jobs, png, output_mode, gzip_data,
+                     chunksize=chunksize, aggregate_freq=aggregate_freq,
+                     max_points=max_points, decimate_method=decimate_method,
+                     incremental=incremental, metrics_options=metrics_options,
+                     output_dir=output_dir)
 
 
 #     ____________________
 #____/ [*] functions      \____________________
 #
-def create_graph(csv):
-
-    df = pd.read_csv(csv, parse_dates=["Date"])
-
-    html_divs = list()
 
-    # グラフの見た目の共通設定
-    common_layout = dict(
-        plot_bgcolor="white",
+# グラフの見た目の共通設定
+COMMON_LAYOUT = dict(
+    plot_bgcolor="white",
+    title=dict(
+        x=0.5,
+        font=dict(size=24, family="Arial", color="black")
+    ),
+    xaxis=dict(
         title=dict(
-            x=0.5,
-            font=dict(size=24, family="Arial", color="black")
+            text="Date",
+            font=dict(size=20, family="Arial", color="black"),
         ),
-        xaxis=dict(
-            title=dict(
-                text="Date",
-                font=dict(size=20, family="Arial", color="black"),
-            ),
-            gridcolor="lightgray",
-            gridwidth=1,
-            griddash="dot"
-        ),
-        yaxis=dict(
-            title=dict(
-                text="Total Area",
-                font=dict(size=20, family="Arial", color="black"),
-            ),
-            gridcolor="lightgray",
-            gridwidth=1,
-            griddash="dot",
-            zeroline=True,
-            zerolinecolor="gray"
+        gridcolor="lightgray",
+        gridwidth=1,
+        griddash="dot"
+    ),
+    yaxis=dict(
+        title=dict(
+            text="Total Area",
+            font=dict(size=20, family="Arial", color="black"),
         ),
-        margin=dict(t=100)
-    )    
+        gridcolor="lightgray",
+        gridwidth=1,
+        griddash="dot",
+        zeroline=True,
+        zerolinecolor="gray"
+    ),
+    margin=dict(t=100)
+)
+
+# DIV出力時の設定
+DIV_CONFIG = {
+    "displaylogo": False,
+    "displayModeBar": False,
+}
+
+
+# 入力CSVの列と型
+AREA_DTYPES = {
+    "target module": "category",
+    "Impl-SfM": "category",
+    "Design-SfM": "category",
+    "Total Area": "float64",
+}
+CATEGORY_COLUMNS = [c for c, t in AREA_DTYPES.items() if t == "category"]
+
+
+def csv_engine():
+    """
+    pyarrowがあれば高速なpyarrowエンジンを使う
+    """
+    try:
+        import pyarrow  # noqa: F401
+        return "pyarrow"
+    except ImportError:
+        return "c"
+
+
+def expand_paths(patterns):
+    """
+    ファイル名・globパターンを展開し、重複を除いて順序を保ったリストにする
+    """
+    paths = list()
+    for pattern in patterns:
+        matched = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        if not matched:
+            logger.warning(f"no files matched: {pattern}")
+        paths.extend(p for p in matched if p not in paths)
+    return paths
+
+
+def aggregate_area(df, freq):
+    """
+    モジュール・期間ごとに最後の値へ集約する（期間の代表日は期間の開始日）
+    """
+    period = df["Date"].dt.to_period(freq).dt.start_time
+    return (df.assign(Date=period)
+              .groupby(["target module", "Date"], observed=True, sort=False)
+              .agg({"Total Area": "last", "Impl-SfM": "last", "Design-SfM": "last"})
+              .reset_index())
+
+
+def load_area_data(patterns, chunksize=None, aggregate_freq=None):
+    """
+    SFM面積データのCSVを型付きで読み込む
+
+    patterns: ファイル名・globパターン（文字列または文字列のリスト）
+    chunksize: 指定時はチャンクごとに読み込み、チャンク単位で事前集約する
+    aggregate_freq: 事前集約の期間（pandasのperiod文字列）。chunksize指定時の既定は"D"
+    """
+    import pandas as pd
+
+    if isinstance(patterns, str):
+        patterns = [patterns]
+    paths = expand_paths(patterns)
+    if not paths:
+        raise FileNotFoundError(f"no input CSV: {patterns}")
+
+    if chunksize and not aggregate_freq:
+        aggregate_freq = "D"
+
+    read_kwargs = dict(
+        usecols=["Date", *AREA_DTYPES],
+        dtype=AREA_DTYPES,
+        parse_dates=["Date"],
+    )
+
+    frames = list()
+    for path in paths:
+        if chunksize:
+            # pyarrowエンジンはchunksize非対応のためCエンジンで読む
+            for chunk in pd.read_csv(path, chunksize=chunksize, engine="c", **read_kwargs):
+                frames.append(aggregate_area(chunk, aggregate_freq))
+        else:
+            frames.append(pd.read_csv(path, engine=csv_engine(), **read_kwargs))
+
+    df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+    # ファイル間でカテゴリが異なるとobjectに戻るため、結合後に揃え直す
+    for column in CATEGORY_COLUMNS:
+        if df[column].dtype != "category":
+            df[column] = df[column].astype("category")
+
+    # チャンク・ファイルの境界をまたぐ期間を集約し直す
+    if aggregate_freq:
+        df = aggregate_area(df, aggregate_freq)
+
+    # 複数ファイルの行が混ざっても折れ線が日付順になるように並べる
+    df = df.sort_values(["target module", "Date"], kind="stable", ignore_index=True)
+
+    logger.info(f"loaded {len(df)} rows from {len(paths)} file(s)")
+    return df
+
+
+def area_frame(data, chunksize=None, aggregate_freq=None):
+    """
+    入力をSFM面積データのDataFrameにする
+
+    data: ファイル名・globパターン（文字列またはリスト）、または読み込み済みのDataFrame
+    """
+    import pandas as pd
+
+    if not isinstance(data, pd.DataFrame):
+        return load_area_data(data, chunksize, aggregate_freq)
+
+    df = data.astype({c: t for c, t in AREA_DTYPES.items() if c in data.columns})
+    if aggregate_freq:
+        df = aggregate_area(df, aggregate_freq)
+    return df.sort_values(["target module", "Date"], kind="stable", ignore_index=True)
+
+
+#     ____________________
+#____/ [*] 間引き          \____________________
+#
+def lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets で残す点のインデックスを返す
+    （先頭・末尾は必ず残し、各区間で前後の点と作る三角形が最大の点を選ぶ）
+    """
+    import numpy as np
+
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    indices = [0]
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        xs, ys = x[start:end], y[start:end]
+        area = np.abs((x[a] - avg_x) * (ys - y[a]) - (x[a] - xs) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices.append(a)
+    indices.append(n - 1)
+    return np.asarray(indices)
+
+
+def minmax_indices(y, n_out):
+    """
+    区間ごとの最小・最大の点（と先頭・末尾）のインデックスを返す
+    （区間数は (n_out - 2) // 2 なので、返す点数は n_out を超えない）
+    """
+    import numpy as np
+    import pandas as pd
+
+    n = len(y)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 4:
+        # 最小・最大と先頭・末尾を入れる余地がないので等間隔に選ぶ
+        return np.unique(np.linspace(0, n - 1, n_out).astype(int))
+
+    n_buckets = max((n_out - 2) // 2, 1)
+    buckets = np.arange(n) * n_buckets // n
+    grouped = pd.Series(y).groupby(buckets)
+    return np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy(), [0, n - 1]]))
+
+
+def decimate(df, max_points, method="lttb"):
+    """
+    モジュールごとにプロット点数をmax_points程度に間引く
+
+    戻り値: (間引き後のDataFrame, {module: (残した点数, 元の点数)})
+    """
+    import numpy as np
+    import pandas as pd
+
+    parts = list()
+    resolution = dict()
+    for module, tmp_df in df.groupby("target module", observed=True, sort=False):
+        n = len(tmp_df)
+        if n <= max_points:
+            parts.append(tmp_df)
+            resolution[module] = (n, n)
+            continue
+
+        y = tmp_df["Total Area"].to_numpy(dtype=float)
+        if method == "lttb":
+            x = tmp_df["Date"].to_numpy().astype("datetime64[ns]").astype(np.int64).astype(float)
+            indices = lttb_indices(x, y, max_points)
+        else:
+            indices = minmax_indices(y, max_points)
+
+        parts.append(tmp_df.iloc[indices])
+        resolution[module] = (len(indices), n)
+
+    return pd.concat(parts, ignore_index=True), resolution
+
+
+def chart_titles(df, resolution=None, method="lttb"):
+    """
+    グラフのタイトルを返す（キーNoneは概要グラフ）。間引いた場合は解像度を付記する
+    """
+    def suffix(kept, total):
+        return f" ({method.upper()} {kept:,}/{total:,} pts)" if kept < total else ""
+
+    resolution = resolution or dict()
+    titles = {None: "Total Area Over Time by Target Module"}
+    kept_total = [0, 0]
+    for module in df["target module"].unique():
+        kept, total = resolution.get(module, (0, 0))
+        kept_total[0] += kept
+        kept_total[1] += total
+        titles[module] = f"Total Area Over Time - {module}" + suffix(kept, total)
+    titles[None] += suffix(*kept_total)
+    return titles
+
+
+# 1回のkaleido呼び出しでまとめて出力する図の数（メモリ使用量の上限）
+IMAGE_EXPORT_CHUNK = 50
+
+# kaleido呼び出し1回（1チャンクの出力・サーバの停止）の待ち時間の上限（秒）
+IMAGE_EXPORT_TIMEOUT = 300
+
+
+def call_with_timeout(func, timeout, *args):
+    """
+    funcを別スレッドで実行し、timeout秒以内に終わらなければTimeoutErrorにする
+    （kaleidoのサーバが応答しない場合に出力全体が止まらないようにする）
+    """
+    result = dict()
+
+    def run():
+        try:
+            result["value"] = func(*args)
+        except BaseException as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    if thread.is_alive():
+        raise TimeoutError(f"PNG export did not finish within {timeout}s")
+    if "error" in result:
+        raise result["error"]
+    return result.get("value")
+
+
+def check_browser():
+    """
+    kaleido(>=1.0)が使うChromeがあるか確認する（ない場合はChromeNotFoundError）
+
+    常駐サーバはChromeの起動に失敗するとスレッドごと終了し、以降の出力が待ち続けるため、
+    サーバを起動する前に確認する
+    """
+    try:
+        from choreographer.browsers import ChromeNotFoundError, Chromium
+    except ImportError:
+        return
+
+    path = Chromium.find_browser(skip_local=False)
+    if not path or not os.path.isfile(path):
+        raise ChromeNotFoundError(
+            "Kaleido v1 and later requires Chrome to be installed. "
+            "Install it with `kaleido_get_chrome`, set BROWSER_PATH, or use --no-png."
+        )
+
+
+@contextmanager
+def kaleido_session():
+    """
+    kaleido(>=1.0)の常駐サーバを起動し、ブロック内の画像出力でChromiumを使い回す
+    （古いkaleidoでは何もしない）
+    """
+    try:
+        import kaleido
+        start, stop = kaleido.start_sync_server, kaleido.stop_sync_server
+    except (ImportError, AttributeError):
+        yield
+        return
+
+    check_browser()
+    start(silence_warnings=True)
+    try:
+        yield
+    finally:
+        # 出力がタイムアウトした場合は停止も待ち続けるため、同じ上限で打ち切る
+        try:
+            call_with_timeout(lambda: stop(silence_warnings=True), IMAGE_EXPORT_TIMEOUT)
+        except TimeoutError:
+            logger.warning("kaleido server did not stop; leaving it to exit with the process")
+
+
+def export_images(figs, paths):
+    """
+    複数の図をまとめてPNG出力する
+    """
+    import plotly.io as pio
+
+    if not figs:
+        return
+
+    # plotly < 6.1 には一括出力APIがないため1枚ずつ出力
+    if not hasattr(pio, "write_images"):
+        for fig, path in zip(figs, paths):
+            fig.write_image(path)
+        return
+
+    with kaleido_session():
+        for i in range(0, len(figs), IMAGE_EXPORT_CHUNK):
+            call_with_timeout(pio.write_images, IMAGE_EXPORT_TIMEOUT,
+                              figs[i:i + IMAGE_EXPORT_CHUNK], paths[i:i + IMAGE_EXPORT_CHUNK])
+
+
+def build_figure(df, title):
+    """
+    Total Areaの推移グラフを作成
+    """
+    import plotly.express as px
 
     # グラフ作成
     fig = px.line(
@@ -96,12 +483,12 @@ def create_graph(csv):
         color="target module",
         markers=True,
         line_group=None,
-        title="Total Area Over Time by Target Module",
+        title=title,
         hover_data=["Impl-SfM", "Design-SfM"]
     )
 
     # グラフの共通の見た目の更新
-    fig.update_layout(common_layout)
+    fig.update_layout(COMMON_LAYOUT)
 
     # グラフの見た目、個別対応
     fig.update_layout(
@@ -113,81 +500,496 @@ def create_graph(csv):
     # マーカーサイズの変更
     fig.update_traces(marker=dict(size=8))
 
-    # HTML出力（CDN使用）
-    fig.write_html("total_area_plot.html", include_plotlyjs="cdn")
-
-    # PNG出力（kaleidoが必要）
-    fig.write_image("total_area_plot.png")
-
-    # DIV出力
-    div_html = pio.to_html(fig,
-                            include_plotlyjs="cdn",
-                            full_html=False,
-                            config={
-                                "displaylogo": False,
-                                "displayModeBar": False,
-                            }
-                        ) 
-
-    # 各divにクラスを追加
-    html_divs.append(f'<div class="chart">{div_html}</div>\n')    
-
-    del fig
-
-    for module, tmp_df in df.groupby("target module"):
-
-        # グラフ作成
-        fig = px.line(
-            tmp_df,
-            x="Date",
-            y="Total Area",
-            color="target module",
-            markers=True,
-            line_group=None,
-            title=f"Total Area Over Time - {module}",
-            hover_data=["Impl-SfM", "Design-SfM"]
-        )
+    return fig
 
-        # グラフの共通の見た目の更新
-        fig.update_layout(common_layout)
 
-        # グラフの見た目、個別対応
-        fig.update_layout(
-            yaxis=dict(
-                range=[0,tmp_df["Total Area"].max() * 1.1]
-            )
-        )
+def output_name(module):
+    """
+    出力ファイル名（拡張子なし）とdivのCSSクラスを返す
+    """
+    if module is None:
+        return "total_area_plot", "chart"
+    return f"{module}_area_plot", f"chart_{module}"
 
-        # マーカーサイズの変更
-        fig.update_traces(marker=dict(size=8))
 
-        # HTML出力（CDN使用）
-        fig.write_html(f"{module}_area_plot.html", include_plotlyjs="cdn")
+def build_figures(data, max_points=None, decimate_method="lttb"):
+    """
+    概要グラフとモジュール別グラフを作成して返す（ファイル出力なし）
+
+    data: area_frame() と同じ（ファイル名・globパターン、またはDataFrame）
+
+    戻り値: {module: Figure}（キーNoneは概要グラフ）
+    """
+    df = area_frame(data)
+    resolution = None
+    if max_points:
+        df, resolution = decimate(df, max_points, decimate_method)
+    titles = chart_titles(df, resolution, decimate_method)
+
+    figs = {None: build_figure(df, titles[None])}
+    for module, tmp_df in df.groupby("target module", observed=True):
+        figs[module] = build_figure(tmp_df, titles[module])
+    return figs
+
+
+def render_chunk(chunk, png=True, output_dir="."):
+    """
+    グラフをまとめて作成し、HTML出力・PNG一括出力を行ってDIVのリストを返す
+    （ProcessPoolExecutorのワーカーで実行されるためトップレベル関数にしている）
 
-        # PNG出力（kaleidoが必要）
-        fig.write_image(f"{module}_area_plot.png")
+    chunk: (module, DataFrame, title) のリスト。moduleがNoneの場合は全モジュールの概要グラフ
+    """
+    import plotly.io as pio
+
+    html_divs = list()
+    figs = list()
+    paths = list()
+
+    for module, tmp_df, title in chunk:
+        with phase("build_figure"):
+            fig = build_figure(tmp_df, title)
+        name, css_class = output_name(module)
+
+        # HTML出力（CDN使用）
+        with phase("write_html"):
+            fig.write_html(os.path.join(output_dir, f"{name}.html"), include_plotlyjs="cdn")
 
         # DIV出力
+        # plotly.jsは一覧ページのheadで1回だけ読み込む
         div_html = pio.to_html(fig,
-                                include_plotlyjs="cdn",
+                                include_plotlyjs=False,
                                 full_html=False,
-                                config={
-                                    "displaylogo": False,
-                                    "displayModeBar": False,
-                                }
+                                config=DIV_CONFIG
                             ) 
 
         # 各divにクラスを追加
-        html_divs.append(f'<div class="chart_{module}">{div_html}</div>\n')    
+        html_divs.append(f'<div class="{css_class}">{div_html}</div>\n')
+
+        if png:
+            figs.append(fig)
+            paths.append(os.path.join(output_dir, f"{name}.png"))
+
+    # PNG出力（kaleidoが必要）。ワーカーごとに1セッションで出力する
+    with phase("write_image"):
+        export_images(figs, paths)
+
+    return html_divs
+
+
+def split_chunks(tasks, n):
+    """
+    タスクを順序を保ったままn個の連続したチャンクに分割
+    """
+    size, rest = divmod(len(tasks), n)
+    chunks = list()
+    start = 0
+    for i in range(n):
+        end = start + size + (1 if i < rest else 0)
+        chunks.append(tasks[start:end])
+        start = end
+    return chunks
+
+
+def build_compact_data(df, titles=None):
+    """
+    共通レイアウト + モジュール別トレースのデータを作成
+    （Plotlyの図オブジェクトを経由せず、列データをそのまま詰める）
+    """
+    df = df.sort_values(["target module", "Date"], kind="stable")
+    titles = titles or chart_titles(df)
+
+    modules = list()
+    for module, tmp_df in df.groupby("target module", sort=True, observed=True):
+        modules.append({
+            "id": str(module),
+            "title": titles[module],
+            "ymax": float(tmp_df["Total Area"].max()) * 1.1,
+            "x": tmp_df["Date"].dt.strftime("%Y-%m-%d").tolist(),
+            "y": tmp_df["Total Area"].tolist(),
+            "impl": tmp_df["Impl-SfM"].astype(str).tolist(),
+            "design": tmp_df["Design-SfM"].astype(str).tolist(),
+        })
+
+    return {
+        "layout": COMMON_LAYOUT,
+        "config": DIV_CONFIG,
+        "overview": {
+            "title": titles[None],
+            "ymax": float(df["Total Area"].max()) * 1.1,
+        },
+        "modules": modules,
+    }
+
+
+def write_compact_report(df, gzip_data=False, titles=None,
+                         html_file="all_modules_compact.html", data_stem="sfm_data", output_dir="."):
+    """
+    データファイル1つと、スクロールで表示範囲に入ったグラフだけを描画する一覧ページを出力
+
+    戻り値: (一覧ページのパス, データファイルのパス)
+    """
+    from plotly.offline import get_plotlyjs_version
+
+    payload = json.dumps(build_compact_data(df, titles), ensure_ascii=False, separators=(",", ":"))
+
+    if gzip_data:
+        # fetchで読み込むためHTTPサーバ経由で表示する（file://では読み込めない）
+        data_file = f"{data_stem}.json.gz"
+        with open(os.path.join(output_dir, data_file), "wb") as raw:
+            with gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as f:
+                f.write(payload.encode("utf-8"))
+        loader = f'<script>loadGzip("{data_file}");</script>'
+    else:
+        # <script src>で読み込むのでfile://でも表示できる
+        data_file = f"{data_stem}.js"
+        with open(os.path.join(output_dir, data_file), "w", encoding="utf-8") as f:
+            f.write(f"window.SFM_DATA={payload};\n")
+        loader = f'<script src="{data_file}"></script>\n    <script>init(window.SFM_DATA);</script>'
+
+    html = (COMPACT_HTML_TEMPLATE
+            .replace("%PLOTLYJS_VERSION%", get_plotlyjs_version())
+            .replace("%LOADER%", loader))
+    # ページからは相対パスでデータファイルを参照する
+    html_path = os.path.join(output_dir, html_file)
+    data_path = os.path.join(output_dir, data_file)
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(html)
+
+    logger.info(f"compact report: {html_path} + {data_path} ({os.path.getsize(data_path)} bytes)")
+    return html_path, data_path
+
+
+COMPACT_HTML_TEMPLATE = """<html>
+  <head>
+    <meta charset="utf-8">
+    <title>Grid Layout of Target Module Graphs</title>
+    <script src="https://cdn.plot.ly/plotly-%PLOTLYJS_VERSION%.min.js"></script>
+    <style>
+      body {
+        background-color: #f9f9f9;
+        font-family: Arial, sans-serif;
+      }
+      .chart-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(720px, 1fr));
+        gap: 20px;
+        padding: 20px;
+      }
+      .chart {
+        background: white;
+        padding: 10px;
+        box-shadow: 0 0 10px rgba(0,0,0,0.1);
+        border-radius: 8px;
+        min-height: 450px;
+      }
+    </style>
+    <script>
+      function moduleTrace(m) {
+        return {
+          type: "scatter", mode: "lines+markers", name: m.id,
+          x: m.x, y: m.y, marker: {size: 8},
+          customdata: m.impl.map(function (v, i) { return [v, m.design[i]]; }),
+          hovertemplate: "target module=" + m.id + "<br>Date=%{x}<br>Total Area=%{y}" +
+                         "<br>Impl-SfM=%{customdata[0]}<br>Design-SfM=%{customdata[1]}<extra></extra>"
+        };
+      }
+
+      function chartLayout(base, title, ymax) {
+        var layout = JSON.parse(JSON.stringify(base));
+        layout.title = Object.assign({}, layout.title, {text: title});
+        layout.yaxis = Object.assign({}, layout.yaxis, {range: [0, ymax]});
+        layout.legend = {title: {text: "target module"}};
+        return layout;
+      }
+
+      function init(data) {
+        var grid = document.getElementById("chart-grid");
+        var charts = [{title: data.overview.title, ymax: data.overview.ymax,
+                       traces: function () { return data.modules.map(moduleTrace); }}];
+        data.modules.forEach(function (m) {
+          charts.push({title: m.title, ymax: m.ymax, traces: function () { return [moduleTrace(m)]; }});
+        });
+
+        // 表示範囲に入ったグラフだけ描画する
+        var observer = new IntersectionObserver(function (entries) {
+          entries.forEach(function (entry) {
+            if (!entry.isIntersecting) return;
+            var chart = charts[entry.target.dataset.index];
+            observer.unobserve(entry.target);
+            Plotly.newPlot(entry.target, chart.traces(),
+                           chartLayout(data.layout, chart.title, chart.ymax), data.config);
+          });
+        }, {rootMargin: "300px"});
+
+        charts.forEach(function (chart, i) {
+          var div = document.createElement("div");
+          div.className = "chart";
+          div.dataset.index = i;
+          grid.appendChild(div);
+          observer.observe(div);
+        });
+      }
+
+      function loadGzip(url) {
+        fetch(url).then(function (r) { return r.arrayBuffer(); }).then(function (buf) {
+          var bytes = new Uint8Array(buf);
+          // サーバがContent-Encodingで展開済みの場合はそのまま読む
+          if (bytes[0] !== 0x1f || bytes[1] !== 0x8b) {
+            return JSON.parse(new TextDecoder().decode(bytes));
+          }
+          var stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream("gzip"));
+          return new Response(stream).json();
+        }).then(init);
+      }
+    </script>
+  </head>
+  <body>
+    <h1 style="text-align:center;">Total Area by Target Module</h1>
+    <div class="chart-grid" id="chart-grid"></div>
+    %LOADER%
+  </body>
+</html>
+"""
+
+
+def render_tasks(tasks, jobs=1, png=True, output_dir="."):
+    """
+    グラフを並列に描画し、tasksの順にDIVのリストを返す
+    """
+    if not tasks:
+        return []
+
+    # ワーカー数分のチャンクに分け、各ワーカーで描画器（kaleido）を1つだけ起動する
+    n_chunks = max(1, min(jobs, len(tasks)))
+    chunks = split_chunks(tasks, n_chunks)
+    if n_chunks > 1:
+        with ProcessPoolExecutor(max_workers=n_chunks) as executor:
+            results = list(executor.map(render_chunk, chunks, [png] * n_chunks, [output_dir] * n_chunks))
+    else:
+        results = [render_chunk(chunks[0], png, output_dir)]
+    logger.info(f"{len(tasks)} charts rendered (jobs={n_chunks}, png={png})")
+
+    return [div for divs in results for div in divs]
 
-        del fig
+
+#     ____________________
+#____/ [*] 差分再生成      \____________________
+#
+
+# 差分再生成用のマニフェストとDIVキャッシュの保存先
+MANIFEST_FILE = "sfm_manifest.json"
+DIV_CACHE_DIR = ".sfm_cache"
+
+# 描画処理を変更した場合に上げる（キャッシュを一括で無効にする）
+RENDER_VERSION = 1
+
+# ハッシュ対象の列（列順を固定する）
+HASH_COLUMNS = ["Date", "Total Area", "Impl-SfM", "Design-SfM", "target module"]
+
+
+def render_config_hash(png, decimate_config=None):
+    """
+    描画設定（レイアウト・PNG出力有無・間引き設定・plotly.jsのバージョン）のハッシュ
+    """
+    from plotly.offline import get_plotlyjs_version
+
+    render_config = {
+        "version": RENDER_VERSION,
+        "layout": COMMON_LAYOUT,
+        "div_config": DIV_CONFIG,
+        "png": png,
+        "decimate": decimate_config,
+        "plotlyjs": get_plotlyjs_version(),
+    }
+    text = json.dumps(render_config, sort_keys=True, default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def slice_hash(df, title):
+    """
+    モジュール1つ分のデータとタイトルのハッシュ
+    """
+    import pandas as pd
+
+    h = hashlib.sha256(title.encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df[HASH_COLUMNS], index=False).to_numpy().tobytes())
+    return h.hexdigest()
 
 
+def load_manifest(path=MANIFEST_FILE):
+    """
+    マニフェストを読み込む（存在しない・壊れている場合は空）
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(manifest, path=MANIFEST_FILE):
+    """
+    マニフェストを保存（書き込み途中で中断しても壊れないように置き換える）
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def outputs_exist(name, png, output_dir="."):
+    """
+    モジュール1つ分の出力ファイル（HTML・PNG・DIVキャッシュ）が揃っているか
+    """
+    paths = [f"{name}.html", os.path.join(DIV_CACHE_DIR, f"{name}.div.html")]
+    if png:
+        paths.append(f"{name}.png")
+    return all(os.path.exists(os.path.join(output_dir, p)) for p in paths)
+
+
+def render_incremental(tasks, jobs=1, png=True, decimate_config=None, output_dir="."):
+    """
+    ハッシュが変わったモジュールだけを再描画し、残りはキャッシュしたDIVを使う
+
+    マニフェストにはモジュールごとのデータのハッシュと描画設定のハッシュを保存する。
+    描画設定が変わった場合はすべて再描画する。
+    """
+    config_hash = render_config_hash(png, decimate_config)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    cache_dir = os.path.join(output_dir, DIV_CACHE_DIR)
+    manifest = load_manifest(manifest_path)
+    if manifest.get("config") != config_hash:
+        manifest = {"config": config_hash, "modules": {}}
+    previous = manifest["modules"]
+
+    hashes = dict()
+    stale = list()
+    for module, tmp_df, title in tasks:
+        name, _ = output_name(module)
+        hashes[name] = slice_hash(tmp_df, title)
+        if previous.get(name) != hashes[name] or not outputs_exist(name, png, output_dir):
+            stale.append((module, tmp_df, title))
+
+    logger.info(f"{len(stale)}/{len(tasks)} charts changed")
+    os.makedirs(cache_dir, exist_ok=True)
+    for (module, _, _), div in zip(stale, render_tasks(stale, jobs, png, output_dir)):
+        name, _ = output_name(module)
+        with open(os.path.join(cache_dir, f"{name}.div.html"), "w", encoding="utf-8") as f:
+            f.write(div)
+
+    # 今回のデータに存在しないモジュールはマニフェストから外す
+    manifest["modules"] = hashes
+    save_manifest(manifest, manifest_path)
+
+    html_divs = list()
+    for module, _, _ in tasks:
+        name, _ = output_name(module)
+        with open(os.path.join(cache_dir, f"{name}.div.html"), encoding="utf-8") as f:
+            html_divs.append(f.read())
+    return html_divs
+
+
+# 一覧ページに表示するアラートの最大件数（全件はCSVに出力）
+ALERT_DISPLAY_LIMIT = 100
+
+
+def metrics_section(summary, alerts):
+    """
+    一覧ページに埋め込むサマリ表とアラート一覧のHTML
+    """
+    recent = alerts.sort_values("Date", ascending=False).head(ALERT_DISPLAY_LIMIT)
+    table_options = dict(index=False, classes="metrics", border=0, float_format=lambda v: f"{v:.4g}", na_rep="")
+    return f"""
+    <div class="chart">
+      <h2>Summary</h2>
+      {summary.to_html(**table_options)}
+      <h2>Alerts ({len(alerts)})</h2>
+      {recent.to_html(**table_options)}
+    </div>
+"""
+
+
+def create_graph(data, jobs=1, png=True, output_mode="full", gzip_data=False,
+                 chunksize=None, aggregate_freq=None, max_points=None, decimate_method="lttb",
+                 incremental=False, metrics_options=None, output_dir="."):
+    """
+    グラフ・一覧ページを出力する
+
+    data: ファイル名・globパターン（文字列またはリスト）、または読み込み済みのDataFrame
+    metrics_options: 指定時は派生指標を出力する（sfm_metrics.compute_metrics() の引数）
+    output_dir: 出力先ディレクトリ（なければ作成）
+
+    戻り値: 出力物の辞書
+      report  一覧ページのパス
+      files   出力したファイルのパスのリスト
+      summary / alerts  派生指標のサマリ表・アラート一覧（metrics_options指定時）
+    """
+    from plotly.offline import get_plotlyjs_version
+
+    os.makedirs(output_dir, exist_ok=True)
+    with phase("load"):
+        df = area_frame(data, chunksize, aggregate_freq)
+    PROFILER.count("rows", len(df))
+    artifacts = {"report": None, "files": [], "summary": None, "alerts": None}
+
+    # 派生指標は間引く前のデータで計算する
+    metrics_html = ""
+    if metrics_options is not None:
+        import sfm_metrics
+
+        summary_file = os.path.join(output_dir, "sfm_summary.csv")
+        alerts_file = os.path.join(output_dir, "sfm_alerts.csv")
+        with phase("metrics"):
+            summary, alerts = sfm_metrics.write_metrics_report(df, summary_file, alerts_file, **metrics_options)
+        logger.info(f"{len(alerts)} alerts in {len(summary)} modules ({summary_file}, {alerts_file})")
+        metrics_html = metrics_section(summary, alerts)
+        artifacts.update(summary=summary, alerts=alerts)
+        artifacts["files"] += [summary_file, alerts_file]
+
+    # 点数が多い場合は間引く（元データはCSVに残す）
+    resolution = None
+    if max_points:
+        raw_file = os.path.join(output_dir, "total_area_data.csv")
+        with phase("decimate"):
+            df.to_csv(raw_file, index=False)
+            df, resolution = decimate(df, max_points, decimate_method)
+        artifacts["files"].append(raw_file)
+    titles = chart_titles(df, resolution, decimate_method)
+    decimate_config = {"max_points": max_points, "method": decimate_method} if max_points else None
+
+    # compactモード: データファイル1つ + 遅延描画の一覧ページのみ出力
+    if output_mode == "compact":
+        with phase("write"):
+            html_path, data_path = write_compact_report(df, gzip_data, titles, output_dir=output_dir)
+        artifacts["report"] = html_path
+        artifacts["files"] += [data_path, html_path]
+        return artifacts
+
+    # 概要グラフ + モジュール別グラフ（groupbyの順序で結果を結合するので出力順は決定的）
+    tasks = [(None, df, titles[None])] + [
+        (module, tmp_df, titles[module])
+        for module, tmp_df in df.groupby("target module", observed=True)
+    ]
+
+    PROFILER.count("charts", len(tasks))
+
+    # 並列描画（--jobs 2以上）の場合、ワーカー内の内訳は記録されず render にまとめて計上される
+    with phase("render"):
+        if incremental:
+            html_divs = render_incremental(tasks, jobs, png, decimate_config, output_dir)
+        else:
+            html_divs = render_tasks(tasks, jobs, png, output_dir)
+    for module, _, _ in tasks:
+        name, _ = output_name(module)
+        artifacts["files"].append(os.path.join(output_dir, f"{name}.html"))
+        if png:
+            artifacts["files"].append(os.path.join(output_dir, f"{name}.png"))
+
     # HTML全体を組み立て（2列表示のFlexboxスタイル）
     full_html = f"""
 <html>
   <head>
-    <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
+    <script src="https://cdn.plot.ly/plotly-{get_plotlyjs_version()}.min.js"></script>
     <meta charset="utf-8">
     <title>Grid Layout of Target Module Graphs</title>
     <style>
@@ -207,11 +1009,21 @@ def create_graph(csv):
         box-shadow: 0 0 10px rgba(0,0,0,0.1);
         border-radius: 8px;
       }}
+      .metrics {{
+        border-collapse: collapse;
+        font-size: 12px;
+      }}
+      .metrics th, .metrics td {{
+        border-bottom: 1px solid #ddd;
+        padding: 2px 8px;
+        text-align: right;
+      }}
     </style>
   </head>
   <body>
     <h1 style="text-align:center;">Total Area by Target Module</h1>
     <div class="chart-grid">
+      {metrics_html}
       {"".join(html_divs)}
     </div>
   </body>
@@ -219,9 +1031,14 @@ def create_graph(csv):
     """
 
     # 保存
-    with open("all_modules_2col.html", "w", encoding="utf-8") as f:
+    report_path = os.path.join(output_dir, "all_modules_2col.html")
+    with phase("write"), open(report_path, "w", encoding="utf-8") as f:
         f.write(full_html)
 
+    artifacts["report"] = report_path
+    artifacts["files"].append(report_path)
+    return artifacts
+
 
 if __name__ == '__main__':
     run()
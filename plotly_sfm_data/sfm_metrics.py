@@ -0,0 +1,169 @@
+"""
+SFM面積データの派生指標
+
+モジュールごとの前回比（差分・増加率）、一定期間の増加率、しきい値・zスコアによる
+面積増加（リグレッション）の検出、Impl-SfM / Design-SfM のリビジョン変更の検出を行う。
+モジュール単位のループは使わず、groupbyの変換（diff, shift, cumsum）だけで計算する。
+
+入力は load_area_data() と同じ形式（target module, Date の順に並んだDataFrame）。
+"""
+
+import numpy as np
+import pandas as pd
+
+MODULE = "target module"
+REVISION_COLUMNS = {"Impl-SfM": "impl_changed", "Design-SfM": "design_changed"}
+
+# 既定値
+GROWTH_WINDOW = 7       # 増加率を見るサンプル数
+ZSCORE_WINDOW = 30      # zスコアの基準にする直前のサンプル数
+ZSCORE_MIN_PERIODS = 5  # zスコアを計算する最小サンプル数
+ALERT_PCT = 0.1         # 前回比の増加率のしきい値（10%）
+ALERT_Z = 3.0           # zスコアのしきい値
+
+
+#     ____________________
+#____/ [*] 指標計算        \____________________
+#
+def _codes(column):
+    """
+    列を整数コードに変換（カテゴリ型はコードをそのまま使う）
+    """
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        return pd.Series(column.cat.codes, index=column.index)
+    return pd.Series(pd.factorize(column)[0], index=column.index)
+
+
+def rolling_zscore(values, key, window=ZSCORE_WINDOW, min_periods=ZSCORE_MIN_PERIODS):
+    """
+    直前window個の値（自身を含まない）の平均・標準偏差に対するzスコア
+
+    グループ内の累積和の差分で移動窓の和・二乗和・個数を求めるため、
+    グループ数によらずベクトル演算だけで計算できる
+
+    key: グループの整数コード（_codes()の結果）
+    """
+    valid = values.notna()
+    filled = values.fillna(0.0)
+    sums = pd.DataFrame({
+        "n": valid.astype("int64"),
+        "s": filled,
+        "s2": filled * filled,
+    }).groupby(key, sort=False).cumsum()
+
+    grouped = sums.groupby(key, sort=False)
+    window_sums = grouped.shift(1).fillna(0) - grouped.shift(window + 1).fillna(0)
+
+    n = window_sums["n"]
+    mean = window_sums["s"] / n
+    var = (window_sums["s2"] - n * mean * mean) / (n - 1)
+    std = np.sqrt(var.clip(lower=0))
+
+    z = (values - mean) / std
+    return z.where((n >= min_periods) & (std > 0))
+
+
+def compute_metrics(df, growth_window=GROWTH_WINDOW, zscore_window=ZSCORE_WINDOW,
+                    alert_pct=ALERT_PCT, alert_z=ALERT_Z):
+    """
+    行ごとの派生指標を計算する
+
+    追加する列:
+      delta         前回サンプルからのTotal Areaの差分
+      delta_pct     前回サンプルからの増加率
+      days          前回サンプルからの経過日数
+      growth        growth_windowサンプル前からの増加率
+      zscore        差分のzスコア（直前zscore_window個の差分が基準）
+      impl_changed / design_changed  前回サンプルからリビジョンが変わったか
+      alert         増加率またはzスコアがしきい値を超えた面積増加
+    """
+    # カテゴリ列のままだとgroupbyのたびにカテゴリを再計算するため、整数コードで分ける
+    key = _codes(df[MODULE])
+    grouped = df.groupby(key, sort=False)
+    area = df["Total Area"]
+
+    out = df.copy()
+    out["delta"] = grouped["Total Area"].diff()
+    previous = area - out["delta"]
+    out["delta_pct"] = (out["delta"] / previous).where(previous != 0)
+    out["days"] = grouped["Date"].diff().dt.days
+    out["growth"] = grouped["Total Area"].pct_change(periods=growth_window, fill_method=None)
+    out["zscore"] = rolling_zscore(out["delta"], key, zscore_window)
+
+    first = out["delta"].isna()
+    for column, flag in REVISION_COLUMNS.items():
+        changed = _codes(df[column]).groupby(key, sort=False).diff() != 0
+        out[flag] = changed & ~first
+
+    out["alert"] = (out["delta"] > 0) & (
+        (out["delta_pct"] >= alert_pct) | (out["zscore"] >= alert_z)
+    )
+    return out
+
+
+def revision_label(metrics):
+    """
+    面積変化の原因になったリビジョン変更の表示用ラベル
+    """
+    impl = metrics["impl_changed"]
+    design = metrics["design_changed"]
+    labels = np.select(
+        [impl & design, impl, design],
+        ["Impl+Design", "Impl", "Design"],
+        default="",
+    )
+    return pd.Series(labels, index=metrics.index)
+
+
+#     ____________________
+#____/ [*] 集計・出力      \____________________
+#
+def summarize(metrics):
+    """
+    モジュールごとのサマリ表を作成
+    """
+    summary = metrics.groupby(MODULE, observed=True, sort=True).agg(
+        samples=("Total Area", "size"),
+        first_date=("Date", "first"),
+        last_date=("Date", "last"),
+        first_area=("Total Area", "first"),
+        last_area=("Total Area", "last"),
+        max_delta=("delta", "max"),
+        max_zscore=("zscore", "max"),
+        last_growth=("growth", "last"),
+        impl_revisions=("impl_changed", "sum"),
+        design_revisions=("design_changed", "sum"),
+        alerts=("alert", "sum"),
+    )
+    summary.insert(5, "change", summary["last_area"] - summary["first_area"])
+    summary.insert(6, "change_pct", (summary["change"] / summary["first_area"]).where(summary["first_area"] != 0))
+    return summary.reset_index()
+
+
+def alert_list(metrics):
+    """
+    アラートになった行の一覧（リビジョン変更を伴うものはrevision列に記載）
+    """
+    alerts = metrics.loc[metrics["alert"]]
+    alerts = alerts.assign(revision=revision_label(alerts))
+    return alerts[[
+        MODULE, "Date", "Total Area", "delta", "delta_pct", "zscore",
+        "Impl-SfM", "Design-SfM", "revision",
+    ]].reset_index(drop=True)
+
+
+def write_metrics_report(df, summary_file="sfm_summary.csv", alerts_file="sfm_alerts.csv", **kwargs):
+    """
+    派生指標を計算し、サマリ表とアラート一覧をCSVに出力する
+
+    kwargs: compute_metrics() のしきい値・窓幅
+
+    戻り値: (サマリ表, アラート一覧)
+    """
+    metrics = compute_metrics(df, **kwargs)
+    summary = summarize(metrics)
+    alerts = alert_list(metrics)
+
+    summary.to_csv(summary_file, index=False)
+    alerts.to_csv(alerts_file, index=False)
+    return summary, alerts